@@ -16,27 +16,43 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- Import login page ---
-from pages.Login import run_login
+from src.data.tracing import begin_trace
+from src.features.session import current_user, end_session
 
-# --- Check login ---
-if "user_id" not in st.session_state or st.session_state.user_id is None:
-    run_login()
-else:
-    # --- Your custom sidebar navigation ---
-    st.sidebar.title("Navigation")
-    page = st.sidebar.selectbox("Go to", ["Dashboard", "Recordings", "Recurring", "Settings"])
+# --- Query tracing (QUERY_TRACE / QUERY_TRACE_PATH), summarized after the page ---
+trace = begin_trace()
 
-    # --- Load Pages ---
-    if page == "Dashboard":
-        from pages.Dashboard import run_dashboard
-        run_dashboard()
-    elif page == "Recordings":
-        from pages.Records import run_recordings
-        run_recordings()
-    elif page == "Recurring":
-        from pages.Recurrings import run_recurring
-        run_recurring()
-    elif page == "Settings":
-        from pages.Settings import run_settings
-        run_settings()
+try:
+    # --- Check login (signed session token, no database round trip) ---
+    # Pages are imported only when shown, so each loads its own dependencies
+    if current_user() is None:
+        from pages.Login import run_login
+        run_login()
+    else:
+        # --- Your custom sidebar navigation ---
+        st.sidebar.title("Navigation")
+        page = st.sidebar.selectbox("Go to", ["Dashboard", "Recordings", "Recurring", "Import", "Settings"])
+        if st.sidebar.button("Log out"):
+            end_session()
+            st.rerun()
+
+        # --- Load Pages ---
+        if page == "Dashboard":
+            from pages.Dashboard import run_dashboard
+            run_dashboard()
+        elif page == "Recordings":
+            from pages.Records import run_recordings
+            run_recordings()
+        elif page == "Recurring":
+            from pages.Recurrings import run_recurring
+            run_recurring()
+        elif page == "Import":
+            from pages.Import import run_import
+            run_import()
+        elif page == "Settings":
+            from pages.Settings import run_settings
+            run_settings()
+finally:
+    if trace is not None:
+        from src.data.tracing import trace_panel
+        trace_panel(trace)
@@ -0,0 +1,84 @@
+"""
+Build time and serialized size of budget_bar_chart and income_expense_bar
+against the previous one-trace-per-category / filtered-frame builders.
+
+    python -m benchmarks.bar_charts [--categories 500] [--rows 200000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.features.charts import budget_bar_chart, income_expense_bar
+
+
+def loop_budget_bar_chart(df):
+    """The per-row builder budget_bar_chart used to be"""
+    fig = go.Figure()
+    for _, row in df.iterrows():
+        color = "green" if row["Amount"] <= row["Budget"] else "red"
+        fig.add_trace(go.Bar(
+            x=[row["Category"]], y=[row["Amount"]], marker_color=color,
+            text=f"${row['Amount']:,.2f} / ${row['Budget']:,.2f}", textposition="auto"
+        ))
+    fig.update_layout(title="Actual vs Budget", showlegend=False)
+    return fig
+
+
+def filtered_income_expense_bar(df):
+    """The filtered-frame builder income_expense_bar used to be"""
+    cat_data = df.groupby(["Category", "Type"], observed=True)["Amount"].sum().reset_index()
+    fig = go.Figure()
+    for t in ["Income", "Expense"]:
+        temp = cat_data[cat_data["Type"] == t]
+        fig.add_trace(go.Bar(x=temp["Category"], y=temp["Amount"], name=t))
+    fig.update_layout(title="Income vs Expense per Category", barmode="group")
+    return fig
+
+
+def timed(build, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fig = build(df)
+        size = len(fig.to_json())
+        best = min(best, time.perf_counter() - t0)
+    return best, size, len(fig.data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categories", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = [f"Category {i}" for i in range(args.categories)]
+    budgets = pd.DataFrame({
+        "Category": names,
+        "Amount": rng.gamma(2.0, 200.0, args.categories).round(2),
+        "Budget": rng.gamma(2.0, 200.0, args.categories).round(2),
+    })
+    ledger = pd.DataFrame({
+        "Category": pd.Categorical(np.array(names)[rng.integers(0, args.categories, args.rows)]),
+        "Type": pd.Categorical(np.where(rng.random(args.rows) < 0.3, "Income", "Expense")),
+        "Amount": rng.gamma(2.0, 40.0, args.rows).round(2),
+    })
+
+    cases = [
+        ("budget_bar_chart", budgets, loop_budget_bar_chart, budget_bar_chart),
+        ("income_expense_bar", ledger, filtered_income_expense_bar, income_expense_bar),
+    ]
+    print(f"{args.categories} categories")
+    print(f"{'chart':20} {'builder':10} {'build':>8} {'payload':>10} {'traces':>7}")
+    for name, df, old, new in cases:
+        for label, build in [("old", old), ("new", new)]:
+            elapsed, size, traces = timed(build, df, args.repeat)
+            print(f"{name:20} {label:10} {elapsed:>7.3f}s {size / 1e3:>8.1f}kB {traces:>7}")
+
+
+if __name__ == "__main__":
+    main()
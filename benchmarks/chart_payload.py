@@ -0,0 +1,65 @@
+"""
+Plotly payload size and build time of the long time series charts, with
+and without src.features.downsample.prepare.
+
+Builds a multi-year daily ledger, renders each chart with every point
+(max_points=None) and with the default point budget, and prints the JSON
+size sent to the browser and the trace types. Either way, figures with
+more than WEBGL_THRESHOLD points switch to scattergl.
+
+    python -m benchmarks.chart_payload [--years 10] [--categories 20] [--max-points 1000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.charts import (
+    category_line, category_line_with_trend, forecast_category, income_expense_history
+)
+from src.features.downsample import MAX_POINTS
+
+
+def make_ledger(years, categories, seed=0):
+    """One amount per category per day, plus an Income / Expense type"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", periods=365 * years, freq="D")
+    df = pd.DataFrame({
+        "Category": np.repeat([f"Category {i}" for i in range(categories)], len(dates)),
+        "Date": np.tile(dates, categories),
+        "Amount": rng.gamma(2.0, 40.0, len(dates) * categories).round(2),
+    })
+    df["Type"] = np.where(df["Category"].str[-1].astype(int) % 3 == 0, "Income", "Expense")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS)
+    args = parser.parse_args()
+
+    df = make_ledger(args.years, args.categories)
+    charts = {
+        "category_line": lambda mp: category_line(df, max_points=mp),
+        "category_line_with_trend": lambda mp: category_line_with_trend(df, max_points=mp),
+        "forecast_category": lambda mp: forecast_category(df, max_points=mp),
+        "income_expense_history": lambda mp: income_expense_history(df, max_points=mp),
+    }
+
+    print(f"{len(df):,} rows, {args.categories} categories, {args.years} years")
+    print(f"{'chart':26} {'budget':>8} {'payload':>10} {'build':>8}  traces")
+    for name, build in charts.items():
+        for budget in (None, args.max_points):
+            t0 = time.perf_counter()
+            fig = build(budget)
+            payload = len(fig.to_json())
+            elapsed = time.perf_counter() - t0
+            kinds = sorted({t.type for t in fig.data})
+            print(f"{name:26} {str(budget or 'all'):>8} {payload / 1e6:>8.2f}MB {elapsed:>7.2f}s  {', '.join(kinds)}")
+
+
+if __name__ == "__main__":
+    main()
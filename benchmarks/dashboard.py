@@ -0,0 +1,194 @@
+"""
+Benchmark suite of the pure stages behind pages/Dashboard.py, on synthetic
+ledgers (benchmarks/synthetic.py) so no Supabase is needed: table shaping,
+category merges, filter_period, the totals / budget group-bys and every
+chart of src.features.charts.
+
+Results are written as JSON; pass an earlier file to --compare to see the
+change per stage (exits 1 when a stage got slower than --threshold).
+
+    python -m benchmarks.dashboard [--sizes 1000 100000 1000000] [--categories 20]
+        [--years 3] [--recurring-share 0.2] [--out dashboard_bench.json] [--compare old.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from benchmarks.synthetic import make_ledger
+from src.data.periods import filter_period
+from src.data.tables import TOTALS_COLUMNS, shape_table
+from src.features import charts
+from src.features.forecast import MODELS, _fit
+
+ROOT = Path(__file__).resolve().parent.parent
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def merge_categories(df, categories):
+    """Join category names / types onto rows, as the dashboard does"""
+    return df.merge(categories, left_on="category_id", right_on="id", how="left",
+                    suffixes=("", "_cat"))
+
+
+def totals(ledger):
+    """(Date, Category, Type) sums and counts of merged rows, like load_totals"""
+    grouped = ledger.groupby(["Date", "category_id", "Category", "Type"], observed=True)["Amount"]
+    return grouped.agg(Amount="sum", Count="count").reset_index()[TOTALS_COLUMNS]
+
+
+def budget_actuals(totals_df, budgets, month, year):
+    """Budgets of a month merged with the actual amounts, as in the dashboard"""
+    budgets = budgets[(budgets["Month"] == month) & (budgets["Year"] == year)]
+    actual = totals_df.groupby(["Category", "Type"], observed=True)["Amount"].sum().reset_index()
+    merged = pd.merge(budgets, actual, on=["Category", "Type"], how="left")
+    numeric = merged.select_dtypes("number").columns
+    merged[numeric] = merged[numeric].fillna(0)
+    return merged.rename(columns={"Amount_y": "Amount", "Amount_x": "Budget"})
+
+
+def stages(raw, today):
+    """
+    (name, callable) of every stage for one ledger; inputs of later stages
+    are computed once up front so each stage is timed on its own.
+    """
+    categories = shape_table(raw["categories"], "categories")
+    budgets = merge_categories(shape_table(raw["budgets"], "budgets"), categories)
+    incomes = merge_categories(shape_table(raw["incomes"], "incomes"), categories)
+    expenses = merge_categories(shape_table(raw["expenses"], "expenses"), categories)
+    ledger = pd.concat([incomes, expenses], ignore_index=True)
+    ledger["Type"] = ledger["Type"].astype("category")
+    totals_df = totals(ledger)
+    expense_totals = totals_df[totals_df["Type"] == "Expense"]
+    merged_budget = budget_actuals(totals_df, budgets, today.month, today.year)
+
+    def forecast(model):
+        def run():
+            _fit.clear()  # time the fit, not the cache
+            return charts.forecast_category(expenses, model=model)
+        return run
+
+    return [
+        ("shape_table expenses", lambda: shape_table(raw["expenses"], "expenses")),
+        ("merge categories", lambda: merge_categories(shape_table(raw["expenses"], "expenses"),
+                                                      categories)),
+        ("filter_period Year-to-Date", lambda: filter_period(expenses, "Year-to-Date", today)),
+        ("filter_period month", lambda: filter_period(expenses, None, today,
+                                                      month=today.month, year=today.year)),
+        ("groupby totals", lambda: totals(ledger)),
+        ("groupby budget actuals", lambda: budget_actuals(totals_df, budgets,
+                                                          today.month, today.year)),
+        ("category_pie", lambda: charts.category_pie(expense_totals)),
+        ("category_bar", lambda: charts.category_bar(expense_totals)),
+        ("category_line", lambda: charts.category_line(expenses)),
+        ("budget_bar_chart", lambda: charts.budget_bar_chart(merged_budget)),
+        ("income_expense_bar", lambda: charts.income_expense_bar(totals_df)),
+        ("income_expense_history", lambda: charts.income_expense_history(totals_df)),
+        ("category_trend", lambda: charts.category_trend(expenses)),
+        ("category_line_with_trend", lambda: charts.category_line_with_trend(expenses)),
+        *[(f"forecast_category {model}", forecast(model)) for model in MODELS],
+    ]
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), sum(times) / len(times)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold, min_delta):
+    """
+    Print the ratio of every stage to a baseline file. Returns the number of
+    regressions: slower by more than `threshold` and `min_delta` seconds.
+    """
+    baseline = {(r["size"], r["stage"]): r["best"]
+                for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = 0
+    print(f"\nvs {baseline_path}")
+    for r in results:
+        old = baseline.get((r["size"], r["stage"]))
+        if old is None:
+            continue
+        ratio = r["best"] / old if old else float("inf")
+        slower = ratio > threshold and r["best"] - old > min_delta
+        regressions += slower
+        print(f"{r['size']:>9,} {r['stage']:38} {old:8.4f}s -> {r['best']:8.4f}s "
+              f"x{ratio:5.2f}{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--recurring-share", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stage", action="append", default=None,
+                        help="only stages whose name contains this, repeatable")
+    parser.add_argument("--out", type=Path, default=Path("dashboard_bench.json"))
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="seconds a stage must lose to count as a regression")
+    args = parser.parse_args()
+    if args.categories < 2:
+        parser.error("--categories must be at least 2 (one income and one expense category)")
+
+    today = pd.Timestamp("2025-06-15").date()  # fixed, so runs are comparable
+    # Warm-up on a tiny ledger: plotly loads its trace classes on first use
+    for _, fn in stages(make_ledger(200, args.categories, args.years, end=today), today):
+        fn()
+
+    results = []
+    for size in args.sizes:
+        raw = make_ledger(size, args.categories, args.years, args.recurring_share, end=today)
+        print(f"{size:,} transactions")
+        for name, fn in stages(raw, today):
+            if args.stage and not any(s in name for s in args.stage):
+                continue
+            best, mean = best_of(fn, args.repeat)
+            results.append({"size": size, "stage": name, "best": best, "mean": mean})
+            print(f"  {name:38} {best:8.4f}s (mean {mean:.4f}s)")
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plotly": plotly.__version__,
+        "machine": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "threshold", "min_delta")},
+        "results": results,
+    }
+    report["params"]["today"] = today.isoformat()
+    args.out.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold, args.min_delta) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Import-time budget of the app, exiting 1 when it is exceeded.
+
+Pages import what they need at the top of their run_* function, so the
+imports of a first render can be read statically: module-level imports
+plus the import statements directly in the function body (imports nested
+in a branch are deferred and not counted). Each target is timed in a fresh
+interpreter on top of streamlit itself, which the server always has loaded:
+
+- cold start: app.py and the login form, what a logged-out visitor waits for
+- each page: its first render for a logged-in user, on top of app.py
+
+    python -m benchmarks.import_budget [--cold-start 0.8] [--page 1.5] [--repeat 3]
+
+Wall-clock timings depend on the machine, so the test suite only runs this
+when IMPORT_BUDGET=1 is set; tests/test_import_budget.py always checks that
+a cold start leaves the heavy libraries unimported instead.
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COLD_START_BUDGET = 0.8  # seconds
+PAGE_BUDGET = 1.5  # seconds
+
+# Loaded by traced_connection() when any page but the login form first
+# renders; a call, so it is not among the statements read below
+CONNECTION_IMPORT = "from st_supabase_connection import SupabaseConnection"
+
+# Page module -> run function, as dispatched by app.py
+PAGES = {
+    "pages/Dashboard.py": "run_dashboard",
+    "pages/Records.py": "run_recordings",
+    "pages/Recurrings.py": "run_recurring",
+    "pages/Import.py": "run_import",
+    "pages/Settings.py": "run_settings",
+}
+
+
+def _imports(body):
+    return [ast.unparse(node) for node in body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def first_render_imports(path, function=None):
+    """Import statements run by importing `path` and calling `function` (if any)"""
+    tree = ast.parse((ROOT / path).read_text())
+    statements = _imports(tree.body)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == function:
+            statements += _imports(node.body)
+    return statements
+
+
+def time_imports(statements, preloaded=(), repeat=3):
+    """Best wall time of running `statements` in a fresh interpreter"""
+    code = "\n".join([
+        "import time", "import streamlit", *preloaded,
+        "t0 = time.perf_counter()", *statements,
+        "print(time.perf_counter() - t0)",
+    ])
+    best = float("inf")
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+        best = min(best, float(out.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def measure(cold_start=COLD_START_BUDGET, page=PAGE_BUDGET, repeat=3):
+    """(name, seconds, budget) of the cold start and of every page's first render"""
+    app = first_render_imports("app.py")
+    targets = [("cold start", app + first_render_imports("pages/Login.py", "run_login"),
+                (), cold_start)]
+    targets += [(Path(path).stem, first_render_imports(path, function) + [CONNECTION_IMPORT],
+                 app, page)
+                for path, function in PAGES.items()]
+    return [(name, time_imports(statements, preloaded, repeat), budget)
+            for name, statements, preloaded, budget in targets]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cold-start", type=float, default=COLD_START_BUDGET,
+                        help="budget in seconds for app.py + login page")
+    parser.add_argument("--page", type=float, default=PAGE_BUDGET,
+                        help="budget in seconds for each page's first render")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failed = 0
+    for name, elapsed, budget in measure(args.cold_start, args.page, args.repeat):
+        over = elapsed > budget
+        failed += over
+        print(f"{name:12} {elapsed:6.3f}s / {budget:.3f}s {'OVER BUDGET' if over else 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
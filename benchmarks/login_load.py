@@ -0,0 +1,91 @@
+"""
+Login load test: a burst of concurrent logins, each on its own thread like
+Streamlit sessions, hashed inline (bcrypt.checkpw on the script thread) or
+through src.features.passwords' bounded worker pool. Another thread meanwhile
+keeps "rerunning" a small pure-Python page to show how much the hashes
+stall the rest of the server.
+
+    python -m benchmarks.login_load [--users 64] [--rounds 12] [--workers 4]
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import numpy as np
+
+
+def percentiles(samples):
+    p50, p95 = np.percentile(samples, [50, 95])
+    return f"p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  max {max(samples) * 1000:7.1f} ms"
+
+
+def page_rerun():
+    """Stand-in for a light script rerun that needs the GIL"""
+    return sum(i * i for i in range(20_000))
+
+
+def burst(check, users, password, password_hash):
+    """Latencies of `users` simultaneous logins and of page reruns meanwhile"""
+    done = threading.Event()
+    reruns = []
+
+    def rerun_loop():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            page_rerun()
+            reruns.append(time.perf_counter() - t0)
+            time.sleep(0.02)  # other sessions' think time between reruns
+
+    def login(_):
+        t0 = time.perf_counter()
+        assert check(password, password_hash)
+        return time.perf_counter() - t0
+
+    background = threading.Thread(target=rerun_loop)
+    background.start()
+    with ThreadPoolExecutor(max_workers=users) as sessions:
+        logins = list(sessions.map(login, range(users)))
+    done.set()
+    background.join()
+    return logins, reruns
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=64, help="simultaneous logins")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    parser.add_argument("--workers", type=int, default=None, help="hash pool size")
+    args = parser.parse_args()
+
+    if args.workers:
+        os.environ["BCRYPT_WORKERS"] = str(args.workers)
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from src.features import passwords
+
+    password = "correct horse battery staple"
+    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(args.rounds)).decode()
+
+    idle = [0.0] * 20
+    for i in range(len(idle)):
+        t0 = time.perf_counter()
+        page_rerun()
+        idle[i] = time.perf_counter() - t0
+    print(f"{args.users} logins at cost {args.rounds}, {os.cpu_count()} CPUs")
+    print(f"{'idle rerun':18} {percentiles(idle)}")
+
+    passwords.check_password(password, password_hash)  # warm up the pool
+    modes = [
+        ("inline", lambda pw, h: bcrypt.checkpw(pw.encode(), h.encode())),
+        ("pool", passwords.check_password),
+    ]
+    for name, check in modes:
+        logins, reruns = burst(check, args.users, password, password_hash)
+        print(f"{name + ' login':18} {percentiles(logins)}")
+        print(f"{name + ' rerun':18} {percentiles(reruns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Memory / latency benchmark of src.data.schema on a synthetic ledger.
+
+Builds a multi-year ledger the way Supabase returns it (object strings,
+64-bit numbers), then compares it with the same frame after coerce() on
+memory, a Category/Type groupby and the merge with categories.
+
+    python -m benchmarks.schema [--rows 1000000] [--years 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import coerce
+
+
+def make_ledger(rows, years, categories=40, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 365 * years, rows), unit="D")
+    titles = np.array([f"Merchant {i}" for i in range(500)], dtype=object)
+    ledger = pd.DataFrame({
+        "id": np.arange(1, rows + 1, dtype=np.int64),
+        "user_id": np.ones(rows, dtype=np.int64),
+        "category_id": rng.integers(1, categories + 1, rows).astype(np.int64),
+        "date": dates.strftime("%Y-%m-%d").astype(object),
+        "amount": rng.gamma(2.0, 40.0, rows).round(2),
+        "title": titles[rng.integers(0, len(titles), rows)],
+        "comment": np.where(rng.random(rows) < 0.3, "Recurring", "").astype(object),
+    })
+    cats = pd.DataFrame({
+        "id": np.arange(1, categories + 1, dtype=np.int64),
+        "category": [f"Category {i}" for i in range(1, categories + 1)],
+        "type": np.where(np.arange(categories) < 5, "Income", "Expense").astype(object),
+    })
+    return ledger, cats
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(ledger, cats, repeat):
+    merge = lambda: ledger.merge(cats, left_on="category_id", right_on="id", how="left")
+    merged = merge()
+    groupby = lambda: merged.groupby(["category", "type"], observed=True)["amount"].sum()
+    return {
+        "memory_mb": merged.memory_usage(deep=True).sum() / 1e6,
+        "merge_s": best_of(merge, repeat),
+        "groupby_s": best_of(groupby, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ledger, cats = make_ledger(args.rows, args.years)
+    raw = ledger.assign(date=pd.to_datetime(ledger["date"]))  # dates were always parsed
+
+    t0 = time.perf_counter()
+    typed_ledger, typed_cats = coerce(ledger), coerce(cats)
+    coerce_s = time.perf_counter() - t0
+
+    before = run(raw, cats, args.repeat)
+    after = run(typed_ledger, typed_cats, args.repeat)
+
+    print(f"rows={args.rows:,} years={args.years} coerce={coerce_s:.3f}s")
+    print(f"{'':10} {'object/int64':>14} {'schema':>10}")
+    for key in before:
+        print(f"{key:10} {before[key]:14.3f} {after[key]:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
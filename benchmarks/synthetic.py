@@ -0,0 +1,93 @@
+"""
+Synthetic ledgers shaped like what Supabase returns (raw column names,
+ISO date strings), for benchmarks that must run without a database.
+
+Incomes are a few large monthly amounts, expenses many small ones; a
+share of both are recurring entries, which repeat the same amount on the
+same day of every month and carry the "Recurring" comment like those
+generated by the Recurring page.
+"""
+import numpy as np
+import pandas as pd
+
+INCOME_SHARE = 0.1  # fraction of transactions that are incomes
+USER_ID = 1
+
+
+def make_categories(categories):
+    """Raw categories rows: about one in five is an income category"""
+    if categories < 2:
+        raise ValueError("at least 2 categories are needed, one income and one expense")
+    incomes = max(1, categories // 5)
+    return pd.DataFrame({
+        "id": np.arange(1, categories + 1),
+        "user_id": USER_ID,
+        "category": [f"Category {i}" for i in range(1, categories + 1)],
+        "type": ["Income" if i < incomes else "Expense" for i in range(categories)],
+        "color": "#4F9DFE",
+        "icon": "💶",
+    })
+
+
+def _transactions(rng, n, category_ids, dates, recurring_share, scale, first_id):
+    recurring = rng.random(n) < recurring_share
+    amounts = rng.gamma(2.0, scale, n)
+    picked = rng.integers(0, len(dates), n)
+
+    # Recurring entries: a few rules, each one amount on one day of the month
+    rules = max(1, int(recurring.sum() ** 0.5))
+    rule = rng.integers(0, rules, n)
+    rule_amounts = rng.gamma(2.0, scale * 4, rules)
+    rule_days = rng.integers(1, 29, rules)
+    month_starts = dates[picked].to_period("M").to_timestamp()
+    rule_dates = month_starts + pd.to_timedelta(rule_days[rule] - 1, unit="D")
+
+    return pd.DataFrame({
+        "id": np.arange(first_id, first_id + n),
+        "user_id": USER_ID,
+        "date": np.where(recurring, rule_dates, dates[picked]).astype("datetime64[ns]"),
+        "category_id": np.where(recurring, category_ids[rule % len(category_ids)],
+                                rng.choice(category_ids, n)),
+        "amount": np.where(recurring, rule_amounts[rule], amounts).round(2),
+        "title": np.where(recurring, [f"Rule {r}" for r in rule], "Purchase"),
+        "comment": np.where(recurring, "Recurring", rng.choice(["", "card", "cash"], n)),
+    })
+
+
+def make_ledger(transactions, categories=20, years=3, recurring_share=0.2, end=None, seed=0):
+    """
+    Raw frames of a synthetic user: categories, incomes, expenses and
+    budgets. About `transactions` rows are spread over `years` years ending on
+    `end` (default: today; recurring dates past it are dropped), sorted by
+    (date, id) like keyset pages.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or pd.Timestamp.today().date())
+    dates = pd.date_range(end - pd.DateOffset(years=years) + pd.Timedelta(days=1), end, freq="D")
+
+    cats = make_categories(categories)
+    income_ids = cats.loc[cats["type"] == "Income", "id"].to_numpy()
+    expense_ids = cats.loc[cats["type"] == "Expense", "id"].to_numpy()
+    n_incomes = int(transactions * INCOME_SHARE)
+
+    frames = {"categories": cats}
+    for table, n, ids, scale, first_id in [
+        ("incomes", n_incomes, income_ids, 600.0, 1),
+        ("expenses", transactions - n_incomes, expense_ids, 25.0, n_incomes + 1),
+    ]:
+        df = _transactions(rng, n, ids, dates, recurring_share, scale, first_id)
+        df = df[df["date"] <= end].sort_values(["date", "id"], ignore_index=True)
+        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+        frames[table] = df
+
+    months = pd.period_range(dates[0], end, freq="M")
+    frames["budgets"] = pd.DataFrame({
+        "id": np.arange(1, len(months) * categories + 1),
+        "user_id": USER_ID,
+        "category_id": np.tile(cats["id"].to_numpy(), len(months)),
+        "budget": rng.gamma(2.0, 250.0, len(months) * categories).round(0),
+        "month": np.repeat(months.month, categories),
+        "year": np.repeat(months.year, categories),
+        "type": np.tile(cats["type"].to_numpy(), len(months)),
+    })
+    return frames
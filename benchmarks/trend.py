@@ -0,0 +1,53 @@
+"""
+Benchmark of src.features.charts.category_trend (the math behind
+category_line_with_trend) against the previous per-category loop.
+
+    python -m benchmarks.trend [--rows 200000] [--categories 40]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.charts import category_trend
+
+
+def loop_trend(df, window=3):
+    """The per-category computation category_line_with_trend used to run"""
+    out = []
+    for _, group in df.groupby("Category", observed=True):
+        group = group.sort_values("Date")
+        group["SMA"] = group["Amount"].rolling(window=window, min_periods=1).mean()
+        z_scores = (group["Amount"] - group["Amount"].mean()) / group["Amount"].std()
+        group["Anomaly"] = z_scores.abs() > 2
+        out.append(group)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--categories", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Category": rng.integers(0, args.categories, args.rows).astype(str),
+        "Date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1800, args.rows), unit="D"),
+        "Amount": rng.gamma(2.0, 40.0, args.rows),
+    })
+    df["Category"] = df["Category"].astype("category")
+
+    for name, fn in [("loop", loop_trend), ("vectorized", category_trend)]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn(df)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{name:10} {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
 def run_dashboard():
     import streamlit as st
     import pandas as pd
-    from datetime import datetime, timedelta
-    import plotly.graph_objects as go
-    from st_supabase_connection import SupabaseConnection
-    import numpy as np 
 
     from src.features.charts import (
         category_pie, category_bar, category_line_with_trend,
-        forecast_category, budget_bar_chart
+        forecast_category, budget_bar_chart,
+        income_expense_bar, income_expense_history, MODEL_LABELS
     )
+    from src.features.figure_cache import cached_figure, figure_cache_stats
+    from src.features.sections import lazy_section
+    from src.data.periods import PERIOD_OPTIONS, is_month_window, period_window
+    from src.data.fetch import fetch_all
+    from src.data.mirror import mirror_enabled
+    from src.data.tables import LEDGER_COLUMNS, TOTALS_COLUMNS, load_table, load_totals
+    from src.data.tracing import traced_connection
+    from src.features.session import current_user
 
     st.markdown("""
     <style>
@@ -33,7 +38,7 @@ def run_dashboard():
     </style>
 """, unsafe_allow_html=True)
 
-    if "user_id" not in st.session_state or st.session_state.user_id is None:
+    if current_user() is None:
         from pages.Login import run_login
         run_login()
         return  # stop running dashboard until login
@@ -41,7 +46,7 @@ def run_dashboard():
     st.title("📊 Dashboard & Budget Overview")
 
     # --- Connect to Supabase ---
-    conn = st.connection("supabase", type=SupabaseConnection)
+    conn = traced_connection()
 
     # --- Sidebar Filters ---
     st.sidebar.header("Filters")
@@ -49,188 +54,121 @@ def run_dashboard():
     show_recurring = st.sidebar.checkbox("Show recurring transactions only")
     show_non_recurring = st.sidebar.checkbox("Show non-recurring transactions only")
     forecast_days = st.sidebar.slider("Days to Forecast", 7, 90, 30)
-    period_options = ["Week-to-Date", "Month-to-Date", "Year-to-Date",
-                      "Last 7 Days", "Last 30 Days", "Last 365 Days"]
     today = pd.Timestamp.today().date()
     month = st.sidebar.selectbox("Select Month", list(range(1, 13)), index=today.month - 1)
     year = st.sidebar.selectbox("Select Year", list(range(today.year - 5, today.year + 2)), index=5)
 
-    # --- Helper: filter by period ---
-    def filter_period(df, period, month=None, year=None):
-        if df.empty:
-            return df
-
-        if period == "Week-to-Date":
-            start_date = today - pd.to_timedelta(today.weekday(), unit="d")
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        elif period == "Month-to-Date":
-            start_date = today.replace(day=1)
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        elif period == "Year-to-Date":
-            start_date = today.replace(month=1, day=1)
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        elif period == "Last 7 Days":
-            start_date = today - timedelta(days=7)
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        elif period == "Last 30 Days":
-            start_date = today - timedelta(days=30)
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        elif period == "Last 365 Days":
-            start_date = today - timedelta(days=365)
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-
-        # Apply sidebar month/year if provided
-        if "Date" in df.columns and month and year:
-            df = df[(df["Date"].dt.month == month) & (df["Date"].dt.year == year)]
-
-        return df
-
-
-    # --- Load table helper ---
-    def load_table(table):
-        rows = conn.table(table).select("*").eq("user_id", st.session_state.user_id).execute()
-
-        df = pd.DataFrame(rows.data)
-
-        if df.empty:
-            return df
-
-        # Rename for dashboard consistency, but KEEP category_id for merges
-        rename_map = {}
-        if table in ["incomes", "expenses"]:
-            rename_map = {
-                "date": "Date",
-                "amount": "Amount",
-                "comment": "Comment",
-                "title": "Title"
-                # DON'T rename category_id here
-            }
-        elif table == "budgets":
-            rename_map = {
-                "budget": "Budget",
-                "amount": "Amount",
-                "month": "Month",
-                "year": "Year",
-                "type": "Type"
-                # DON'T rename category_id here
-            }
-        elif table == "categories":
-            rename_map = {
-                "category": "Category",
-                "type": "Type",
-                "color": "Color",
-                "icon": "Icon"
-                # Keep id as-is for merge
-            }
-        elif table == "recurrings":
-            rename_map = {
-                "title": "Title",
-                "amount": "Amount",
-                "type": "Type",
-                "start_date": "Date",
-                "frequency": "Frequency",
-                "end_date": "EndDate",
-                "active": "Active"
-                # Keep category_id
-            }
-
-        df = df.rename(columns=rename_map)
-
-        # Ensure Date columns are datetime
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"])
-
-        return df
-
-
-
-    # --- Load data from Supabase ---
-    incomes_df = load_table("incomes")
-    expenses_df = load_table("expenses")
-    budgets_df = load_table("budgets")
-    categories_df = load_table("categories")
+    # --- Data selection ---
+    if view_type == "Single Type":
+        exp_or_inc = st.selectbox("Choose data type", ["Income", "Expense"])
+    period = st.selectbox("Select period", PERIOD_OPTIONS)
+    # Period and month/year become gte / lt predicates on the queries
+    start, end = period_window(period, today, month=month, year=year)
+    recurring = True if show_recurring else False if show_non_recurring else None
+
+    # --- Load data from Supabase, independent tables concurrently ---
+    # Served from the per-user cache; only a write to a table refetches it
+    user_id = st.session_state.user_id
+    jobs = {
+        "budgets": lambda: load_table(conn, user_id, "budgets"),
+        "categories": lambda: load_table(conn, user_id, "categories"),
+    }
+    # (Date, Category, Type) totals from the rollup tables; the single type
+    # view has no daily chart, so whole-month windows use the monthly rollup
+    monthly = view_type == "Single Type" and is_month_window(start, end)
+    jobs["totals"] = lambda: load_totals(conn, user_id, start, end, recurring=recurring,
+                                         monthly=monthly)
+
+    fetched = fetch_all(jobs)
+    for name, error in fetched["errors"].items():
+        st.warning(f"⚠️ Could not load {name}: {error}")
+    with st.sidebar.expander("Load times"):
+        if mirror_enabled():
+            st.caption("Ledger served from the local mirror")
+        for name, seconds in fetched["timings"].items():
+            st.caption(f"{name}: {seconds * 1000:.0f} ms")
+
+    data = fetched["results"]
+    budgets_df = data.get("budgets", pd.DataFrame())
+    categories_df = data.get("categories", pd.DataFrame())
 
     # Join categories info
-    if not categories_df.empty:
-        for name, df in zip(["incomes_df", "expenses_df", "budgets_df"],
-                            [incomes_df, expenses_df, budgets_df]):
-            if not df.empty:
-                df_merged = df.merge(
+    if not categories_df.empty and not budgets_df.empty:
+        budgets_df = budgets_df.merge(
+            categories_df,
+            left_on="category_id",  # keep category_id for merge
+            right_on="id",
+            how="left",
+            suffixes=("", "_cat")
+        )
+
+    # --- Views ---
+    if view_type == "Single Type":
+        table = "incomes" if exp_or_inc == "Income" else "expenses"
+        totals_df = data.get("totals", pd.DataFrame(columns=TOTALS_COLUMNS))
+        filtered_df = totals_df[totals_df["Type"] == exp_or_inc]
+
+        def load_ledger():
+            """Raw rows of the selected type, only for per-transaction charts"""
+            ledger_df = load_table(conn, user_id, table, columns=LEDGER_COLUMNS, start=start, end=end)
+            if ledger_df.empty:
+                return pd.DataFrame(columns=["Date", "Amount", "Comment", "Category", "Type"])
+            if not categories_df.empty:
+                ledger_df = ledger_df.merge(
                     categories_df,
-                    left_on="category_id",  # keep category_id for merge
+                    left_on="category_id",
                     right_on="id",
                     how="left",
                     suffixes=("", "_cat")
                 )
-                # Overwrite df variable in global scope
-                if name == "incomes_df":
-                    incomes_df = df_merged
-                elif name == "expenses_df":
-                    expenses_df = df_merged
-                elif name == "budgets_df":
-                    budgets_df = df_merged
-
-    # --- Views ---
-    if view_type == "Single Type":
-        exp_or_inc = st.selectbox("Choose data type", ["Income", "Expense"])
-        df = incomes_df if exp_or_inc == "Income" else expenses_df
-        if df.empty:
-            st.info("No data found.")
-            return
-
-        period = st.selectbox("Select period", period_options)
-        filtered_df = filter_period(df, period, month=month, year=year)
 
-
-        if show_recurring:
-            filtered_df = filtered_df[filtered_df["Comment"].str.lower() == "recurring"]
-        elif show_non_recurring:
-            filtered_df = filtered_df[filtered_df["Comment"].str.lower() != "recurring"]
+            if show_recurring:
+                ledger_df = ledger_df[ledger_df["Comment"].str.lower() == "recurring"]
+            elif show_non_recurring:
+                ledger_df = ledger_df[ledger_df["Comment"].str.lower() != "recurring"]
+            return ledger_df
 
         if filtered_df.empty:
             st.info("No records for the selected filters.")
         else:
             col1, col2 = st.columns(2)
-            col1.metric("Number of Records", len(filtered_df))
+            col1.metric("Number of Records", int(filtered_df["Count"].sum()))
             col2.metric("Total Amount", f"${filtered_df['Amount'].sum():,.2f}")
 
-            with st.expander("Category Charts"):
-                st.plotly_chart(category_pie(filtered_df), use_container_width=True)
-                st.plotly_chart(category_bar(filtered_df), use_container_width=True)
-                st.plotly_chart(category_line_with_trend(filtered_df), use_container_width=True)
-
-            with st.expander("Predictive Analytics / Linear Forecast"):
-                # --- Remove rows with missing Date or Amount ---
-                clean_df = filtered_df.dropna(subset=["Date", "Amount"])
-                
-                # --- Ensure there are enough points to fit a linear model ---
-                if len(clean_df) < 2:
-                    st.warning("Not enough data for forecasting.")
-                else:
-                    try:
-                        st.plotly_chart(forecast_category(clean_df, periods=forecast_days),
+            # Sections only build their figures while they are open
+            section = lazy_section("Category Charts", "category_charts")
+            if section:
+                with section:
+                    st.plotly_chart(cached_figure(category_pie, filtered_df), use_container_width=True)
+                    st.plotly_chart(cached_figure(category_bar, filtered_df), use_container_width=True)
+                    # Trend and anomalies are per transaction: the raw rows are
+                    # only read once this section is open
+                    st.plotly_chart(cached_figure(category_line_with_trend, load_ledger()),
+                                    use_container_width=True)
+
+            section = lazy_section("Predictive Analytics / Forecast", "forecast")
+            if section:
+                with section:
+                    forecast_model = st.selectbox(
+                        "Model", list(MODEL_LABELS), format_func=MODEL_LABELS.get, key="forecast_model"
+                    )
+
+                    # --- Remove rows with missing Date or Amount ---
+                    clean_df = load_ledger().dropna(subset=["Date", "Amount"])
+
+                    # --- Ensure there are enough points to fit a model ---
+                    if len(clean_df) < 2:
+                        st.warning("Not enough data for forecasting.")
+                    else:
+                        # Fits are cached per data fingerprint; the horizon does not refit,
+                        # and an unchanged (data, horizon, model) reuses the whole figure
+                        st.plotly_chart(cached_figure(forecast_category, clean_df,
+                                                      periods=forecast_days, model=forecast_model),
                                         use_container_width=True)
-                    except np.linalg.LinAlgError:
-                        st.warning("Forecasting failed: data is insufficient or degenerate.")
 
 
     else:  # --- Income vs Expense ---
-        if incomes_df.empty and expenses_df.empty:
-            st.info("No income or expense data found.")
-            return
-
-        incomes_df["Type"] = "Income"
-        expenses_df["Type"] = "Expense"
-        df = pd.concat([incomes_df, expenses_df], ignore_index=True)
-
-        period = st.selectbox("Select period", period_options)
-        filtered_df = filter_period(df, period, month=month, year=year)
-
-
-        if show_recurring:
-            filtered_df = filtered_df[filtered_df["Comment"].str.lower() == "recurring"]
-        elif show_non_recurring:
-            filtered_df = filtered_df[filtered_df["Comment"].str.lower() != "recurring"]
+        filtered_df = data.get("totals", pd.DataFrame(columns=TOTALS_COLUMNS))
 
         if filtered_df.empty:
             st.info("No records for the selected filters.")
@@ -243,50 +181,38 @@ def run_dashboard():
             col2.metric("Total Expense", f"${total_expense:,.2f}")
             col3.metric("Net", f"${net:,.2f}")
 
-            with st.expander("Category Comparison"):
-                cat_data = filtered_df.groupby(["Category", "Type"])["Amount"].sum().reset_index()
-                fig_cat = go.Figure()
-                for t in ["Income", "Expense"]:
-                    temp = cat_data[cat_data["Type"] == t]
-                    fig_cat.add_trace(go.Bar(x=temp["Category"], y=temp["Amount"], name=t))
-                fig_cat.update_layout(title="Income vs Expense per Category", barmode="group",
-                                      xaxis_title="Category", yaxis_title="Amount")
-                st.plotly_chart(fig_cat, use_container_width=True)
-
-            with st.expander("Historical Income vs Expense"):
-                hist_data = filtered_df.groupby(["Date", "Type"])["Amount"].sum().reset_index()
-                fig_hist = go.Figure()
-                for t in ["Income", "Expense"]:
-                    temp = hist_data[hist_data["Type"] == t]
-                    fig_hist.add_trace(go.Scatter(x=temp["Date"], y=temp["Amount"],
-                                                  mode="lines+markers", name=t))
-                net_data = hist_data.pivot(index="Date", columns="Type", values="Amount").fillna(0)
-                net_data["Net"] = net_data.get("Income", 0) - net_data.get("Expense", 0)
-                fig_hist.add_trace(go.Scatter(x=net_data.index, y=net_data["Net"],
-                                              mode="lines+markers", name="Net",
-                                              line=dict(color="black", dash="dash")))
-                fig_hist.update_layout(title="Historical Income vs Expense",
-                                       xaxis_title="Date", yaxis_title="Amount")
-                st.plotly_chart(fig_hist, use_container_width=True)
-
-            with st.expander("Income vs Expense Ratio"):
-                total_income = max(total_income, 1)
-                fig_ratio = go.Figure(go.Indicator(
-                    mode="gauge+number+delta",
-                    value=total_expense,
-                    delta={'reference': total_income, 'relative': True, 'position': 'top'},
-                    gauge={
-                        'axis': {'range': [0, total_income]},
-                        'bar': {'color': "red"},
-                        'steps': [
-                            {'range': [0, total_income * 0.5], 'color': "lightgreen"},
-                            {'range': [total_income * 0.5, total_income], 'color': "orange"}
-                        ],
-                        'threshold': {'line': {'color': "black", 'width': 4},
-                                      'thickness': 0.75, 'value': total_expense}
-                    }
-                ))
-                st.plotly_chart(fig_ratio, use_container_width=True)
+            section = lazy_section("Category Comparison", "category_comparison")
+            if section:
+                with section:
+                    st.plotly_chart(cached_figure(income_expense_bar, filtered_df), use_container_width=True)
+
+            section = lazy_section("Historical Income vs Expense", "income_expense_history")
+            if section:
+                with section:
+                    st.plotly_chart(cached_figure(income_expense_history, filtered_df), use_container_width=True)
+
+            section = lazy_section("Income vs Expense Ratio", "income_expense_ratio")
+            if section:
+                with section:
+                    import plotly.graph_objects as go
+
+                    total_income = max(total_income, 1)
+                    fig_ratio = go.Figure(go.Indicator(
+                        mode="gauge+number+delta",
+                        value=total_expense,
+                        delta={'reference': total_income, 'relative': True, 'position': 'top'},
+                        gauge={
+                            'axis': {'range': [0, total_income]},
+                            'bar': {'color': "red"},
+                            'steps': [
+                                {'range': [0, total_income * 0.5], 'color': "lightgreen"},
+                                {'range': [total_income * 0.5, total_income], 'color': "orange"}
+                            ],
+                            'threshold': {'line': {'color': "black", 'width': 4},
+                                          'thickness': 0.75, 'value': total_expense}
+                        }
+                    ))
+                    st.plotly_chart(fig_ratio, use_container_width=True)
 # --- Budget vs Actual ---
     if not budgets_df.empty:
         # 🔹 filter budgets for the selected month & year
@@ -299,12 +225,8 @@ def run_dashboard():
         else:
             st.subheader(f"Budget vs Actual per Category ({month}/{year})")
 
-            actual_income = filtered_df[filtered_df["Type"] == "Income"] \
-                .groupby(["Category", "Type"])["Amount"].sum().reset_index()
-            actual_expense = filtered_df[filtered_df["Type"] == "Expense"] \
-                .groupby(["Category", "Type"])["Amount"].sum().reset_index()
-
-            actual_df = pd.concat([actual_income, actual_expense], ignore_index=True)
+            actual_df = filtered_df[filtered_df["Type"].isin(["Income", "Expense"])] \
+                .groupby(["Category", "Type"], observed=True)["Amount"].sum().reset_index()
 
             # 🔹 merge actuals with filtered budgets
             merged_budget = pd.merge(
@@ -312,7 +234,9 @@ def run_dashboard():
                 actual_df,
                 on=["Category", "Type"],
                 how="left"
-            ).fillna(0)
+            )
+            numeric = merged_budget.select_dtypes("number").columns
+            merged_budget[numeric] = merged_budget[numeric].fillna(0)
 
             merged_budget.rename(
                 columns={"Amount_y": "Amount", "Amount_x": "Budget"},
@@ -336,4 +260,10 @@ def run_dashboard():
                         f"Spent ${row['Amount']:.2f} / Budget ${row['Budget']:.2f}"
                     )
 
-            st.plotly_chart(budget_bar_chart(merged_budget), use_container_width=True)
+            st.plotly_chart(cached_figure(budget_bar_chart, merged_budget), use_container_width=True)
+
+    # --- Figure cache counters, after every chart of this run ---
+    with st.sidebar.expander("Figure cache"):
+        stats = figure_cache_stats()
+        st.caption(f"hits: {stats['hits']} · misses: {stats['misses']} · evictions: {stats['evictions']}")
+        st.caption(f"{stats['entries']} figures, {stats['bytes'] / 1e6:.1f} MB")
@@ -0,0 +1,111 @@
+def run_import():
+    import streamlit as st
+
+    from src.data.importer import import_transactions, parse_rules
+    from src.data.loader import csv_columns, iter_csv, iter_ofx, iter_qif
+    from src.data.tracing import traced_connection
+    from src.features.session import current_user, session_categories
+
+    # --- Require login ---
+    if current_user() is None:
+        from pages.Login import run_login
+        run_login()
+        return
+
+    st.title("📥 Import Bank Transactions")
+
+    # --- Connect to Supabase ---
+    conn = traced_connection()
+
+    cat_df = session_categories(conn)
+    if cat_df.empty:
+        st.warning("⚠️ No categories found. Please add categories first.")
+        return
+
+    uploaded = st.file_uploader("Bank export", type=["csv", "ofx", "qfx", "qif"])
+    if uploaded is None:
+        st.info("Upload a CSV, OFX or QIF export. Positive amounts become incomes, negative ones expenses.")
+        return
+    kind = uploaded.name.rsplit(".", 1)[-1].lower()
+
+    # --- Format options ---
+    col1, col2 = st.columns(2)
+    dayfirst = col1.checkbox("Day before month (31/12/2024)")
+    decimal = col2.selectbox("Decimal separator", [".", ","])
+
+    if kind == "csv":
+        sep = col1.selectbox("Column separator", [",", ";", "\t", "|"],
+                             format_func=lambda s: "Tab" if s == "\t" else s)
+        try:
+            columns = csv_columns(uploaded, sep=sep)
+        except Exception as e:
+            st.error(f"❌ Could not read the file header: {e}")
+            return
+
+        def guess(*names):
+            lowered = [c.lower() for c in columns]
+            return next((lowered.index(n) for n in names if n in lowered), 0)
+
+        col1, col2, col3 = st.columns(3)
+        date_col = col1.selectbox("Date column", columns, index=guess("date", "booking date", "transaction date"))
+        amount_col = col2.selectbox("Amount column", columns, index=guess("amount", "value", "montant"))
+        description_cols = col3.multiselect(
+            "Description columns", columns,
+            default=[columns[guess("description", "payee", "name", "memo", "label")]]
+        )
+
+    # --- Categorization rules ---
+    st.subheader("Categories")
+    col1, col2 = st.columns(2)
+    defaults = {}
+    for col, kind_name in [(col1, "Expense"), (col2, "Income")]:
+        options = cat_df[cat_df["type"] == kind_name]
+        if options.empty:
+            col.warning(f"No {kind_name} category: {kind_name.lower()} rows will have none.")
+            continue
+        name = col.selectbox(f"Default {kind_name} category", options["category"].tolist())
+        defaults[kind_name] = int(options[options["category"] == name]["id"].iloc[0])
+
+    rules_text = st.text_area(
+        "Rules, one per line: keyword = Category",
+        key="import_rules",
+        placeholder="grocery = Food\nsalary = Salary"
+    )
+    rules, unknown = parse_rules(rules_text, cat_df)
+    if unknown:
+        st.warning("Unknown category in: " + "; ".join(unknown))
+
+    # --- Import ---
+    if st.button("Import", type="primary"):
+        uploaded.seek(0)
+        if kind == "csv":
+            chunks = iter_csv(uploaded, date_col, amount_col, description_cols, sep=sep)
+        elif kind in ("ofx", "qfx"):
+            chunks = iter_ofx(uploaded)
+        else:
+            chunks = iter_qif(uploaded)
+
+        bar = st.progress(0.0, text="Importing…")
+        size = max(uploaded.size, 1)
+
+        def progress(rows_read):
+            bar.progress(min(uploaded.tell() / size, 1.0), text=f"{rows_read:,} rows read")
+
+        try:
+            summary = import_transactions(
+                conn, st.session_state.user_id, chunks, rules, defaults,
+                dayfirst=dayfirst, decimal=decimal, progress=progress
+            )
+        except Exception as e:
+            st.error(f"❌ Import stopped: {e}")
+            return
+        bar.progress(1.0, text=f"{summary['read']:,} rows read")
+
+        if summary["inserted"]:
+            st.success(f"{summary['inserted']:,} transactions imported!")
+        if summary["duplicates"]:
+            st.info(f"{summary['duplicates']:,} rows were already imported and were skipped.")
+        if summary["invalid"]:
+            st.warning(f"⚠️ {summary['invalid']:,} rows had an invalid date or amount and were skipped.")
+        if summary["failed"]:
+            st.error(f"❌ Some rows could not be saved: {summary['failed'][0]}")
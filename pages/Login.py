@@ -1,12 +1,12 @@
 # pages/Login.py
 import streamlit as st
-import bcrypt
-from st_supabase_connection import SupabaseConnection
-import pandas as pd
+
+from src.data.tracing import traced_connection
+from src.features.session import LOGIN_COLUMNS, start_session
 
 def run_login():
-    # --- Connect to Supabase ---
-    conn = st.connection("supabase", type=SupabaseConnection)
+    # The Supabase client and bcrypt are imported on the first Login / Sign Up
+    # click, not to draw the form
 
     # --- Initialize session state ---
     if "user_id" not in st.session_state:
@@ -42,18 +42,21 @@ def run_login():
 
         # Primary login button (light blue)
         if st.button("Login", key="login_btn", type="primary"):
+            from src.features.passwords import PasswordServiceBusy, verify_login
             try:
-                users = conn.table("users").select("*").eq("email", email).execute().data
+                conn = traced_connection()
+                users = conn.table("users").select(*LOGIN_COLUMNS).eq("email", email).execute().data
                 if users:
                     user = users[0]
-                    if bcrypt.checkpw(password.encode(), user["password_hash"].encode()):
-                        st.session_state.user_id = user["id"]
-                        st.session_state.user_email = user["email"]
+                    if verify_login(conn, user, password):
+                        start_session(user)
                         st.rerun()
                     else:
                         st.error("❌ Invalid password")
                 else:
                     st.error("❌ User not found")
+            except PasswordServiceBusy as e:
+                st.warning(f"⏳ {e}")
             except Exception as e:
                 st.error(f"Error logging in: {e}")
 
@@ -70,12 +73,14 @@ def run_login():
 
         # Primary signup button (light blue)
         if st.button("Sign Up", key="signup_btn", type="primary"):
+            from src.features.passwords import PasswordServiceBusy, hash_password
             try:
-                existing_users = conn.table("users").select("*").eq("email", new_email).execute().data
+                conn = traced_connection()
+                existing_users = conn.table("users").select("id").eq("email", new_email).execute().data
                 if existing_users:
                     st.warning("User already exists!")
                 else:
-                    pw_hash = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
+                    pw_hash = hash_password(new_password)
                     conn.table("users").insert({
                         "email": new_email,
                         "password_hash": pw_hash,
@@ -83,6 +88,8 @@ def run_login():
                     }).execute()
                     st.success("✅ Account created! Please login.")
                     st.session_state.show_signup = False
+            except PasswordServiceBusy as e:
+                st.warning(f"⏳ {e}")
             except Exception as e:
                 st.error(f"Error signing up: {e}")
 
@@ -1,11 +1,17 @@
 def run_recordings():
     import streamlit as st
     import pandas as pd
-    from datetime import datetime, timedelta
-    from st_supabase_connection import SupabaseConnection
+
+    from src.data.cache import invalidate
+    from src.data.recurrence import generate_dates
+    from src.data.rollups import apply_deltas, ledger_deltas, rebuild
+    from src.data.transactions import DEFAULT_PAGE_SIZE, SORT_COLUMNS, query_transactions
+    from src.data.writes import insert_rows, failed_rows
+    from src.data.tracing import traced_connection
+    from src.features.session import current_user, session_categories
 
     # --- Require login ---
-    if "user_id" not in st.session_state or st.session_state.user_id is None:
+    if current_user() is None:
         from pages.Login import run_login
         run_login()
         return
@@ -13,14 +19,10 @@ def run_recordings():
     st.title("New Expense/Income Recording & Category Management")
 
     # --- Connect to Supabase ---
-    conn = st.connection("supabase", type=SupabaseConnection)
+    conn = traced_connection()
 
     # --- Load categories safely ---
-    cat_data = conn.table("categories") \
-        .select("*") \
-        .eq("user_id", st.session_state.user_id) \
-        .execute().data
-    cat_df = pd.DataFrame(cat_data)
+    cat_df = session_categories(conn)
 
     # --- CATEGORY MANAGEMENT ---
     st.subheader("Category Management")
@@ -49,6 +51,7 @@ def run_recordings():
                         "icon": new_cat_icon,
                         "user_id": st.session_state.user_id,
                     }).execute()
+                    invalidate(st.session_state.user_id, "categories")
                     st.success(f"Category '{new_cat_name}' added!")
                     st.rerun()
 
@@ -70,16 +73,26 @@ def run_recordings():
                     }).eq("id", row["id"]) \
                      .eq("user_id", st.session_state.user_id) \
                      .execute()
+                    invalidate(st.session_state.user_id, "categories")
                     st.success(f"Category '{edit_cat}' updated!")
                     st.rerun()
 
             # --- Delete category ---
             del_cat = st.selectbox("Delete Category", options=[""] + cat_df["category"].tolist())
             if del_cat and st.button("Delete Category", type="secondary"):
-                conn.table("categories").delete() \
+                deleted = conn.table("categories").delete() \
                     .eq("category", del_cat) \
                     .eq("user_id", st.session_state.user_id) \
-                    .execute()
+                    .execute().data
+                if deleted:
+                    # The database decides what happens to the category's
+                    # transactions, so rebuild the user's rollups from the
+                    # ledger instead of guessing the deltas (deletes are rare)
+                    try:
+                        rebuild(conn, st.session_state.user_id)
+                    except Exception as e:
+                        st.warning(f"⚠️ Dashboard totals could not be updated until the next rebuild: {e}")
+                invalidate(st.session_state.user_id, "categories", "incomes", "expenses")
                 st.success(f"Category '{del_cat}' deleted!")
                 st.rerun()
         else:
@@ -111,56 +124,14 @@ def run_recordings():
         frequency = st.selectbox("Frequency", options=["Daily", "Weekly", "Monthly", "Yearly"])
         end_date = st.date_input("End Date", min_value=date)
 
-    # --- Helper: generate future dates ---
-    def generate_dates(start_date, end_date, freq):
-        dates = []
-        current = start_date
-        while current <= end_date:
-            dates.append(current)
-            if freq.lower() == "daily":
-                current += timedelta(days=1)
-            elif freq.lower() == "weekly":
-                current += timedelta(weeks=1)
-            elif freq.lower() == "monthly":
-                month = current.month + 1 if current.month < 12 else 1
-                year = current.year + (current.month // 12)
-                day = min(current.day, 28)
-                current = current.replace(year=year, month=month, day=day)
-            elif freq.lower() == "yearly":
-                current = current.replace(year=current.year + 1)
-            else:
-                break
-        return dates
-
     # --- Save Transaction ---
     if st.button("Save Transaction", type="primary"):
         table = "incomes" if exp_or_inc == "Income" else "expenses"
 
-        # Insert main transaction
-        conn.table(table).insert({
-            "date": date.isoformat(),
-            "category_id": int(category_id),
-            "amount": float(amount),
-            "title": title,
-            "user_id": st.session_state.user_id,
-            "comment": "Recurring" if is_recurring else comment
-        }).execute()
-
-        # Insert recurring transactions
+        # Save the rule first so every generated row can reference it
+        recurring_id = None
         if is_recurring:
-            future_dates = generate_dates(date, end_date, frequency)
-            for d in future_dates[1:]:
-                conn.table(table).insert({
-                    "date": d.isoformat(),
-                    "category_id": int(category_id),
-                    "amount": float(amount),
-                    "title": title,
-                    "comment": "Recurring",
-                    "user_id": st.session_state.user_id
-                }).execute()
-
-            # Save to recurrings table
-            conn.table("recurrings").insert({
+            recurring_id = conn.table("recurrings").insert({
                 "title": title,
                 "category_id": int(category_id),
                 "amount": float(amount),
@@ -170,61 +141,160 @@ def run_recordings():
                 "end_date": end_date.isoformat(),
                 "active": True,
                 "user_id": st.session_state.user_id
-            }).execute()
+            }).execute().data[0]["id"]
+
+        # Main transaction plus every recurring occurrence, sent in batches
+        dates = generate_dates(date, end_date, frequency) if is_recurring else [date]
+        rows = [{
+            "date": d.isoformat(),
+            "category_id": int(category_id),
+            "amount": float(amount),
+            "title": title,
+            "user_id": st.session_state.user_id,
+            "comment": "Recurring" if is_recurring else comment
+        } for d in dates]
+
+        if is_recurring:
+            for row in rows:
+                row["recurring_id"] = recurring_id
+            result = insert_rows(conn, table, rows, on_conflict="recurring_id,date")
+        else:
+            result = insert_rows(conn, table, rows)
+
+        if result["failed"]:
+            missing = [r["date"] for r in failed_rows(rows, result)]
+            st.error(
+                f"❌ {len(missing)} of {len(rows)} entries could not be saved "
+                f"({missing[0]} → {missing[-1]}): {result['failed'][0]['error']}"
+            )
+
+        if is_recurring:
+            # High-water mark: last date before the first failed batch, so
+            # the Recurring page picks up whatever is missing
+            first_failed = result["failed"][0]["start"] if result["failed"] else len(dates)
+            if first_failed:
+                conn.table("recurrings").update({
+                    "last_generated": dates[first_failed - 1].isoformat()
+                }).eq("id", recurring_id).eq("user_id", st.session_state.user_id).execute()
+
+        # Keep the dashboard rollups in step with the rows actually written
+        rollup_error = apply_deltas(conn, st.session_state.user_id, ledger_deltas(table, result["rows"]))
+        if rollup_error:
+            st.warning(f"⚠️ Dashboard totals could not be updated until the next rebuild: {rollup_error}")
+
+        invalidate(st.session_state.user_id, table, "recurrings")
+        if result["inserted"]:
+            st.success(f"{exp_or_inc} transaction saved successfully!")
 
-        st.success(f"{exp_or_inc} transaction saved successfully!")
-            
     # --- Edit/Delete Existing Transactions ---
     st.subheader("Manage Existing Transactions")
 
-    # Load user's transactions
-    transactions_data = conn.table("incomes").select("*").eq("user_id", st.session_state.user_id).execute().data
-    expenses_data = conn.table("expenses").select("*").eq("user_id", st.session_state.user_id).execute().data
+    # --- Filters, applied by the database ---
+    col1, col2, col3 = st.columns(3)
+    browse_type = col1.selectbox("Type", ["Expense", "Income"], key="browse_type")
+    browse_from = col2.date_input("From", value=None, key="browse_from")
+    browse_to = col3.date_input("To", value=None, key="browse_to")
+
+    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+    type_cats = cat_df[cat_df["type"] == browse_type]
+    browse_cats = col1.multiselect("Categories", options=type_cats["category"].tolist(), key="browse_cats")
+    browse_text = col2.text_input("Search title / comment", key="browse_text")
+    browse_sort = col3.selectbox("Sort by", list(SORT_COLUMNS), key="browse_sort")
+    browse_desc = col4.selectbox("Order", ["Descending", "Ascending"], key="browse_order") == "Descending"
 
-    incomes_df = pd.DataFrame(transactions_data)
-    expenses_df = pd.DataFrame(expenses_data)
+    table_name = "incomes" if browse_type == "Income" else "expenses"
+    filters = dict(
+        start=browse_from,
+        end=browse_to,
+        category_ids=type_cats[type_cats["category"].isin(browse_cats)]["id"].tolist(),
+        text=browse_text,
+        sort=SORT_COLUMNS[browse_sort],
+        descending=browse_desc,
+    )
 
-    if not incomes_df.empty:
-        incomes_df["Type"] = "Income"
-    if not expenses_df.empty:
-        expenses_df["Type"] = "Expense"
+    # Changing any filter goes back to the first page
+    if st.session_state.get("browse_filters") != (browse_type, filters):
+        st.session_state.browse_filters = (browse_type, filters)
+        st.session_state.browse_page = 1
 
-    df_all = pd.concat([incomes_df, expenses_df], ignore_index=True)
-    if df_all.empty:
-        st.info("No transactions recorded yet.")
+    # --- Fetch only the current page ---
+    # A page emptied by deletes (here or in another session) falls back to the last one
+    rows, total, page = query_transactions(
+        conn, st.session_state.user_id, table_name,
+        page=st.session_state.browse_page - 1, **filters
+    )
+    st.session_state.browse_page = page + 1
+    pages = max(1, -(-total // DEFAULT_PAGE_SIZE))
+
+    if not rows:
+        st.info("No transactions match the selected filters.")
     else:
-        # Let user select a record to edit/delete
-        record_options = [f"{row['Type']} - {row.get('title', '')} - ${row.get('amount', 0)} ({row.get('date','')})" 
-                        for idx, row in df_all.iterrows()]
-        selected_record = st.selectbox("Select a transaction to edit/delete", options=[""] + record_options)
+        category_names = dict(zip(cat_df["id"], cat_df["category"]))
+        page_df = pd.DataFrame(rows)
+        page_df["category"] = page_df["category_id"].map(category_names)
+        st.dataframe(
+            page_df[["date", "category", "title", "amount", "comment"]],
+            hide_index=True, use_container_width=True
+        )
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        if col1.button("◀ Previous", disabled=st.session_state.browse_page <= 1):
+            st.session_state.browse_page -= 1
+            st.rerun()
+        col2.caption(f"Page {st.session_state.browse_page} of {pages} · {total} transactions")
+        if col3.button("Next ▶", disabled=st.session_state.browse_page >= pages):
+            st.session_state.browse_page += 1
+            st.rerun()
+
+        # Let user select a record to edit/delete, addressed by id
+        records = {row["id"]: row for row in rows}
+        selected_id = st.selectbox(
+            "Select a transaction to edit/delete",
+            options=[None] + list(records),
+            format_func=lambda i: "" if i is None else
+                f"{browse_type} - {records[i].get('title') or ''} - ${records[i]['amount']} ({records[i]['date']})"
+        )
 
-        if selected_record:
-            # Get the selected row
-            idx = record_options.index(selected_record)
-            record = df_all.iloc[idx]
+        if selected_id is not None:
+            record = records[selected_id]
 
             # Edit fields
-            new_date = st.date_input("Date", value=pd.to_datetime(record["date"]))
-            new_type = st.selectbox("Type", ["Income", "Expense"], index=0 if record["Type"]=="Income" else 1)
-            new_amount = st.number_input("Amount", value=float(record["amount"]))
-            new_title = st.text_input("Title", value=record.get("title",""))
-            new_comment = st.text_area("Comment", value=record.get("comment",""))
+            new_date = st.date_input("Date", value=pd.to_datetime(record["date"]), key="edit_date")
+            new_amount = st.number_input("Amount", value=float(record["amount"]), key="edit_amount")
+            new_title = st.text_input("Title", value=record.get("title") or "", key="edit_title")
+            new_comment = st.text_area("Comment", value=record.get("comment") or "", key="edit_comment")
 
             # Save changes
-            if st.button("Save Changes", type="primary"):
-                table_name = "incomes" if record["Type"]=="Income" else "expenses"
-                conn.table(table_name).update({
+            if st.button("Save Changes", type="primary", key="edit_save"):
+                updated = conn.table(table_name).update({
                     "date": new_date.isoformat(),
                     "amount": new_amount,
                     "title": new_title,
                     "comment": new_comment
-                }).eq("id", int(record["id"])).eq("user_id", st.session_state.user_id).execute()
+                }).eq("id", int(selected_id)).eq("user_id", st.session_state.user_id).execute().data
+                # Move the old amount out of the rollups and the new one in
+                rollup_error = apply_deltas(
+                    conn, st.session_state.user_id,
+                    ledger_deltas(table_name, [record], sign=-1) + ledger_deltas(table_name, updated)
+                ) if updated else None
+                if rollup_error:
+                    st.warning(f"⚠️ Dashboard totals could not be updated until the next rebuild: {rollup_error}")
+                invalidate(st.session_state.user_id, table_name)
                 st.success("Transaction updated successfully!")
                 st.rerun()
 
             # Delete record
-            if st.button("Delete Transaction", type="secondary"):
-                table_name = "incomes" if record["Type"]=="Income" else "expenses"
-                conn.table(table_name).delete().eq("id", int(record["id"])).eq("user_id", st.session_state.user_id).execute()
+            if st.button("Delete Transaction", type="secondary", key="edit_delete"):
+                deleted = conn.table(table_name).delete().eq("id", int(selected_id)).eq("user_id", st.session_state.user_id).execute().data
+                rollup_error = apply_deltas(conn, st.session_state.user_id,
+                                            ledger_deltas(table_name, deleted, sign=-1))
+                if rollup_error:
+                    st.warning(f"⚠️ Dashboard totals could not be updated until the next rebuild: {rollup_error}")
+                invalidate(st.session_state.user_id, table_name)
+                # Stay within the pages left after the delete
+                st.session_state.browse_page = min(
+                    st.session_state.browse_page,
+                    max(1, -(-(total - len(deleted)) // DEFAULT_PAGE_SIZE))
+                )
                 st.success("Transaction deleted successfully!")
                 st.rerun()
@@ -1,10 +1,17 @@
 def run_recurring():
     import streamlit as st
     import pandas as pd
-    from datetime import datetime, timedelta
-    from st_supabase_connection import SupabaseConnection
+    from datetime import datetime
 
-    if "user_id" not in st.session_state or st.session_state.user_id is None:
+    from src.data.cache import invalidate
+    from src.data.recurrence import expand_rules
+    from src.data.rollups import apply_deltas, ledger_deltas
+    from src.data.schema import coerce
+    from src.data.writes import insert_rows, failed_rows
+    from src.data.tracing import traced_connection
+    from src.features.session import current_user, session_categories
+
+    if current_user() is None:
         from pages.Login import run_login
         run_login()
         return
@@ -12,7 +19,7 @@ def run_recurring():
     st.title("Recurring Transactions")
 
     # --- Connect to Supabase ---
-    conn = st.connection("supabase", type=SupabaseConnection)
+    conn = traced_connection()
 
     # --- Load active recurring transactions for this user only ---
     recurring_df = pd.DataFrame(
@@ -26,60 +33,73 @@ def run_recurring():
         st.warning("No active recurring transactions found.")
         st.stop()
 
-    # Ensure datetime columns
-    recurring_df["start_date"] = pd.to_datetime(recurring_df["start_date"])
-    recurring_df["end_date"] = pd.to_datetime(recurring_df["end_date"])
+    # Shared ledger schema: datetime64 dates, categoricals, 32-bit ids
+    if "last_generated" not in recurring_df.columns:
+        recurring_df["last_generated"] = None
+    recurring_df = coerce(recurring_df)
 
     # --- Load categories for display purposes (user-specific) ---
-    categories_df = pd.DataFrame(
-        conn.table("categories")
-            .select("id", "category")
-            .eq("user_id", st.session_state.user_id)
-            .execute().data
+    categories_df = session_categories(conn)[["id", "category"]]
+
+    # --- Occurrences due since each rule's high-water mark ---
+    # Open-ended rules materialize up to today
+    rules_df = recurring_df.rename(columns={"id": "rule_id", "last_generated": "after"})
+    rules_df["end_date"] = rules_df["end_date"].fillna(pd.Timestamp(datetime.today().date()))
+    occurrences = expand_rules(rules_df).merge(
+        recurring_df[["id", "type", "category_id", "title"]],
+        left_on="rule_id", right_on="id"
     )
 
-    # --- Helper: generate future dates ---
-    def generate_dates(row):
-        dates = []
-        current = max(row["start_date"].date(), datetime.today().date())
-        end = row["end_date"].date() if pd.notna(row["end_date"]) else current
-        freq = row["frequency"].lower()
-
-        while current <= end:
-            dates.append(current)
-            if freq == "daily":
-                current += timedelta(days=1)
-            elif freq == "weekly":
-                current += timedelta(weeks=1)
-            elif freq == "monthly":
-                month = current.month + 1 if current.month < 12 else 1
-                year = current.year + (current.month // 12)
-                day = min(current.day, 28)
-                current = current.replace(year=year, month=month, day=day)
-            elif freq == "yearly":
-                current = current.replace(year=current.year + 1)
-            else:
-                break
-        return dates
-
-    # --- Generate and insert future entries (user-specific) ---
+    # --- Generate new entries, one batched write per table ---
+    pending = {}
+    for t in ["Income", "Expense"]:
+        rows = occurrences[occurrences["type"] == t]
+        pending["incomes" if t == "Income" else "expenses"] = [{
+            "date": d.date().isoformat(),
+            "category_id": int(c),
+            "amount": float(a),
+            "title": title,
+            "comment": "Recurring",
+            "recurring_id": int(r),
+            "user_id": st.session_state.user_id
+        } for r, d, a, c, title in zip(
+            rows["rule_id"], rows["date"], rows["amount"], rows["category_id"], rows["title"]
+        )]
+
     new_entries_count = 0
-    for _, row in recurring_df.iterrows():
-        future_dates = generate_dates(row)
-        table = "incomes" if row["type"] == "Income" else "expenses"
-
-        for date in future_dates:
-            conn.table(table).insert({
-                "date": date,
-                "category_id": int(row["category_id"]),
-                "amount": float(row["amount"]),
-                "title": row["title"],
-                "comment": "Recurring",
-                "user_id": st.session_state.user_id
-            }).execute()
-            new_entries_count += 1
-
-    st.success(f"{new_entries_count} recurring entries generated!")
+    for table, rows in pending.items():
+        if not rows:
+            continue
+
+        # (recurring_id, date) is unique, so replaying rows never duplicates
+        result = insert_rows(conn, table, rows, on_conflict="recurring_id,date")
+        # Only rows the database returned are new; skipped duplicates are not
+        new_entries_count += len(result["rows"])
+        failed_ids = {r["recurring_id"] for r in failed_rows(rows, result)}
+        if failed_ids:
+            st.error(f"❌ Some {table} could not be generated: {result['failed'][0]['error']}")
+
+        # Rows skipped as already generated are not returned, so not counted twice
+        rollup_error = apply_deltas(conn, st.session_state.user_id, ledger_deltas(table, result["rows"]))
+        if rollup_error:
+            st.warning(f"⚠️ Dashboard totals could not be updated until the next rebuild: {rollup_error}")
+
+        # --- Advance the high-water mark of fully written rules ---
+        last_dates = {}
+        for r in rows:
+            last_dates[r["recurring_id"]] = max(last_dates.get(r["recurring_id"], r["date"]), r["date"])
+        for recurring_id, last_date in last_dates.items():
+            if recurring_id in failed_ids:
+                continue
+            conn.table("recurrings").update({"last_generated": last_date}) \
+                .eq("id", recurring_id) \
+                .eq("user_id", st.session_state.user_id) \
+                .execute()
+
+    if any(pending.values()):
+        invalidate(st.session_state.user_id, "incomes", "expenses", "recurrings")
+    if new_entries_count:
+        st.success(f"{new_entries_count} recurring entries generated!")
 
     # --- Display active recurring transactions ---
     if not categories_df.empty:
@@ -2,11 +2,16 @@
 def run_settings():
     # pages/Settings.py
     import streamlit as st
-    from st_supabase_connection import SupabaseConnection
-    import bcrypt
+    import tempfile
+
+    from src.data.cache import invalidate
+    from src.data.export import EXPORT_FORMATS, EXPORT_TABLES, export_user
+    from src.data.tracing import traced_connection
+    from src.features.passwords import PasswordServiceBusy, check_password, hash_password
+    from src.features.session import current_user, session_profile
 
     # --- Require login ---
-    if "user_id" not in st.session_state or st.session_state.user_id is None:
+    if current_user() is None:
         from pages.Login import run_login
         run_login()
         return
@@ -14,7 +19,13 @@ def run_settings():
     st.title("⚙️ Settings & Profile")
 
     # --- Connect to Supabase ---
-    conn = st.connection("supabase", type=SupabaseConnection)
+    conn = traced_connection()
+
+    # --- Profile, from the session cache ---
+    profile = session_profile(conn)
+    st.subheader("Profile")
+    st.write(f"**Name:** {profile.get('full_name') or '—'}")
+    st.write(f"**Email:** {profile.get('email') or '—'}")
 
     st.subheader("Change Password")
     current_pw = st.text_input("Current Password", type="password")
@@ -27,18 +38,50 @@ def run_settings():
         elif new_pw != confirm_pw:
             st.warning("New passwords do not match.")
         else:
-            # Fetch current user
-            user = conn.table("users").select("*").eq("id", st.session_state.user_id).execute().data
+            # Fetch the stored hash only
+            user = conn.table("users").select("id", "password_hash") \
+                .eq("id", st.session_state.user_id).execute().data
             if not user:
                 st.error("User not found.")
             else:
                 user = user[0]
-                # Verify current password
-                if not bcrypt.checkpw(current_pw.encode(), user["password_hash"].encode()):
-                    st.error("❌ Current password is incorrect.")
-                else:
-                    # Hash new password and update
-                    new_hash = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt()).decode()
-                    conn.table("users").update({"password_hash": new_hash}) \
-                        .eq("id", st.session_state.user_id).execute()
-                    st.success("✅ Password updated successfully!")
+                try:
+                    # Verify current password, then hash the new one
+                    if not check_password(current_pw, user["password_hash"]):
+                        st.error("❌ Current password is incorrect.")
+                    else:
+                        conn.table("users").update({"password_hash": hash_password(new_pw)}) \
+                            .eq("id", st.session_state.user_id).execute()
+                        invalidate(st.session_state.user_id, "users")
+                        st.success("✅ Password updated successfully!")
+                except PasswordServiceBusy as e:
+                    st.warning(f"⏳ {e}")
+
+    # --- Export ---
+    st.subheader("Export Data")
+    col1, col2 = st.columns(2)
+    fmt = col1.selectbox("Format", EXPORT_FORMATS, format_func=str.upper)
+    tables = col2.multiselect("Tables", EXPORT_TABLES, default=list(EXPORT_TABLES))
+
+    if st.button("Prepare Export", disabled=not tables):
+        bar = st.progress(0.0, text="Exporting…")
+
+        def progress(table, rows):
+            done = tables.index(table) + 1
+            bar.progress(done / len(tables), text=f"{table}: {rows:,} rows")
+
+        # Written page by page to a temporary file rather than built in memory;
+        # only the finished (compressed) archive is handed to the browser
+        with tempfile.TemporaryFile() as archive:
+            try:
+                counts = export_user(conn, st.session_state.user_id, archive, fmt, tables,
+                                     progress=progress)
+            except Exception as e:
+                st.error(f"❌ Export failed: {e}")
+            else:
+                archive.seek(0)
+                st.success("✅ Export ready: " + ", ".join(f"{n:,} {t}" for t, n in counts.items()))
+                st.download_button(
+                    "Download", archive.read(), file_name=f"dailyfinance_{fmt}.zip",
+                    mime="application/zip", on_click="ignore", type="primary"
+                )
@@ -0,0 +1,19 @@
+-- Track how far each recurring rule has been materialized, and tie generated
+-- rows back to their rule so the same occurrence can never be written twice.
+
+alter table recurrings add column if not exists last_generated date;
+
+alter table incomes add column if not exists recurring_id bigint
+    references recurrings(id) on delete set null;
+alter table expenses add column if not exists recurring_id bigint
+    references recurrings(id) on delete set null;
+
+create unique index if not exists incomes_recurring_occurrence
+    on incomes (recurring_id, date);
+create unique index if not exists expenses_recurring_occurrence
+    on expenses (recurring_id, date);
+
+-- Existing rules were already expanded up to their end date when saved
+update recurrings
+   set last_generated = coalesce(end_date, current_date)
+ where last_generated is null;
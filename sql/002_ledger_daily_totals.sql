@@ -0,0 +1,41 @@
+-- Pre-grouped (date, category, type) totals of a user's incomes and expenses,
+-- so the dashboard downloads O(days x categories) rows instead of the ledger.
+-- Called through PostgREST as rpc('ledger_daily_totals', {...}).
+-- p_user_id must match the type of users.id.
+
+create or replace function ledger_daily_totals(
+    p_user_id bigint,
+    p_start date default null,      -- inclusive
+    p_end date default null,        -- exclusive
+    p_recurring boolean default null -- null = all, true / false = only / no recurring
+)
+returns table (
+    date date,
+    category_id bigint,
+    category text,
+    type text,
+    amount numeric,
+    count bigint
+)
+language sql stable
+as $$
+    select t.date, t.category_id, c.category, t.type, sum(t.amount), count(*)
+      from (
+            select i.date, i.category_id, i.amount, i.comment, 'Income'::text as type
+              from incomes i
+             where i.user_id = p_user_id
+            union all
+            select e.date, e.category_id, e.amount, e.comment, 'Expense'::text
+              from expenses e
+             where e.user_id = p_user_id
+           ) t
+      left join categories c on c.id = t.category_id
+     where (p_start is null or t.date >= p_start)
+       and (p_end is null or t.date < p_end)
+       and (p_recurring is null
+            or (lower(coalesce(t.comment, '')) = 'recurring') = p_recurring)
+     group by t.date, t.category_id, c.category, t.type
+$$;
+
+create index if not exists incomes_user_date on incomes (user_id, date);
+create index if not exists expenses_user_date on expenses (user_id, date);
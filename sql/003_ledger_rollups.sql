@@ -0,0 +1,158 @@
+-- Per-user (day, category, type) and (month, category, type) sums and counts
+-- of incomes and expenses. The app applies +/- deltas on every ledger write
+-- (apply_ledger_deltas); rebuild_ledger_rollups / ledger_rollup_drift
+-- reconcile them with the raw tables (python -m src.data.rollups).
+-- `recurring` mirrors the dashboard filter: lower(comment) = 'recurring'.
+-- Monthly rows are keyed on the first day of their month.
+
+create table if not exists ledger_daily_rollup (
+    id bigint generated always as identity primary key,
+    user_id bigint not null,
+    date date not null,
+    category_id bigint,
+    type text not null,
+    recurring boolean not null,
+    amount numeric not null default 0,
+    count bigint not null default 0,
+    unique nulls not distinct (user_id, date, category_id, type, recurring)
+);
+
+create table if not exists ledger_monthly_rollup (like ledger_daily_rollup including all);
+
+create index if not exists ledger_daily_rollup_user_date on ledger_daily_rollup (user_id, date, id);
+create index if not exists ledger_monthly_rollup_user_date on ledger_monthly_rollup (user_id, date, id);
+
+-- What the daily rollup must contain, computed from the raw ledger
+create or replace view ledger_daily_source as
+    select t.user_id, t.date, t.category_id, t.type,
+           lower(coalesce(t.comment, '')) = 'recurring' as recurring,
+           sum(t.amount) as amount, count(*) as count
+      from (
+            select user_id, date, category_id, amount, comment, 'Income'::text as type from incomes
+            union all
+            select user_id, date, category_id, amount, comment, 'Expense'::text from expenses
+           ) t
+     group by 1, 2, 3, 4, 5;
+
+
+-- p_deltas: [{"date", "category_id", "type", "recurring", "amount", "count"}, ...]
+-- with negative amount / count for removed rows. Keys that reach a count of
+-- zero are deleted.
+create or replace function apply_ledger_deltas(p_user_id bigint, p_deltas jsonb)
+returns void
+language sql
+as $$
+    with deltas as (
+        select (d->>'date')::date as date,
+               (d->>'category_id')::bigint as category_id,
+               d->>'type' as type,
+               (d->>'recurring')::boolean as recurring,
+               (d->>'amount')::numeric as amount,
+               (d->>'count')::bigint as count
+          from jsonb_array_elements(p_deltas) d
+    )
+    insert into ledger_daily_rollup as r (user_id, date, category_id, type, recurring, amount, count)
+    select p_user_id, date, category_id, type, recurring, sum(amount), sum(count)
+      from deltas
+     group by date, category_id, type, recurring
+        on conflict (user_id, date, category_id, type, recurring)
+        do update set amount = r.amount + excluded.amount, count = r.count + excluded.count;
+
+    with deltas as (
+        select date_trunc('month', (d->>'date')::date)::date as date,
+               (d->>'category_id')::bigint as category_id,
+               d->>'type' as type,
+               (d->>'recurring')::boolean as recurring,
+               (d->>'amount')::numeric as amount,
+               (d->>'count')::bigint as count
+          from jsonb_array_elements(p_deltas) d
+    )
+    insert into ledger_monthly_rollup as r (user_id, date, category_id, type, recurring, amount, count)
+    select p_user_id, date, category_id, type, recurring, sum(amount), sum(count)
+      from deltas
+     group by date, category_id, type, recurring
+        on conflict (user_id, date, category_id, type, recurring)
+        do update set amount = r.amount + excluded.amount, count = r.count + excluded.count;
+
+    delete from ledger_daily_rollup where user_id = p_user_id and count = 0;
+    delete from ledger_monthly_rollup where user_id = p_user_id and count = 0;
+$$;
+
+
+-- Recompute the rollups of one user (or everyone when p_user_id is null)
+-- from the raw ledger. Returns the number of daily rows written.
+create or replace function rebuild_ledger_rollups(p_user_id bigint default null)
+returns bigint
+language plpgsql
+as $$
+declare
+    written bigint;
+begin
+    delete from ledger_daily_rollup where p_user_id is null or user_id = p_user_id;
+    delete from ledger_monthly_rollup where p_user_id is null or user_id = p_user_id;
+
+    insert into ledger_daily_rollup (user_id, date, category_id, type, recurring, amount, count)
+    select user_id, date, category_id, type, recurring, amount, count
+      from ledger_daily_source
+     where p_user_id is null or user_id = p_user_id;
+    get diagnostics written = row_count;
+
+    insert into ledger_monthly_rollup (user_id, date, category_id, type, recurring, amount, count)
+    select user_id, date_trunc('month', date)::date, category_id, type, recurring, sum(amount), sum(count)
+      from ledger_daily_rollup
+     where p_user_id is null or user_id = p_user_id
+     group by 1, 2, 3, 4, 5;
+
+    return written;
+end;
+$$;
+
+
+-- Rollup keys whose sums or counts differ from the raw ledger
+create or replace function ledger_rollup_drift(p_user_id bigint default null)
+returns table (
+    grain text,
+    user_id bigint,
+    date date,
+    category_id bigint,
+    type text,
+    recurring boolean,
+    expected_amount numeric,
+    actual_amount numeric,
+    expected_count bigint,
+    actual_count bigint
+)
+language sql stable
+as $$
+    with daily as (
+        select * from ledger_daily_source where p_user_id is null or user_id = p_user_id
+    ),
+    monthly as (
+        select user_id, date_trunc('month', date)::date as date, category_id, type, recurring,
+               sum(amount) as amount, sum(count)::bigint as count
+          from daily
+         group by 1, 2, 3, 4, 5
+    )
+    select 'daily', coalesce(s.user_id, r.user_id), coalesce(s.date, r.date),
+           coalesce(s.category_id, r.category_id), coalesce(s.type, r.type),
+           coalesce(s.recurring, r.recurring), s.amount, r.amount, s.count, r.count
+      from daily s
+      full join (select * from ledger_daily_rollup
+                  where p_user_id is null or user_id = p_user_id) r
+        on (s.user_id, s.date, s.type, s.recurring) = (r.user_id, r.date, r.type, r.recurring)
+       and s.category_id is not distinct from r.category_id
+     where s.amount is distinct from r.amount or s.count is distinct from r.count
+    union all
+    select 'monthly', coalesce(s.user_id, r.user_id), coalesce(s.date, r.date),
+           coalesce(s.category_id, r.category_id), coalesce(s.type, r.type),
+           coalesce(s.recurring, r.recurring), s.amount, r.amount, s.count, r.count
+      from monthly s
+      full join (select * from ledger_monthly_rollup
+                  where p_user_id is null or user_id = p_user_id) r
+        on (s.user_id, s.date, s.type, s.recurring) = (r.user_id, r.date, r.type, r.recurring)
+       and s.category_id is not distinct from r.category_id
+     where s.amount is distinct from r.amount or s.count is distinct from r.count
+$$;
+
+-- Existing ledgers start out reconciled
+select rebuild_ledger_rollups();
@@ -0,0 +1,54 @@
+-- Change tracking for the optional local ledger mirror (src/data/mirror.py):
+-- every insert / update stamps updated_at, every delete leaves a tombstone,
+-- so a client can pull only what changed since its last (timestamp, id).
+-- Tombstones older than the longest time a mirror may stay offline can be
+-- pruned; an older mirror file must then be deleted and resynced.
+
+alter table incomes add column if not exists updated_at timestamptz not null default now();
+alter table expenses add column if not exists updated_at timestamptz not null default now();
+
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+create or replace trigger incomes_touch_updated_at
+    before update on incomes for each row execute function touch_updated_at();
+create or replace trigger expenses_touch_updated_at
+    before update on expenses for each row execute function touch_updated_at();
+
+create index if not exists incomes_user_updated on incomes (user_id, updated_at, id);
+create index if not exists expenses_user_updated on expenses (user_id, updated_at, id);
+
+
+create table if not exists ledger_tombstones (
+    id bigint generated always as identity primary key,
+    user_id bigint not null,
+    table_name text not null,
+    row_id bigint not null,
+    deleted_at timestamptz not null default now()
+);
+
+create index if not exists ledger_tombstones_user_deleted
+    on ledger_tombstones (user_id, table_name, deleted_at, id);
+
+create or replace function record_tombstone()
+returns trigger
+language plpgsql
+as $$
+begin
+    insert into ledger_tombstones (user_id, table_name, row_id)
+    values (old.user_id, tg_table_name, old.id);
+    return old;
+end;
+$$;
+
+create or replace trigger incomes_tombstone
+    after delete on incomes for each row execute function record_tombstone();
+create or replace trigger expenses_tombstone
+    after delete on expenses for each row execute function record_tombstone();
@@ -0,0 +1,9 @@
+-- Content hash of imported bank transactions (src/data/importer.py), unique
+-- per user, so importing the same export twice writes nothing new.
+-- Rows entered by hand keep a null hash and never conflict.
+
+alter table incomes add column if not exists import_hash text;
+alter table expenses add column if not exists import_hash text;
+
+create unique index if not exists incomes_import_hash on incomes (user_id, import_hash);
+create unique index if not exists expenses_import_hash on expenses (user_id, import_hash);
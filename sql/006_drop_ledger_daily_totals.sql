@@ -0,0 +1,4 @@
+-- The dashboard reads its totals from the rollup tables (003), so the
+-- pre-grouping function of 002 is no longer called.
+
+drop function if exists ledger_daily_totals(bigint, date, date, boolean);
@@ -0,0 +1,43 @@
+import pandas as pd
+import streamlit as st
+
+from src.data.pagination import DEFAULT_PAGE_SIZE, iter_pages, read_frame
+from src.data.versions import invalidate, table_version  # noqa: F401 (re-exported)
+
+# Entries are shared by every session of the server process
+CACHE_TTL = 600  # seconds, fallback for writes made outside this app
+CACHE_MAX_ENTRIES = 256  # least recently used entries are evicted first
+
+# Tables that can outgrow one response and are read in keyset pages
+PAGED_TABLES = {"incomes", "expenses", "ledger_daily_rollup", "ledger_monthly_rollup"}
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _fetch_frame(_conn, user_id, table, version, columns=None, start=None, end=None,
+                 page_size=DEFAULT_PAGE_SIZE, _progress=None):
+    if table in PAGED_TABLES:
+        pages = iter_pages(_conn, table, user_id, columns, start, end, page_size=page_size)
+        return read_frame(pages, progress=_progress)
+
+    query = _conn.table(table).select(*(columns or ["*"])).eq("user_id", user_id)
+    if start is not None:
+        query = query.gte("date", start.isoformat())
+    if end is not None:
+        query = query.lt("date", end.isoformat())
+    return pd.DataFrame(query.execute().data)
+
+
+def cached_frame(conn, user_id, table, columns=None, start=None, end=None,
+                 page_size=DEFAULT_PAGE_SIZE, progress=None):
+    """
+    DataFrame of a user's table, fetched at most once per table version.
+    `columns` projects the select and `start` / `end` restrict the date
+    column to [start, end) on the server. Ledger tables are streamed in
+    keyset pages of `page_size` rows, reporting to `progress(rows_loaded)`.
+    """
+    return _fetch_frame(
+        conn, user_id, table, table_version(user_id, table),
+        columns=tuple(columns) if columns else None, start=start, end=end,
+        page_size=page_size, _progress=progress
+    )
+
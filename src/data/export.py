@@ -0,0 +1,184 @@
+"""
+Streaming export of a user's ledger to CSV or Parquet.
+
+Tables are read page by page and every page is written out before the
+next one is fetched, so memory stays bounded by the page size whatever
+the size of the ledger. Category names are joined in from the (small)
+categories table. Each export is a zip archive with one file per table:
+
+    python -m src.data.export --out exports/ [--format parquet] [--user ID ...]
+"""
+import argparse
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.pagination import DEFAULT_PAGE_SIZE, iter_pages, iter_ranges
+from src.data.schema import SCHEMA, coerce
+
+EXPORT_TABLES = ("incomes", "expenses", "recurrings", "budgets")
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Internal columns left out of exports
+EXPORT_EXCLUDED = ("user_id", "import_hash", "updated_at")
+
+
+def category_names(conn, user_id):
+    """{category_id: category name} of a user"""
+    rows = conn.table("categories").select("id", "category").eq("user_id", user_id).execute().data
+    return {row["id"]: row["category"] for row in rows}
+
+
+def iter_table(conn, user_id, table, page_size=DEFAULT_PAGE_SIZE):
+    """Yield a user's rows of `table` page by page (keyset pages for the ledger)"""
+    if table in ("incomes", "expenses"):
+        return iter_pages(conn, table, user_id, page_size=page_size)
+    return iter_ranges(
+        lambda: conn.table(table).select("*").eq("user_id", user_id), ("id",), page_size=page_size
+    )
+
+
+def export_frames(conn, user_id, table, names=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield export-ready DataFrames of a user's table, one per page: typed,
+    without internal columns, with a "category" column after category_id.
+    Categoricals are plain strings, since their categories differ per page.
+    """
+    if names is None:
+        names = category_names(conn, user_id)
+    for rows in iter_table(conn, user_id, table, page_size):
+        df = coerce(pd.DataFrame.from_records(rows))
+        df = df.drop(columns=[c for c in EXPORT_EXCLUDED if c in df.columns])
+        if "category_id" in df.columns:
+            df.insert(df.columns.get_loc("category_id") + 1, "category",
+                      df["category_id"].map(names).astype("string"))
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype("string")
+        yield df
+
+
+def write_csv(frames, out):
+    """Write DataFrames to a binary stream as one CSV; returns the row count"""
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    rows = 0
+    for df in frames:
+        df.to_csv(text, index=False, header=rows == 0, date_format="%Y-%m-%d")
+        rows += len(df)
+    text.flush()
+    text.detach()
+    return rows
+
+
+def _arrow_type(dtype):
+    """Parquet column type of a src.data.schema dtype"""
+    import pyarrow as pa
+
+    if dtype.startswith("datetime64"):
+        return pa.timestamp("ns")
+    if dtype == "category":
+        return pa.string()
+    if dtype == "bool":
+        return pa.bool_()
+    if dtype.startswith("float"):
+        return pa.float64()
+    return pa.int64()
+
+
+def parquet_schema(first):
+    """
+    Schema of a Parquet export from the Arrow schema of its first page:
+    columns of SCHEMA get their declared type, others keep the type of the
+    first page (text when it is all null), so later pages cast to it.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in first:
+        if field.name in SCHEMA:
+            field = field.with_type(_arrow_type(SCHEMA[field.name]))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field.with_nullable(True))
+    return pa.schema(fields)
+
+
+def write_parquet(frames, out):
+    """Write DataFrames to a binary stream as one Parquet file; returns the row count"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, schema = None, None
+    rows = 0
+    try:
+        for df in frames:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                schema = parquet_schema(table.schema)
+                writer = pq.ParquetWriter(out, schema)
+            # One row group per page, cast to the types fixed by the first
+            writer.write_table(table.select(schema.names).cast(schema))
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export_user(conn, user_id, out, fmt="csv", tables=EXPORT_TABLES,
+                page_size=DEFAULT_PAGE_SIZE, progress=None):
+    """
+    Write a zip archive of a user's tables (one `<table>.<fmt>` file each)
+    to the binary stream or path `out`. `progress(table, rows_written)` is
+    called after each table. Returns {table: rows_written}.
+    """
+    names = category_names(conn, user_id)
+    counts = {}
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for table in tables:
+            with archive.open(f"{table}.{fmt}", "w") as member:
+                counts[table] = WRITERS[fmt](
+                    export_frames(conn, user_id, table, names, page_size), member
+                )
+            if progress is not None:
+                progress(table, counts[table])
+    return counts
+
+
+def main(argv=None):
+    import streamlit as st
+    from st_supabase_connection import SupabaseConnection
+
+    parser = argparse.ArgumentParser(prog="python -m src.data.export")
+    parser.add_argument("--out", type=Path, required=True, help="directory of the archives")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--user", type=int, action="append", default=None,
+                        help="user id to export, repeatable (default: all users)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    # Same connection settings as the app (.streamlit/secrets.toml or env)
+    conn = st.connection("supabase", type=SupabaseConnection)
+
+    user_ids = args.user
+    if user_ids is None:
+        pages = iter_ranges(lambda: conn.table("users").select("id"), ("id",))
+        user_ids = [row["id"] for rows in pages for row in rows]
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for user_id in user_ids:
+        path = args.out / f"user_{user_id}_{args.format}.zip"
+        counts = export_user(conn, user_id, path, args.format, page_size=args.page_size)
+        print(f"user {user_id}: " + ", ".join(f"{n} {t}" for t, n in counts.items()) + f" -> {path}")
+    print(f"Exported {len(user_ids)} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+DEFAULT_TIMEOUT = 20  # seconds for all the loads of one page
+MAX_WORKERS = 8  # shared by every session of the server process
+
+
+@st.cache_resource
+def _pool():
+    """
+    Process-wide worker pool and one slot per worker. A slot is held until
+    its job returns, including a job whose result was abandoned on timeout.
+    """
+    return {
+        "pool": ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fetch"),
+        "slots": threading.BoundedSemaphore(MAX_WORKERS),
+    }
+
+
+def fetch_all(jobs, timeout=DEFAULT_TIMEOUT):
+    """
+    Run independent loads concurrently.
+
+    `jobs` maps a name to a zero-argument callable. A failing or slow job
+    does not affect the others. Returns a dict with:
+      - results: {name: value} of the jobs that succeeded in time
+      - errors: {name: message} of the jobs that failed or timed out
+      - timings: {name: seconds} spent by each job
+
+    The timeout only abandons the result: a running job cannot be stopped
+    and keeps its worker until the request underneath returns. So that hung
+    jobs of one session cannot starve every other session, jobs that find
+    no free worker run inline on the calling thread instead, where the
+    timeout does not apply.
+    """
+    ctx = get_script_run_ctx()
+    state = _pool()
+    started = {}
+    finished = {}
+
+    def run(name, job, pooled):
+        if pooled:
+            # Let the worker use st.cache_data & co. on behalf of this session
+            add_script_run_ctx(threading.current_thread(), ctx)
+        started[name] = time.perf_counter()
+        try:
+            return job()
+        finally:
+            finished[name] = time.perf_counter()
+            if pooled:
+                state["slots"].release()
+
+    t0 = time.perf_counter()
+    futures, inline = {}, {}
+    for name, job in jobs.items():
+        if state["slots"].acquire(blocking=False):
+            futures[name] = state["pool"].submit(run, name, job, True)
+        else:
+            inline[name] = job
+
+    out = {"results": {}, "errors": {}, "timings": {}}
+    for name, job in inline.items():
+        try:
+            out["results"][name] = run(name, job, False)
+        except Exception as e:
+            out["errors"][name] = str(e)
+    wait(futures.values(), timeout=max(0, timeout - (time.perf_counter() - t0)))
+
+    for name, future in futures.items():
+        if not future.done():
+            out["errors"][name] = f"timed out after {timeout}s"
+        elif future.exception() is not None:
+            out["errors"][name] = str(future.exception())
+        else:
+            out["results"][name] = future.result()
+    for name in jobs:
+        out["timings"][name] = finished.get(name, time.perf_counter()) - started.get(name, t0)
+    return out
@@ -0,0 +1,171 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.data.cache import invalidate
+from src.data.rollups import apply_deltas, ledger_deltas
+from src.data.writes import insert_rows
+
+IMPORT_COMMENT = "Imported"
+
+
+def parse_amounts(values, decimal="."):
+    """
+    Amount strings as floats (NaN when invalid). Handles currency symbols,
+    spaces / thousands separators, a decimal comma and (123.45) negatives.
+    """
+    text = values.astype(str).str.strip()
+    negative = text.str.startswith("(") & text.str.endswith(")")
+    thousands = "." if decimal == "," else ","
+    text = text.str.replace(r"[^\d,.\-+]", "", regex=True).str.replace(thousands, "", regex=False)
+    if decimal == ",":
+        text = text.str.replace(",", ".", regex=False)
+    amounts = pd.to_numeric(text, errors="coerce")
+    return amounts.where(~negative, -amounts.abs())
+
+
+def parse_dates(values, dayfirst=False):
+    """
+    Date strings as datetime64 (NaT when invalid). Accepts ISO dates,
+    YYYYMMDD (OFX) and QIF's 12/31'24 style.
+    """
+    text = values.astype(str).str.strip().str.replace("'", "/", regex=False) \
+        .str.replace(" ", "", regex=False)
+    compact = text.str.fullmatch(r"\d{8}")
+    dates = pd.to_datetime(text.where(compact), errors="coerce", format="%Y%m%d")
+    if not dayfirst:
+        # Fast path for ISO dates; only the rest goes through the slow parser
+        dates = dates.fillna(pd.to_datetime(text.where(~compact), errors="coerce", format="ISO8601"))
+    rest = dates.isna() & ~compact
+    if rest.any():
+        dates[rest] = pd.to_datetime(text[rest], errors="coerce", dayfirst=dayfirst, format="mixed")
+    return dates
+
+
+def parse_rules(text, categories):
+    """
+    Rules of the form `keyword = Category`, one per line, against the
+    user's categories (id, category, type). Returns [(keyword, id, type)] and
+    the lines that name an unknown category.
+    """
+    by_name = {str(c).lower(): (i, t) for i, c, t in
+               zip(categories["id"], categories["category"], categories["type"])}
+    rules, unknown = [], []
+    for line in text.splitlines():
+        keyword, sep, name = line.partition("=")
+        if not sep or not keyword.strip():
+            continue
+        match = by_name.get(name.strip().lower())
+        if match is None:
+            unknown.append(line.strip())
+        else:
+            rules.append((keyword.strip().lower(), int(match[0]), match[1]))
+    return rules, unknown
+
+
+def categorize(descriptions, types, rules, defaults):
+    """
+    Category id of every row: the first rule whose keyword appears in the
+    description and whose category has the row's type, else the default
+    category of the type (`defaults` maps "Income" / "Expense" to an id).
+    """
+    lowered = descriptions.str.lower()
+    category = types.map(defaults).astype("float64")
+    assigned = pd.Series(False, index=descriptions.index)
+    for keyword, category_id, kind in rules:
+        hit = ~assigned & (types == kind) & lowered.str.contains(keyword, regex=False)
+        category[hit] = category_id
+        assigned |= hit
+    return category
+
+
+def row_hashes(dates, amounts, descriptions, seen):
+    """
+    Stable hash of (date, amount, description, n) where n counts identical
+    rows seen so far in the file, so two equal purchases on the same day are
+    both kept while a re-imported file matches its first import. `seen` is
+    updated in place and carries the counts across chunks.
+    """
+    keys = dates.dt.strftime("%Y-%m-%d") + "|" + amounts.map("{:.2f}".format) + "|" \
+        + descriptions.str.lower().str.replace(r"\s+", " ", regex=True)
+    hashes = []
+    for key in keys:
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        hashes.append(hashlib.sha1(f"{key}|{n}".encode()).hexdigest()[:32])
+    return hashes
+
+
+def prepare_chunk(raw, user_id, rules, defaults, seen, dayfirst=False, decimal="."):
+    """
+    Validate and normalize one chunk of raw (date, amount, description) rows.
+    Positive amounts are incomes and negative ones expenses, stored as
+    absolute values. Returns ({table: rows}, number of invalid rows).
+    """
+    dates = parse_dates(raw["date"], dayfirst=dayfirst)
+    amounts = parse_amounts(raw["amount"], decimal=decimal)
+    valid = dates.notna() & amounts.notna() & (amounts != 0)
+    dates, amounts = dates[valid], amounts[valid]
+    descriptions = raw["description"][valid].fillna("").astype(str).str.strip()
+
+    types = pd.Series(np.where(amounts > 0, "Income", "Expense"), index=amounts.index)
+    categories = categorize(descriptions, types, rules, defaults)
+    hashes = row_hashes(dates, amounts, descriptions, seen)
+
+    rows = {"incomes": [], "expenses": []}
+    for d, a, text, kind, category_id, h in zip(
+        dates.dt.strftime("%Y-%m-%d"), amounts, descriptions, types, categories, hashes
+    ):
+        rows["incomes" if kind == "Income" else "expenses"].append({
+            "date": d,
+            "amount": round(abs(float(a)), 2),
+            "title": text[:255],
+            "comment": IMPORT_COMMENT,
+            "category_id": None if np.isnan(category_id) else int(category_id),
+            "user_id": user_id,
+            "import_hash": h,
+        })
+    return rows, int((~valid).sum())
+
+
+def import_transactions(conn, user_id, chunks, rules, defaults, dayfirst=False, decimal=".",
+                        progress=None):
+    """
+    Import chunks of raw bank transactions (see src.data.loader readers).
+
+    Each chunk is validated, categorized, hashed and written with batched
+    upserts on (user_id, import_hash), so rows already imported are skipped
+    by the database; only one chunk is in memory at a time. Rollups are
+    updated with the rows actually written. `progress(rows_read)` is called
+    after each chunk. Returns a summary dict: read, invalid, inserted,
+    duplicates and failed (list of error messages).
+    """
+    summary = {"read": 0, "invalid": 0, "inserted": 0, "duplicates": 0, "failed": []}
+    seen = {}
+    written = set()
+
+    for raw in chunks:
+        rows, invalid = prepare_chunk(raw, user_id, rules, defaults, seen, dayfirst, decimal)
+        summary["read"] += len(raw)
+        summary["invalid"] += invalid
+
+        for table, table_rows in rows.items():
+            if not table_rows:
+                continue
+            result = insert_rows(conn, table, table_rows, on_conflict="user_id,import_hash")
+            summary["inserted"] += len(result["rows"])
+            summary["duplicates"] += result["inserted"] - len(result["rows"])
+            summary["failed"] += [f["error"] for f in result["failed"]]
+
+            error = apply_deltas(conn, user_id, ledger_deltas(table, result["rows"]))
+            if error:
+                summary["failed"].append(f"rollups: {error}")
+            written.add(table)
+
+        if progress is not None:
+            progress(summary["read"])
+
+    if written:
+        invalidate(user_id, *written)
+    return summary
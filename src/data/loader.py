@@ -9,3 +9,110 @@ def load_data(path: str | Path = "data/sample.csv") -> pd.DataFrame:
         return pd.DataFrame({"date": pd.date_range("2024-01-01", periods=10),
                              "sales": range(10)})
     return pd.read_csv(p)
+
+
+# --- Streaming readers for bank exports ---
+# Every reader yields DataFrames of at most `chunksize` raw transactions with
+# string columns date, amount and description; parsing and validation
+# happen later (src.data.importer), one chunk at a time.
+
+IMPORT_COLUMNS = ["date", "amount", "description"]
+DEFAULT_CHUNKSIZE = 5000
+
+
+def iter_csv(file, date_col, amount_col, description_cols, chunksize=DEFAULT_CHUNKSIZE,
+             sep=",", encoding="utf-8"):
+    """CSV export in chunks; description_cols are joined with a space"""
+    usecols = list(dict.fromkeys([date_col, amount_col, *description_cols]))
+    reader = pd.read_csv(
+        file, sep=sep, encoding=encoding,
+        usecols=usecols, dtype=str, keep_default_na=False, chunksize=chunksize
+    )
+    for chunk in reader:
+        description = chunk[description_cols[0]].str.strip() if description_cols else ""
+        for column in description_cols[1:]:
+            description = description.str.cat(chunk[column].str.strip(), sep=" ").str.strip()
+        yield pd.DataFrame({
+            "date": chunk[date_col].str.strip(),
+            "amount": chunk[amount_col].str.strip(),
+            "description": description,
+        })
+
+
+def csv_columns(file, sep=",", encoding="utf-8"):
+    """Header of a CSV export; rewinds the file afterwards"""
+    columns = pd.read_csv(file, sep=sep, encoding=encoding, nrows=0).columns
+    file.seek(0)
+    return list(columns)
+
+
+def _lines(file, encoding):
+    for line in file:
+        yield (line.decode(encoding, errors="replace") if isinstance(line, bytes) else line).strip()
+
+
+def _chunks(records, chunksize):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == chunksize:
+            yield pd.DataFrame(batch, columns=IMPORT_COLUMNS)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=IMPORT_COLUMNS)
+
+
+def _ofx_tags(lines):
+    """One <TAG>value item at a time, also when several share a line"""
+    for line in lines:
+        for item in line.replace("<", "\n<").splitlines():
+            if item.strip():
+                yield item.strip()
+
+
+def _ofx_records(lines):
+    """<STMTTRN> blocks of an OFX (SGML or XML) file, one tag at a time"""
+    record = None
+    for line in _ofx_tags(lines):
+        upper = line.upper()
+        if upper.startswith("<STMTTRN>"):
+            record = {}
+        elif upper.startswith("</STMTTRN>") and record is not None:
+            yield (
+                record.get("DTPOSTED", "")[:8],
+                record.get("TRNAMT", ""),
+                " ".join(filter(None, [record.get("NAME"), record.get("MEMO")])),
+            )
+            record = None
+        elif record is not None and upper.startswith("<") and ">" in line:
+            tag, _, value = line[1:].partition(">")
+            if value:
+                record[tag.upper()] = value.strip()
+
+
+def iter_ofx(file, chunksize=DEFAULT_CHUNKSIZE, encoding="latin-1"):
+    """OFX / QFX statement transactions in chunks (dates as YYYYMMDD)"""
+    return _chunks(_ofx_records(_lines(file, encoding)), chunksize)
+
+
+def _qif_records(lines):
+    """Records of a QIF file: D date, T / U amount, P payee, M memo, ^ end"""
+    record = {}
+    for line in lines:
+        if not line or line.startswith("!"):
+            continue
+        if line.startswith("^"):
+            if record:
+                yield (
+                    record.get("D", ""),
+                    record.get("T", record.get("U", "")),
+                    " ".join(filter(None, [record.get("P"), record.get("M")])),
+                )
+            record = {}
+        else:
+            record.setdefault(line[0], line[1:].strip())
+
+
+def iter_qif(file, chunksize=DEFAULT_CHUNKSIZE, encoding="latin-1"):
+    """QIF transactions in chunks (dates as written, e.g. 12/31'24)"""
+    return _chunks(_qif_records(_lines(file, encoding)), chunksize)
@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from src.data.cache import CACHE_TTL, table_version
+from src.data.pagination import DEFAULT_PAGE_SIZE
+from src.data.schema import coerce
+
+# Path of the SQLite file holding the mirror (":memory:" works too);
+# the mirror is disabled when the variable is not set
+MIRROR_ENV = "LEDGER_MIRROR_PATH"
+
+MIRRORED_TABLES = ("incomes", "expenses")
+MIRROR_COLUMNS = ("id", "user_id", "date", "category_id", "amount", "title", "comment",
+                  "recurring_id", "updated_at")
+
+SYNC_INTERVAL = CACHE_TTL  # seconds between syncs when the app wrote nothing
+SYNC_OVERLAP = pd.Timedelta(minutes=5)  # re-read window for late-committing writes
+
+_DDL = """
+create table if not exists {table} (
+    id integer primary key,
+    user_id integer not null,
+    date text not null,
+    category_id integer,
+    amount real,
+    title text,
+    comment text,
+    recurring_id integer,
+    updated_at text
+);
+create index if not exists {table}_user_date on {table} (user_id, date);
+"""
+
+_STATE_DDL = """
+create table if not exists sync_state (
+    user_id integer not null,
+    table_name text not null,
+    changes_at text,
+    tombstones_at text,
+    primary key (user_id, table_name)
+);
+"""
+
+
+def mirror_enabled():
+    return bool(os.environ.get(MIRROR_ENV))
+
+
+@st.cache_resource
+def open_mirror(path):
+    """Process-wide SQLite mirror; every access goes through its lock"""
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.executescript(_STATE_DDL + "".join(_DDL.format(table=t) for t in MIRRORED_TABLES))
+    return {"db": db, "lock": threading.Lock(), "synced": {}}
+
+
+def _mirror():
+    return open_mirror(os.environ[MIRROR_ENV])
+
+
+def _pull(conn, table, user_id, column, since, columns, extra=None,
+          page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield rows of `table` with `column` at or after `since` (minus the
+    overlap), in keyset pages ordered by (column, id).
+    """
+    last = None
+    floor = None if since is None else (pd.Timestamp(since) - SYNC_OVERLAP).isoformat()
+    while True:
+        query = conn.table(table).select(*columns).eq("user_id", user_id)
+        for key, value in (extra or {}).items():
+            query = query.eq(key, value)
+        if floor is not None:
+            query = query.gte(column, floor)
+        if last is not None:
+            query = query.or_(
+                f'{column}.gt."{last[column]}",and({column}.eq."{last[column]}",id.gt.{last["id"]})'
+            )
+        rows = query.order(column).order("id").limit(page_size).execute().data
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def _watermark(current, rows, column):
+    stamps = [current] if current else []
+    stamps += [row[column] for row in rows if row.get(column)]
+    return max(stamps, key=pd.Timestamp) if stamps else None
+
+
+def sync(conn, user_id, table, force=False):
+    """
+    Bring the mirror of a user's table up to date: upsert rows whose
+    updated_at moved since the last sync, delete rows with a newer
+    tombstone. Skipped (returns None) while the table version is unchanged
+    and the last sync is younger than SYNC_INTERVAL, unless `force`.
+    Returns {"changed": n, "deleted": n}.
+    """
+    mirror = _mirror()
+    key = (user_id, table)
+    version = table_version(user_id, table)
+    last = mirror["synced"].get(key)
+    if not force and last and last[0] == version and time.monotonic() - last[1] < SYNC_INTERVAL:
+        return None
+
+    db = mirror["db"]
+    with mirror["lock"]:
+        state = db.execute(
+            "select changes_at, tombstones_at from sync_state where user_id = ? and table_name = ?",
+            (user_id, table)
+        ).fetchone() or (None, None)
+    changes_at, tombstones_at = state
+    placeholders = ", ".join("?" * len(MIRROR_COLUMNS))
+    result = {"changed": 0, "deleted": 0}
+
+    for rows in _pull(conn, table, user_id, "updated_at", changes_at, MIRROR_COLUMNS):
+        with mirror["lock"], db:
+            db.executemany(
+                f"insert or replace into {table} ({', '.join(MIRROR_COLUMNS)}) values ({placeholders})",
+                [tuple(row.get(c) for c in MIRROR_COLUMNS) for row in rows]
+            )
+        changes_at = _watermark(changes_at, rows, "updated_at")
+        result["changed"] += len(rows)
+
+    for rows in _pull(conn, "ledger_tombstones", user_id, "deleted_at", tombstones_at,
+                      ("id", "row_id", "deleted_at"), extra={"table_name": table}):
+        with mirror["lock"], db:
+            db.executemany(f"delete from {table} where id = ?", [(row["row_id"],) for row in rows])
+        tombstones_at = _watermark(tombstones_at, rows, "deleted_at")
+        result["deleted"] += len(rows)
+
+    with mirror["lock"], db:
+        db.execute(
+            "insert or replace into sync_state values (?, ?, ?, ?)",
+            (user_id, table, changes_at, tombstones_at)
+        )
+    mirror["synced"][key] = (version, time.monotonic())
+    return result
+
+
+def _query(sql, params):
+    mirror = _mirror()
+    with mirror["lock"]:
+        return pd.read_sql_query(sql, mirror["db"], params=params)
+
+
+def _window(user_id, start, end):
+    """where clause and parameters of a user's rows dated in [start, end)"""
+    clause, params = "user_id = ?", [user_id]
+    if start is not None:
+        clause += " and date >= ?"
+        params.append(start.isoformat())
+    if end is not None:
+        clause += " and date < ?"
+        params.append(end.isoformat())
+    return clause, params
+
+
+def mirror_frame(conn, user_id, table, columns=None, start=None, end=None):
+    """A user's mirrored table (synced first), like cached_frame"""
+    sync(conn, user_id, table)
+    clause, params = _window(user_id, start, end)
+    select = ", ".join(columns) if columns else ", ".join(MIRROR_COLUMNS)
+    return coerce(_query(f"select {select} from {table} where {clause} order by date, id", params))
+
+
+def mirror_totals(conn, user_id, start=None, end=None, recurring=None, monthly=False):
+    """
+    (date, category_id, type, amount, count) sums of a user's incomes and
+    expenses in [start, end), grouped locally; `monthly` groups by month.
+    """
+    day = "substr(date, 1, 7) || '-01'" if monthly else "date"
+    parts, params = [], []
+    for table, kind in zip(MIRRORED_TABLES, ["Income", "Expense"]):
+        sync(conn, user_id, table)
+        clause, window = _window(user_id, start, end)
+        if recurring is not None:
+            clause += f" and (lower(coalesce(comment, '')) = 'recurring') = {int(recurring)}"
+        parts.append(
+            f"select {day} as date, category_id, '{kind}' as type, sum(amount) as amount, "
+            f"count(*) as count from {table} where {clause} group by 1, 2"
+        )
+        params += window
+    return coerce(_query(" union all ".join(parts), params))
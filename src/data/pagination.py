@@ -0,0 +1,78 @@
+import pandas as pd
+
+from src.data.schema import coerce, concat
+
+# Must not exceed the PostgREST max-rows setting (1000 on Supabase), since a
+# short page is how the end of the table is detected
+DEFAULT_PAGE_SIZE = 1000
+
+
+def iter_pages(conn, table, user_id, columns=None, start=None, end=None,
+               page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield a user's rows page by page, ordered by (date, id).
+
+    Each page resumes after the last (date, id) seen instead of using an
+    offset, so every request is an index range scan and no row is skipped
+    or repeated when PostgREST caps the response size.
+    `start` / `end` restrict dates to [start, end).
+    """
+    if columns:
+        columns = list(dict.fromkeys(["id", "date", *columns]))
+
+    last = None
+    while True:
+        query = conn.table(table).select(*(columns or ["*"])).eq("user_id", user_id)
+        if start is not None:
+            query = query.gte("date", start.isoformat())
+        if end is not None:
+            query = query.lt("date", end.isoformat())
+        if last is not None:
+            query = query.or_(
+                f"date.gt.{last['date']},and(date.eq.{last['date']},id.gt.{last['id']})"
+            )
+
+        rows = query.order("date").order("id").limit(page_size).execute().data
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def iter_ranges(make_query, order, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield the rows of a query page by page using offset ranges.
+    For small, bounded results without a (date, id) key, such as database
+    function outputs; `order` must give the rows a total order.
+    """
+    offset = 0
+    while True:
+        query = make_query()
+        for column in order:
+            query = query.order(column)
+        rows = query.range(offset, offset + page_size - 1).execute().data
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+def read_frame(pages, progress=None):
+    """
+    Build a DataFrame from an iterable of row pages.
+    Every page is converted to the typed columns of src.data.schema as soon
+    as it arrives, so only one page of row dicts is alive at a time.
+    `progress(rows_loaded)` is called after each page.
+    """
+    chunks = []
+    loaded = 0
+    for rows in pages:
+        chunk = coerce(pd.DataFrame.from_records(rows))
+        chunks.append(chunk)
+        loaded += len(chunk)
+        if progress is not None:
+            progress(loaded)
+
+    return concat(chunks)
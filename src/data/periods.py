@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+PERIOD_OPTIONS = ["Week-to-Date", "Month-to-Date", "Year-to-Date",
+                  "Last 7 Days", "Last 30 Days", "Last 365 Days"]
+
+
+def period_start(period, today):
+    """First day included by a period option (None for unknown periods)"""
+    if period == "Week-to-Date":
+        return today - timedelta(days=today.weekday())
+    elif period == "Month-to-Date":
+        return today.replace(day=1)
+    elif period == "Year-to-Date":
+        return today.replace(month=1, day=1)
+    elif period == "Last 7 Days":
+        return today - timedelta(days=7)
+    elif period == "Last 30 Days":
+        return today - timedelta(days=30)
+    elif period == "Last 365 Days":
+        return today - timedelta(days=365)
+    return None
+
+
+def period_window(period, today, month=None, year=None):
+    """
+    [start, end) date window selected by a period and an optional month/year.
+    Either bound is None when unbounded. This is what the query pushes down
+    as gte / lt predicates, and it selects exactly the rows filter_period keeps.
+    """
+    start = period_start(period, today)
+    end = None
+
+    if month and year:
+        month_start = date(year, month, 1)
+        start = month_start if start is None else max(start, month_start)
+        end = date(year + month // 12, month % 12 + 1, 1)
+
+    return start, end
+
+
+def is_month_window(start, end):
+    """True if [start, end) is made of whole months, so monthly totals are exact"""
+    return all(d is None or d.day == 1 for d in (start, end))
+
+
+def filter_period(df, period, today, month=None, year=None):
+    """
+    Reference pandas filter of a frame with a datetime Date column; the
+    pages push period_window down instead, and the tests check both agree.
+    """
+    if df.empty:
+        return df
+
+    start = period_start(period, today)
+    if start is not None:
+        df = df[df["Date"] >= pd.to_datetime(start)]
+
+    # Apply sidebar month/year if provided
+    if "Date" in df.columns and month and year:
+        df = df[(df["Date"].dt.month == month) & (df["Date"].dt.year == year)]
+
+    return df
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# Step of each supported frequency: ("D", n) advances n days, ("M", n) n months
+FREQUENCY_STEPS = {
+    "daily": ("D", 1),
+    "weekly": ("D", 7),
+    "monthly": ("M", 1),
+    "yearly": ("M", 12),
+}
+
+_DAY = np.timedelta64(1, "D")
+
+
+def _to_days(values):
+    return pd.to_datetime(pd.Series(values)).to_numpy().astype("datetime64[D]")
+
+
+def _month_occurrence(start, k, step):
+    """
+    k-th occurrence of a month-based rule.
+    The day of month is anchored on the start date and clamped to the
+    length of the target month (Jan 31 -> Feb 28/29 -> Mar 31).
+    """
+    month = start.astype("datetime64[M]") + k * step
+    month_start = month.astype("datetime64[D]")
+    month_len = ((month + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+    day = (start - start.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+    return month_start + np.minimum(day, month_len - 1)
+
+
+def _occurrence(start, k, unit, step):
+    if unit == "D":
+        return start + k * step * _DAY
+    return _month_occurrence(start, k, step)
+
+
+def _last_index(start, x, unit, step):
+    """Index of the last occurrence on or before x (negative if none)"""
+    if unit == "D":
+        return np.floor_divide((x - start).astype(np.int64), step)
+    months = x.astype("datetime64[M]").astype(np.int64) - start.astype("datetime64[M]").astype(np.int64)
+    k = np.floor_divide(months, step)
+    return k - (_month_occurrence(start, k, step) > x)
+
+
+def expand_rules(rules, start=None, end=None):
+    """
+    Expand many recurring rules into their occurrences at once.
+
+    `rules` needs rule_id, start_date, frequency and amount columns, plus
+    optional end_date (missing = open ended) and after (only occurrences
+    strictly later than this date, e.g. a high-water mark).
+    `start` / `end` bound the output window for every rule; open-ended rules
+    require `end`. Unknown frequencies occur once, on their start date.
+
+    Returns a frame of (rule_id, date, amount); the occurrences of a rule are
+    contiguous and in date order.
+    """
+    if rules.empty:
+        return pd.DataFrame({
+            "rule_id": pd.Series(dtype=rules["rule_id"].dtype if "rule_id" in rules else "int64"),
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "amount": pd.Series(dtype="float64"),
+        })
+
+    n = len(rules)
+    rule_start = _to_days(rules["start_date"])
+    if "end_date" in rules:
+        rule_end = _to_days(rules["end_date"])
+    else:
+        rule_end = np.full(n, np.datetime64("NaT"), "datetime64[D]")
+    if end is not None:
+        window_end = np.datetime64(pd.Timestamp(end).date(), "D")
+        rule_end = np.where(np.isnat(rule_end), window_end, np.minimum(rule_end, window_end))
+    elif np.isnat(rule_end).any():
+        raise ValueError("end is required when some rules have no end_date")
+
+    # Lower bound: the later of the start date, the window start and the mark
+    lower = rule_start.copy()
+    if start is not None:
+        lower = np.maximum(lower, np.datetime64(pd.Timestamp(start).date(), "D"))
+    if "after" in rules:
+        after = _to_days(rules["after"])
+        has_after = ~np.isnat(after)
+        lower[has_after] = np.maximum(lower[has_after], after[has_after] + _DAY)
+
+    # Integer frequency codes: index into FREQUENCY_STEPS, -1 when unknown
+    freqs = rules["frequency"].astype(str).str.lower()
+    codes = freqs.map({name: i for i, name in enumerate(FREQUENCY_STEPS)}).fillna(-1).to_numpy(np.int8)
+    rule_ids = rules["rule_id"].to_numpy()
+    amounts = rules["amount"].to_numpy(dtype="float64")
+
+    # --- Expand one frequency at a time, without per-occurrence masks ---
+    parts = []
+    steps = list(FREQUENCY_STEPS.values()) + [None]
+    for code, unit_step in zip([*range(len(FREQUENCY_STEPS)), -1], steps):
+        sel = np.flatnonzero(codes == code)
+        if not len(sel):
+            continue
+        s, lo, hi = rule_start[sel], lower[sel], rule_end[sel]
+
+        if unit_step is None:
+            first = np.zeros(len(sel), dtype=np.int64)
+            last = np.where((s >= lo) & (s <= hi), 0, -1)
+        else:
+            unit, step = unit_step
+            first = np.maximum(_last_index(s, lo - _DAY, unit, step) + 1, 0)
+            last = _last_index(s, hi, unit, step)
+
+        # Repeat each rule once per occurrence; k is the occurrence index
+        counts = np.maximum(last - first + 1, 0)
+        idx = np.repeat(np.arange(len(sel)), counts)
+        k = np.arange(len(idx)) + np.repeat(first - (np.cumsum(counts) - counts), counts)
+
+        dates = s[idx] if unit_step is None else _occurrence(s[idx], k, *unit_step)
+        parts.append((sel[idx], dates))
+
+    if not parts:
+        return expand_rules(rules.iloc[:0])
+    pos = np.concatenate([p for p, _ in parts])
+    dates = np.concatenate([d for _, d in parts])
+
+    return pd.DataFrame({
+        "rule_id": rule_ids[pos],
+        "date": dates.astype("datetime64[ns]"),
+        "amount": amounts[pos],
+    }, copy=False)
+
+
+def generate_dates(start_date, end_date, frequency):
+    """Occurrence dates (datetime.date) of a single rule between two dates"""
+    rule = pd.DataFrame({
+        "rule_id": [0],
+        "start_date": [start_date],
+        "end_date": [end_date],
+        "frequency": [frequency],
+        "amount": [0.0],
+    })
+    return [d.date() for d in expand_rules(rule)["date"]]
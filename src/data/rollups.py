@@ -0,0 +1,114 @@
+"""
+Incrementally maintained (day / month, category, type) rollups of the ledger.
+
+Every write to incomes / expenses sends the matching +/- deltas through
+apply_ledger_deltas (sql/003_ledger_rollups.sql). Rollups can drift if a
+delta is lost, so they can be checked and rebuilt from the raw tables:
+
+    python -m src.data.rollups verify [--user ID]
+    python -m src.data.rollups rebuild [--user ID]
+"""
+import argparse
+import sys
+from decimal import Decimal
+
+from src.data.cache import invalidate
+
+ROLLUP_TABLES = ("ledger_daily_rollup", "ledger_monthly_rollup")
+
+# Ledger table -> value of the rollup "type" column
+LEDGER_TYPES = {"incomes": "Income", "expenses": "Expense"}
+
+
+def is_recurring(comment):
+    """Same rule as the dashboard's recurring filter"""
+    return (comment or "").lower() == "recurring"
+
+
+def ledger_deltas(table, rows, sign=1):
+    """
+    Rollup deltas of ledger rows (dicts with date, category_id, amount and
+    comment), summed per (date, category_id, type, recurring) key.
+    `sign=-1` gives the deltas that remove the rows. Amounts are summed as
+    Decimal and sent as text, so no float residue reaches the numeric
+    rollup columns.
+    """
+    totals = {}
+    for row in rows:
+        key = (
+            str(row["date"])[:10],
+            None if row.get("category_id") is None else int(row["category_id"]),
+            LEDGER_TYPES[table],
+            is_recurring(row.get("comment")),
+        )
+        amount, count = totals.get(key, (Decimal(0), 0))
+        totals[key] = (amount + sign * Decimal(str(row["amount"])), count + sign)
+
+    return [
+        {"date": d, "category_id": c, "type": t, "recurring": r, "amount": str(amount), "count": count}
+        for (d, c, t, r), (amount, count) in totals.items()
+    ]
+
+
+def apply_deltas(conn, user_id, deltas):
+    """
+    Apply rollup deltas after a ledger write. Returns None on success or the
+    error message; a failed update leaves the rollups stale until the next
+    rebuild, the ledger write itself is not affected.
+    """
+    if not deltas:
+        return None
+    try:
+        conn.client.rpc("apply_ledger_deltas", {
+            "p_user_id": user_id, "p_deltas": list(deltas)
+        }).execute()
+    except Exception as e:
+        return str(e)
+    finally:
+        invalidate(user_id, *ROLLUP_TABLES)
+    return None
+
+
+def rebuild(conn, user_id=None):
+    """Recompute the rollups of one user (all users when None) from the ledger"""
+    written = conn.client.rpc("rebuild_ledger_rollups", {"p_user_id": user_id}).execute().data
+    if user_id is not None:
+        invalidate(user_id, *ROLLUP_TABLES)
+    return written
+
+
+def drift(conn, user_id=None):
+    """Rollup rows that disagree with the raw ledger (empty when reconciled)"""
+    return conn.client.rpc("ledger_rollup_drift", {"p_user_id": user_id}).execute().data
+
+
+def main(argv=None):
+    import streamlit as st
+    from st_supabase_connection import SupabaseConnection
+
+    parser = argparse.ArgumentParser(prog="python -m src.data.rollups")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--user", type=int, default=None, help="only this user id (default: all)")
+    args = parser.parse_args(argv)
+
+    # Same connection settings as the app (.streamlit/secrets.toml or env)
+    conn = st.connection("supabase", type=SupabaseConnection)
+
+    if args.command == "rebuild":
+        print(f"Rebuilt {rebuild(conn, args.user)} daily rollup rows")
+        return 0
+
+    rows = drift(conn, args.user)
+    for row in rows:
+        print(
+            f"{row['grain']:7} user {row['user_id']} {row['date']} category {row['category_id']} "
+            f"{row['type']} recurring={row['recurring']}: "
+            f"expected {row['expected_amount']} ({row['expected_count']}), "
+            f"found {row['actual_amount']} ({row['actual_count']})"
+        )
+    print(f"{len(rows)} rollup rows out of sync")
+    return 1 if rows else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
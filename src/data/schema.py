@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# Dtype of every column read from Supabase, by its raw (database) name.
+# Ids are 32-bit when they fit, amounts stay float64 so cents add up exactly
+# enough, and repeated strings become categoricals.
+SCHEMA = {
+    "id": "int32",
+    "user_id": "int32",
+    "category_id": "Int32",
+    "recurring_id": "Int32",
+    "date": "datetime64[ns]",
+    "start_date": "datetime64[ns]",
+    "end_date": "datetime64[ns]",
+    "last_generated": "datetime64[ns]",
+    "amount": "float64",
+    "budget": "float64",
+    "count": "int32",
+    "recurring": "bool",
+    "month": "int8",
+    "year": "int16",
+    "category": "category",
+    "type": "category",
+    "title": "category",
+    "comment": "category",
+    "color": "category",
+    "icon": "category",
+    "frequency": "category",
+}
+
+
+def _fits(values, dtype):
+    """True if numeric `values` can be stored in integer `dtype` without loss"""
+    info = np.iinfo(pd.api.types.pandas_dtype(dtype.lower()))
+    values = values.dropna()
+    return values.empty or (values.min() >= info.min and values.max() <= info.max)
+
+
+def coerce(df, schema=SCHEMA):
+    """
+    Cast the columns of a raw Supabase frame to their schema dtype.
+    Columns that are missing, already typed, or would not convert
+    losslessly (e.g. non-numeric or out-of-range ids) are left as they are.
+    """
+    casts = {}
+    for column, dtype in schema.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+
+        values = df[column]
+        if dtype.startswith("datetime64"):
+            casts[column] = pd.to_datetime(values)
+        elif dtype == "category":
+            casts[column] = values.astype("category")
+        elif dtype == "bool":
+            if not values.isna().any():
+                casts[column] = values.astype(bool)
+        elif dtype.startswith("float"):
+            casts[column] = pd.to_numeric(values).astype(dtype)
+        else:
+            numeric = pd.to_numeric(values, errors="coerce")
+            lossless = numeric.isna().sum() == values.isna().sum() and _fits(numeric, dtype)
+            nullable = dtype[0].isupper()  # pandas' Int32 & co. accept missing values
+            if lossless and (nullable or not numeric.isna().any()):
+                casts[column] = numeric.astype(dtype)
+
+    return df.assign(**casts) if casts else df
+
+
+def concat(frames):
+    """pd.concat that keeps categorical columns categorical across frames"""
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals(
+                [f[column] for f in frames if column in f.columns], ignore_order=True
+            ).categories
+            frames = [
+                f.assign(**{column: f[column].cat.set_categories(categories)})
+                if column in f.columns and isinstance(f[column].dtype, pd.CategoricalDtype)
+                else f
+                for f in frames
+            ]
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,121 @@
+import pandas as pd
+
+from src.data.cache import cached_frame
+from src.data.mirror import MIRRORED_TABLES, mirror_enabled, mirror_frame, mirror_totals
+from src.data.schema import coerce
+
+# Columns of incomes / expenses the dashboard actually uses
+LEDGER_COLUMNS = ("id", "category_id", "date", "amount", "comment")
+
+# Rename for dashboard consistency, but KEEP category_id / id for merges
+RENAME_MAPS = {
+    "incomes": {
+        "date": "Date",
+        "amount": "Amount",
+        "comment": "Comment",
+        "title": "Title"
+    },
+    "expenses": {
+        "date": "Date",
+        "amount": "Amount",
+        "comment": "Comment",
+        "title": "Title"
+    },
+    "budgets": {
+        "budget": "Budget",
+        "amount": "Amount",
+        "month": "Month",
+        "year": "Year",
+        "type": "Type"
+    },
+    "categories": {
+        "category": "Category",
+        "type": "Type",
+        "color": "Color",
+        "icon": "Icon"
+    },
+    "recurrings": {
+        "title": "Title",
+        "amount": "Amount",
+        "type": "Type",
+        "start_date": "Date",
+        "frequency": "Frequency",
+        "end_date": "EndDate",
+        "active": "Active"
+    },
+    "ledger_rollup": {
+        "date": "Date",
+        "type": "Type",
+        "amount": "Amount",
+        "count": "Count"
+    },
+}
+
+# Columns of an aggregated ledger frame (one row per date, category and type)
+TOTALS_COLUMNS = ["Date", "category_id", "Category", "Type", "Amount", "Count"]
+
+# Columns read from ledger_daily_rollup / ledger_monthly_rollup
+ROLLUP_COLUMNS = ("id", "date", "category_id", "type", "recurring", "amount", "count")
+
+# Category name of totals whose category_id matches no category
+UNCATEGORIZED = "Uncategorized"
+
+
+def shape_table(rows, table):
+    """DataFrame of raw Supabase rows (or a raw frame) with dashboard column names"""
+    df = pd.DataFrame(rows)
+
+    if df.empty:
+        return df
+
+    # Compact dtypes (categoricals, datetime64, 32-bit ids) before renaming
+    return coerce(df).rename(columns=RENAME_MAPS.get(table, {}))
+
+
+def load_table(conn, user_id, table, columns=None, start=None, end=None, progress=None):
+    """
+    A user's table, served from the shared cache until it is written to.
+    Optionally projected to `columns` and restricted to dates in [start, end).
+    Ledger tables are read from the local mirror when it is enabled.
+    """
+    if table in MIRRORED_TABLES and mirror_enabled():
+        return shape_table(mirror_frame(conn, user_id, table, columns, start, end), table)
+    return shape_table(
+        cached_frame(conn, user_id, table, columns, start, end, progress=progress), table
+    )
+
+
+def load_totals(conn, user_id, start=None, end=None, recurring=None, monthly=False):
+    """
+    Income / expense sums and counts per (Date, Category, Type) for dates in
+    [start, end), read from the rollup tables: O(days x categories) rows
+    however many transactions there are. `recurring` keeps only (True) or
+    drops (False) recurring entries.
+
+    `monthly` reads the monthly rollup instead (Date is the first day of the
+    month), which is only exact when start / end fall on the 1st. With the
+    local mirror enabled, the sums are grouped in SQLite instead.
+
+    Rows without a category, or whose category was deleted while its
+    transactions were kept, are totalled under UNCATEGORIZED.
+    """
+    if mirror_enabled():
+        totals = mirror_totals(conn, user_id, start, end, recurring=recurring, monthly=monthly)
+    else:
+        table = "ledger_monthly_rollup" if monthly else "ledger_daily_rollup"
+        rollup = coerce(cached_frame(conn, user_id, table, ROLLUP_COLUMNS, start, end))
+        if recurring is not None and not rollup.empty:
+            rollup = rollup[rollup["recurring"] == recurring]
+        totals = rollup if rollup.empty else rollup.groupby(
+            ["date", "category_id", "type"], observed=True, dropna=False
+        )[["amount", "count"]].sum().reset_index()
+
+    if totals.empty:
+        return pd.DataFrame(columns=TOTALS_COLUMNS)
+    totals = shape_table(totals, "ledger_rollup")
+
+    categories = load_table(conn, user_id, "categories")
+    names = categories.set_index("id")["Category"] if not categories.empty else pd.Series(dtype=object)
+    totals["Category"] = totals["category_id"].map(names).astype(object) \
+        .fillna(UNCATEGORIZED).astype("category")
+    return totals[TOTALS_COLUMNS]
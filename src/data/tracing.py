@@ -0,0 +1,207 @@
+"""
+Round-trip tracing of the Supabase table API.
+
+With tracing enabled, traced_connection() wraps the connection so every
+executed query / rpc records its table, operation, filters, rows, response
+bytes and latency into the trace of the current rerun, shown by
+trace_panel() in the sidebar. The wrapper only forwards calls to whatever
+the connection returns, so it works the same over an in-memory stand-in.
+
+    QUERY_TRACE=1                   show the "Queries" sidebar panel
+    QUERY_TRACE_PATH=trace.jsonl    also append every call to a JSONL file
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+TRACE_ENV = "QUERY_TRACE"
+TRACE_PATH_ENV = "QUERY_TRACE_PATH"
+
+# Builder methods that set the operation; every other call is a filter or modifier
+OPERATIONS = {"select", "insert", "upsert", "update", "delete"}
+MAX_FILTER_LENGTH = 200  # characters kept per filter in a trace
+
+# Serializes appends to the JSONL file across sessions and fetch_all workers
+_export_lock = threading.Lock()
+
+
+def tracing_enabled():
+    return bool(os.environ.get(TRACE_ENV) or os.environ.get(TRACE_PATH_ENV))
+
+
+def _describe(name, args, kwargs):
+    """Short text of a builder call, e.g. eq('user_id', 1)"""
+    params = [repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()]
+    text = f"{name}({', '.join(params)})"
+    return text if len(text) <= MAX_FILTER_LENGTH else text[:MAX_FILTER_LENGTH - 1] + "…"
+
+
+def _record(trace, call):
+    with trace["lock"]:
+        trace["calls"].append(call)
+    path = os.environ.get(TRACE_PATH_ENV)
+    if path:
+        line = json.dumps({"session": trace["session"], "rerun": trace["rerun"], **call}, default=str)
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class _TracedQuery:
+    """A query builder whose execute() is recorded in a trace"""
+
+    def __init__(self, builder, trace, table, operation=None, filters=()):
+        self._builder = builder
+        self._trace = trace
+        self._table = table
+        self._operation = operation
+        self._filters = filters
+
+    def _wrap(self, builder, operation=None, call=None):
+        filters = self._filters + ((call,) if call else ())
+        return _TracedQuery(builder, self._trace, self._table, operation or self._operation, filters)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # e.g. postgrest's `.not_` property, which returns a builder
+            return self._wrap(attr, call=name) if name == "not_" else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if name in OPERATIONS:
+                return self._wrap(result, operation=name)
+            return self._wrap(result, call=_describe(name, args, kwargs))
+        return call
+
+    def execute(self):
+        started = time.time()
+        t0 = time.perf_counter()
+        response, error = None, None
+        try:
+            response = self._builder.execute()
+            return response
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            data = getattr(response, "data", None)
+            _record(self._trace, {
+                "started": started,
+                "table": self._table,
+                "operation": self._operation or "select",
+                "filters": list(self._filters),
+                "rows": len(data) if isinstance(data, list) else int(data is not None),
+                "bytes": len(json.dumps(data, default=str)) if data is not None else 0,
+                "ms": round(elapsed * 1000, 2),
+                "error": error,
+            })
+
+
+class _TracedClient:
+    """The supabase client, with rpc() calls traced"""
+
+    def __init__(self, client, trace):
+        self._client = client
+        self._trace = trace
+
+    def rpc(self, fn, params=None, *args, **kwargs):
+        builder = self._client.rpc(fn, params, *args, **kwargs)
+        return _TracedQuery(builder, self._trace, fn, "rpc", (_describe("params", (params,), {}),))
+
+    def table(self, name):
+        return _TracedQuery(self._client.table(name), self._trace, name)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class TracedConnection:
+    """Supabase connection recording every call into `trace` (see new_trace)"""
+
+    def __init__(self, conn, trace):
+        self._conn = conn
+        self.trace = trace
+
+    def table(self, name):
+        return _TracedQuery(self._conn.table(name), self.trace, name)
+
+    @property
+    def client(self):
+        return _TracedClient(self._conn.client, self.trace)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def new_trace():
+    """Empty trace of one rerun; calls can be appended from worker threads"""
+    session = st.session_state.setdefault("trace_session", uuid.uuid4().hex[:12])
+    rerun = st.session_state.get("trace_rerun", 0) + 1
+    st.session_state.trace_rerun = rerun
+    return {"session": session, "rerun": rerun, "lock": threading.Lock(), "calls": []}
+
+
+def begin_trace():
+    """Start the trace of this rerun (None when tracing is disabled)"""
+    st.session_state.query_trace = new_trace() if tracing_enabled() else None
+    return st.session_state.query_trace
+
+
+def traced_connection():
+    """The app's Supabase connection, traced into this rerun's trace if any"""
+    # Imported on first use: the supabase client is slow to import and app.py
+    # loads this module on every cold start
+    from st_supabase_connection import SupabaseConnection
+
+    conn = st.connection("supabase", type=SupabaseConnection)
+    trace = st.session_state.get("query_trace")
+    return conn if trace is None else TracedConnection(conn, trace)
+
+
+def trace_summary(trace):
+    """Calls, milliseconds, rows and bytes per (table, operation)"""
+    with trace["lock"]:
+        calls = list(trace["calls"])
+    summary = {}
+    for call in calls:
+        entry = summary.setdefault((call["table"], call["operation"]),
+                                   {"calls": 0, "ms": 0.0, "rows": 0, "bytes": 0, "errors": 0})
+        entry["calls"] += 1
+        entry["ms"] += call["ms"]
+        entry["rows"] += call["rows"]
+        entry["bytes"] += call["bytes"]
+        entry["errors"] += call["error"] is not None
+    return calls, summary
+
+
+def trace_panel(trace):
+    """Sidebar summary of the round trips made by this rerun"""
+    calls, summary = trace_summary(trace)
+    with st.sidebar.expander(f"Queries: {len(calls)} this rerun"):
+        total_ms = sum(c["ms"] for c in calls)
+        total_kb = sum(c["bytes"] for c in calls) / 1e3
+        st.caption(f"rerun {trace['rerun']} · {total_ms:.0f} ms · {total_kb:,.1f} kB")
+        if not calls:
+            return
+        st.dataframe(
+            [{"table": t, "operation": op, **{k: round(v, 1) for k, v in s.items()}}
+             for (t, op), s in summary.items()],
+            hide_index=True, use_container_width=True
+        )
+        st.dataframe(
+            [{k: c[k] for k in ("table", "operation", "rows", "ms", "error")}
+             | {"filters": " ".join(c["filters"])} for c in calls],
+            hide_index=True, use_container_width=True
+        )
+        st.download_button(
+            "Export JSONL",
+            "".join(json.dumps({"session": trace["session"], "rerun": trace["rerun"], **c},
+                               default=str) + "\n" for c in calls),
+            file_name=f"queries_{trace['session']}_{trace['rerun']}.jsonl",
+            mime="application/jsonl", on_click="ignore"
+        )
@@ -0,0 +1,63 @@
+from postgrest.exceptions import APIError
+
+# Columns shown by the transaction browser
+BROWSER_COLUMNS = ("id", "date", "category_id", "amount", "title", "comment")
+
+SORT_COLUMNS = {"Date": "date", "Amount": "amount", "Title": "title"}
+
+DEFAULT_PAGE_SIZE = 25
+RANGE_NOT_SATISFIABLE = "PGRST103"  # PostgREST error code of a range past the end
+
+
+def _search_term(text):
+    """Free text made safe for a PostgREST or=(...) filter"""
+    return "".join(c for c in text if c not in ',()*%"\\').strip()
+
+
+def query_transactions(conn, user_id, table, start=None, end=None, category_ids=None,
+                       text=None, sort="date", descending=True, page=0,
+                       page_size=DEFAULT_PAGE_SIZE):
+    """
+    One page of a user's incomes or expenses, filtered and sorted by the
+    database, plus the total number of matching rows.
+
+    `start` / `end` restrict dates to [start, end], `text` matches title or
+    comment (case-insensitive). A page past the end, left by rows deleted
+    since it was shown, is replaced by the last page.
+    Returns (rows, total, page).
+    """
+    def fetch(first, last):
+        query = conn.table(table) \
+            .select(*BROWSER_COLUMNS, count="exact") \
+            .eq("user_id", user_id)
+
+        if start is not None:
+            query = query.gte("date", start.isoformat())
+        if end is not None:
+            query = query.lte("date", end.isoformat())
+        if category_ids:
+            query = query.in_("category_id", [int(c) for c in category_ids])
+        term = _search_term(text or "")
+        if term:
+            query = query.or_(f"title.ilike.*{term}*,comment.ilike.*{term}*")
+
+        # id breaks ties so pages never overlap
+        return query.order(sort, desc=descending) \
+            .order("id", desc=descending) \
+            .range(first, last) \
+            .execute()
+
+    try:
+        response = fetch(page * page_size, (page + 1) * page_size - 1)
+    except APIError as e:
+        # PostgREST rejects an offset past the end of the rows
+        if e.code != RANGE_NOT_SATISFIABLE or page == 0:
+            raise
+        response = None
+
+    if page > 0 and (response is None or not response.data):
+        total = fetch(0, 0).count or 0
+        page = max(0, -(-total // page_size) - 1)
+        response = fetch(page * page_size, (page + 1) * page_size - 1)
+
+    return response.data, response.count or 0, page
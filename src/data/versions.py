@@ -0,0 +1,33 @@
+"""
+Per-user table versions, bumped after every write made by this app.
+
+Kept apart from src.data.cache so that code which only needs the counters
+(login, sessions) does not load pandas.
+"""
+import threading
+
+import streamlit as st
+
+
+@st.cache_resource
+def _table_versions():
+    """Process-wide {(user_id, table): version} counters"""
+    return {"lock": threading.Lock(), "versions": {}}
+
+
+def table_version(user_id, table):
+    """Current version of a user's table; part of every cache key"""
+    return _table_versions()["versions"].get((user_id, table), 0)
+
+
+def invalidate(user_id, *tables):
+    """
+    Bump the version of the given tables after a write.
+    Cached reads for the old version are never served again and age out
+    through the TTL / LRU limits.
+    """
+    state = _table_versions()
+    with state["lock"]:
+        for table in tables:
+            key = (user_id, table)
+            state["versions"][key] = state["versions"].get(key, 0) + 1
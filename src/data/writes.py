@@ -0,0 +1,49 @@
+DEFAULT_CHUNK_SIZE = 500
+
+
+def insert_rows(conn, table, rows, chunk_size=DEFAULT_CHUNK_SIZE, on_conflict=None):
+    """
+    Insert rows into a Supabase table using bounded multi-row batches.
+
+    Each chunk is sent as a single request, so N rows cost
+    ceil(N / chunk_size) round trips instead of N. A failing chunk does not
+    stop the remaining ones; it is reported in the result instead:
+      - inserted: number of rows sent in chunks that succeeded
+      - rows: the written rows as returned by the database (with ids)
+      - failed: list of {"start", "end", "error"} row ranges (end exclusive)
+
+    With `on_conflict` (a comma-separated list of unique columns), rows that
+    already exist are skipped, which makes re-sending the same rows a no-op;
+    skipped rows are counted in `inserted` but are not part of `rows`.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    rows = list(rows)
+    result = {"inserted": 0, "rows": [], "failed": []}
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            if on_conflict:
+                response = conn.table(table).upsert(
+                    chunk, on_conflict=on_conflict, ignore_duplicates=True
+                ).execute()
+            else:
+                response = conn.table(table).insert(chunk).execute()
+            result["inserted"] += len(chunk)
+            result["rows"].extend(response.data or [])
+        except Exception as e:
+            result["failed"].append({
+                "start": start,
+                "end": start + len(chunk),
+                "error": str(e)
+            })
+
+    return result
+
+
+def failed_rows(rows, result):
+    """Rows of `rows` that belong to a failed chunk of `result`"""
+    rows = list(rows)
+    return [row for f in result["failed"] for row in rows[f["start"]:f["end"]]]
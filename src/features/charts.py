@@ -2,10 +2,19 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from src.features.downsample import MAX_POINTS, prepare
+from src.features.forecast import forecast
+
+MODEL_LABELS = {
+    "linear": "Linear",
+    "holt_winters_weekly": "Holt-Winters (weekly)",
+    "holt_winters_monthly": "Holt-Winters (monthly)",
+}
+
 
 def category_pie(df):
-    """Donut chart of total amounts per category"""
-    data = df.groupby("Category")["Amount"].sum().reset_index()
+    """Donut chart of total amounts per category (raw or pre-aggregated rows)"""
+    data = df.groupby("Category", observed=True)["Amount"].sum().reset_index()
 
     fig = go.Figure(
         go.Pie(
@@ -19,8 +28,8 @@ def category_pie(df):
 
 
 def category_bar(df):
-    """Bar chart of amounts per category"""
-    data = df.groupby("Category")["Amount"].sum().reset_index()
+    """Bar chart of amounts per category (raw or pre-aggregated rows)"""
+    data = df.groupby("Category", observed=True)["Amount"].sum().reset_index()
 
     fig = go.Figure(
         go.Bar(
@@ -39,12 +48,19 @@ def category_bar(df):
     return fig
 
 
-def category_line(df):
-    """Line chart per category with total overlay"""
-    fig = go.Figure()
-    df["Date"] = pd.to_datetime(df["Date"])
+def category_line(df, max_points=MAX_POINTS):
+    """
+    Line chart per category with total overlay, lines cut to max_points.
+    Works on a new (Category, Date, Amount) frame; the input frame is left untouched.
+    """
+    data = pd.DataFrame({
+        "Category": df["Category"].to_numpy(),
+        "Date": pd.to_datetime(df["Date"]).to_numpy(),
+        "Amount": df["Amount"].to_numpy(),
+    })
 
-    for cat, group in df.groupby("Category"):
+    fig = go.Figure()
+    for cat, group in data.groupby("Category", observed=True):
         group = group.sort_values("Date")
         fig.add_trace(go.Scatter(
             x=group["Date"],
@@ -53,7 +69,7 @@ def category_line(df):
             name=cat
         ))
 
-    total_df = df.groupby("Date")["Amount"].sum().reset_index()
+    total_df = data.groupby("Date")["Amount"].sum().reset_index()
     fig.add_trace(go.Scatter(
         x=total_df["Date"],
         y=total_df["Amount"],
@@ -67,22 +83,22 @@ def category_line(df):
         xaxis_title="Date",
         yaxis_title="Amount"
     )
-    return fig
+    return prepare(fig, max_points)
 
 
 def budget_bar_chart(df):
-    """Compare Actual vs Budget per category"""
-    fig = go.Figure()
-
-    for _, row in df.iterrows():
-        color = "green" if row["Amount"] <= row["Budget"] else "red"
-        fig.add_trace(go.Bar(
-            x=[row["Category"]],
-            y=[row["Amount"]],
-            marker_color=color,
-            text=f"${row['Amount']:,.2f} / ${row['Budget']:,.2f}",
-            textposition="auto"
-        ))
+    """Compare Actual vs Budget per category, as a single bar trace"""
+    amount = df["Amount"].to_numpy(dtype=float)
+    budget = df["Budget"].to_numpy(dtype=float)
+
+    fig = go.Figure(go.Bar(
+        x=df["Category"],
+        y=amount,
+        marker_color=np.where(amount <= budget, "green", "red"),
+        customdata=budget,
+        texttemplate="$%{y:,.2f} / $%{customdata:,.2f}",
+        textposition="auto"
+    ))
 
     fig.update_layout(
         title="Actual vs Budget",
@@ -93,18 +109,83 @@ def budget_bar_chart(df):
     return fig
 
 
-def category_line_with_trend(df, window=3):
-    """Line chart with moving average and anomaly detection"""
+def income_expense_bar(df):
+    """Grouped Income vs Expense bars per category (raw or pre-aggregated rows)"""
+    totals = df.groupby(["Category", "Type"], observed=True)["Amount"].sum() \
+        .unstack("Type")
+
     fig = go.Figure()
-    df["Date"] = pd.to_datetime(df["Date"])
+    for t in ["Income", "Expense"]:
+        # Categories without this type get no bar, as with the old filtered frames
+        amounts = totals[t].dropna() if t in totals else pd.Series(dtype=float)
+        fig.add_trace(go.Bar(x=amounts.index, y=amounts.to_numpy(), name=t))
 
-    for cat, group in df.groupby("Category"):
-        group = group.sort_values("Date")
+    fig.update_layout(
+        title="Income vs Expense per Category",
+        barmode="group",
+        xaxis_title="Category",
+        yaxis_title="Amount"
+    )
+    return fig
 
-        group["SMA"] = group["Amount"].rolling(window=window, min_periods=1).mean()
-        z_scores = (group["Amount"] - group["Amount"].mean()) / group["Amount"].std()
-        group["Anomaly"] = z_scores.abs() > 2
 
+def income_expense_history(df, max_points=MAX_POINTS):
+    """
+    Daily Income, Expense and Net lines (raw or pre-aggregated rows).
+    Lines longer than max_points are downsampled, see src.features.downsample.
+    """
+    hist_data = df.groupby(["Date", "Type"], observed=True)["Amount"].sum().reset_index()
+
+    fig = go.Figure()
+    for t in ["Income", "Expense"]:
+        temp = hist_data[hist_data["Type"] == t]
+        fig.add_trace(go.Scatter(
+            x=temp["Date"], y=temp["Amount"],
+            mode="lines+markers", name=t
+        ))
+
+    signed = hist_data["Amount"].where(hist_data["Type"] == "Income", -hist_data["Amount"])
+    net_data = signed.groupby(hist_data["Date"]).sum()
+    fig.add_trace(go.Scatter(
+        x=net_data.index, y=net_data.values,
+        mode="lines+markers", name="Net",
+        line=dict(color="black", dash="dash")
+    ))
+
+    fig.update_layout(
+        title="Historical Income vs Expense",
+        xaxis_title="Date",
+        yaxis_title="Amount"
+    )
+    return prepare(fig, max_points)
+
+
+def category_trend(df, window=3, threshold=2):
+    """
+    Moving average, z-score and anomaly flag of every amount within its category.
+    Computed in one groupby pass over a new (Category, Date, Amount) frame
+    sorted by category and date; the input frame is left untouched.
+    """
+    data = pd.DataFrame({
+        "Category": df["Category"].to_numpy(),
+        "Date": pd.to_datetime(df["Date"]).to_numpy(),
+        "Amount": df["Amount"].to_numpy(dtype=float),
+    }).sort_values(["Category", "Date"], kind="stable", ignore_index=True)
+
+    grouped = data.groupby("Category", observed=True, sort=False)["Amount"]
+    data["SMA"] = grouped.rolling(window=window, min_periods=1).mean() \
+        .reset_index(level=0, drop=True)
+    data["ZScore"] = (data["Amount"] - grouped.transform("mean")) / grouped.transform("std")
+    data["Anomaly"] = data["ZScore"].abs() > threshold
+    return data
+
+
+def category_line_with_trend(df, window=3, max_points=MAX_POINTS):
+    """Line chart with moving average and anomaly detection, lines cut to max_points"""
+    data = category_trend(df, window=window)
+
+    fig = go.Figure()
+    for cat, group in data.groupby("Category", observed=True):
         fig.add_trace(go.Scatter(
             x=group["Date"], y=group["Amount"],
             mode="lines+markers", name=cat
@@ -126,7 +207,7 @@ def category_line_with_trend(df, window=3):
                 marker=dict(color="red", size=10, symbol="x")
             ))
 
-    total_df = df.groupby("Date")["Amount"].sum().reset_index()
+    total_df = data.groupby("Date")["Amount"].sum().reset_index()
     fig.add_trace(go.Scatter(
         x=total_df["Date"], y=total_df["Amount"],
         mode="lines+markers", name="Total",
@@ -138,21 +219,23 @@ def category_line_with_trend(df, window=3):
         xaxis_title="Date",
         yaxis_title="Amount"
     )
-    return fig
+    return prepare(fig, max_points)
 
 
-def forecast_category(df, periods=30):
+def forecast_category(df, periods=30, model="linear", max_points=MAX_POINTS):
     """
-    Lightweight 'forecast' using linear extrapolation instead of Prophet.
-    For each category:
-      - Plot historical data
-      - Extend line using a simple trend
+    Actual vs forecast per category, with a 95% prediction band.
+    `model` is one of src.features.forecast.MODELS: a straight line fitted
+    to each category's amounts, or Holt-Winters with weekly / monthly
+    seasonality on daily totals. Long actual lines are cut to max_points.
     """
     fig = go.Figure()
-    df["Date"] = pd.to_datetime(df["Date"])
+    predicted = forecast(df, periods=periods, model=model)
+    dates = pd.to_datetime(df["Date"])
 
-    for cat, group in df.groupby("Category"):
+    for cat, group in df.assign(Date=dates).groupby("Category", observed=True):
         group = group.sort_values("Date")
+        future = predicted[predicted["Category"] == cat]
 
         if len(group) < 2:
             fig.add_trace(go.Scatter(
@@ -168,26 +251,26 @@ def forecast_category(df, periods=30):
             mode="lines+markers", name=f"{cat} Actual"
         ))
 
-        # Simple forecast: linear regression (date as numeric)
-        x = (group["Date"] - group["Date"].min()).dt.days.values.reshape(-1, 1)
-        y = group["Amount"].values
-        if len(np.unique(y)) > 1:  # avoid constant series
-            coef = np.polyfit(x.flatten(), y, 1)
-            slope, intercept = coef
-
-            future_days = np.arange(x.max() + 1, x.max() + periods + 1)
-            future_dates = pd.date_range(start=group["Date"].max() + pd.Timedelta(days=1), periods=periods)
-            forecast_values = intercept + slope * future_days
+        if future.empty:
+            continue
 
-            fig.add_trace(go.Scatter(
-                x=future_dates, y=forecast_values,
-                mode="lines", name=f"{cat} Forecast",
-                line=dict(dash="dot")
-            ))
+        # Prediction band, then the forecast itself
+        fig.add_trace(go.Scatter(
+            x=pd.concat([future["Date"], future["Date"][::-1]]),
+            y=pd.concat([future["Upper"], future["Lower"][::-1]]),
+            fill="toself", mode="lines", line=dict(width=0),
+            opacity=0.2, hoverinfo="skip", showlegend=False,
+            name=f"{cat} 95% interval"
+        ))
+        fig.add_trace(go.Scatter(
+            x=future["Date"], y=future["Forecast"],
+            mode="lines", name=f"{cat} Forecast",
+            line=dict(dash="dot")
+        ))
 
     fig.update_layout(
-        title=f"Actual vs Linear Forecast per Category ({periods} days ahead)",
+        title=f"Actual vs {MODEL_LABELS.get(model, model)} Forecast per Category ({periods} days ahead)",
         xaxis_title="Date",
         yaxis_title="Amount"
     )
-    return fig
+    return prepare(fig, max_points)
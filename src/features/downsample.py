@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+MAX_POINTS = 1000        # points kept per line trace
+DOWNSAMPLE_ABOVE = 3000  # line traces up to this long are sent whole
+WEBGL_THRESHOLD = 5000   # total points in a figure above which traces use WebGL
+METHODS = ("lttb", "minmax")
+
+
+def _as_numbers(x):
+    """x values as float64, datetimes as nanoseconds since the epoch"""
+    x = np.asarray(x)
+    if x.dtype.kind in "iufb":
+        return x.astype(np.float64)
+    if x.dtype.kind != "M":
+        x = pd.to_datetime(x).to_numpy()
+    return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+
+
+def _bucket_edges(n, n_buckets):
+    """Edges of n_buckets contiguous buckets covering points 1 .. n-2"""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+
+def minmax_indices(y, n_out):
+    """
+    Indices of the min and max of each bucket, plus the first and last point.
+    Keeps every spike, at about n_out points.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+
+    n_buckets = max((n_out - 2) // 2, 1)
+    edges = _bucket_edges(n, n_buckets)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    inner = y[1:n - 1]
+
+    # Position of the min / max inside each bucket via a stable sort
+    order = np.lexsort((inner, bucket))
+    starts = edges[:-1] - 1
+    ends = edges[1:] - 2
+    keep = np.concatenate([order[starts], order[ends]]) + 1
+    return np.unique(np.concatenate([[0, n - 1], keep]))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: in each bucket keep the point forming the
+    largest triangle with the previously kept point and the next bucket's mean.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_out - 2)
+    # Means of every bucket, with the last point standing in after the last one
+    sizes = np.diff(edges)
+    x_mean = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])
+    y_mean = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - x_mean[i + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (y_mean[i + 1] - y[a])
+        )
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample_indices(x, y, max_points=MAX_POINTS, method="lttb"):
+    """
+    Indices of the points to keep so a line of (x, y) fits in max_points.
+    `x` must be sorted. Very long series go through min/max bucketing first
+    so LTTB only sees a few points per output bucket.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    x = _as_numbers(x)
+    y = np.asarray(y, dtype=np.float64)
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+
+    pre = minmax_indices(y, 8 * max_points)
+    return pre[lttb_indices(x[pre], y[pre], max_points)]
+
+
+def _is_line(trace):
+    """Scatter traces drawn as lines (not marker-only or filled areas)"""
+    return (
+        trace.type in ("scatter", "scattergl")
+        and "lines" in (trace.mode or "lines")
+        and not trace.fill
+        and trace.x is not None
+    )
+
+
+def _to_webgl(trace):
+    props = trace.to_plotly_json()
+    props.pop("type", None)
+    return go.Scattergl(**props)
+
+
+def prepare(fig, max_points=MAX_POINTS, method="lttb", webgl_threshold=WEBGL_THRESHOLD):
+    """
+    Shrink a figure before it is sent to the browser.
+
+    Every line trace longer than `max_points` and DOWNSAMPLE_ABOVE is cut to
+    `max_points` with `method` (marker-only traces such as anomalies and
+    filled bands are kept as is): below a few thousand points the bucketing
+    costs more build time than the smaller payload saves.
+    When the figure still holds more than `webgl_threshold` points, its
+    scatter traces are switched to Scattergl. `max_points=None` keeps all
+    points. Returns the prepared figure.
+    """
+    if max_points is not None:
+        for trace in fig.data:
+            if not _is_line(trace) or len(trace.x) <= max(max_points, DOWNSAMPLE_ABOVE):
+                continue
+            keep = downsample_indices(trace.x, trace.y, max_points, method)
+            trace.update(x=np.asarray(trace.x)[keep], y=np.asarray(trace.y)[keep])
+
+    total = sum(len(t.x) for t in fig.data if t.type == "scatter" and t.x is not None)
+    if webgl_threshold is not None and total > webgl_threshold:
+        data = [_to_webgl(t) if t.type == "scatter" else t for t in fig.data]
+        fig = go.Figure(data=data, layout=fig.layout)
+    return fig
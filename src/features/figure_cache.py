@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+# Serialized figures are shared by every session of the server process
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # least recently used figures are evicted first
+
+
+def fingerprint(df):
+    """Cheap content hash of a frame: column names, dtypes and values"""
+    digest = hashlib.sha1()
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    hashed = pd.util.hash_pandas_object(df, index=False)
+    digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@st.cache_resource
+def _figure_cache():
+    """Process-wide LRU of {key: figure JSON} with its size and counters"""
+    return {
+        "lock": threading.Lock(),
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+    }
+
+
+def _store(cache, key, payload, max_bytes):
+    size = len(payload)
+    if size > max_bytes:
+        return
+    entries = cache["entries"]
+    if key in entries:
+        cache["bytes"] -= len(entries.pop(key))
+    entries[key] = payload
+    cache["bytes"] += size
+    while cache["bytes"] > max_bytes:
+        _, evicted = entries.popitem(last=False)
+        cache["bytes"] -= len(evicted)
+        cache["evictions"] += 1
+
+
+def cached_figure(build, df, max_bytes=FIGURE_CACHE_MAX_BYTES, **params):
+    """
+    Figure of `build(df, **params)`, rebuilt only when the content of `df`
+    or the parameters change.
+
+    Figures are kept as JSON in a process-wide LRU capped at `max_bytes`;
+    a hit parses the stored JSON instead of recomputing the chart.
+    """
+    key = (
+        f"{build.__module__}.{build.__qualname__}",
+        fingerprint(df),
+        repr(sorted(params.items())),
+    )
+    cache = _figure_cache()
+    with cache["lock"]:
+        payload = cache["entries"].get(key)
+        if payload is not None:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+        else:
+            cache["misses"] += 1
+
+    if payload is not None:
+        return pio.from_json(payload)
+
+    fig = build(df, **params)
+    with cache["lock"]:
+        _store(cache, key, fig.to_json(), max_bytes)
+    return fig
+
+
+def figure_cache_stats():
+    """Hits, misses, evictions, entries and bytes of the figure cache"""
+    cache = _figure_cache()
+    with cache["lock"]:
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "evictions": cache["evictions"],
+            "entries": len(cache["entries"]),
+            "bytes": cache["bytes"],
+        }
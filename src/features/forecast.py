@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.features.figure_cache import fingerprint
+
+# Model name -> season length in days (None = straight line)
+MODELS = {
+    "linear": None,
+    "holt_winters_weekly": 7,
+    "holt_winters_monthly": 30,
+}
+
+Z_95 = 1.96  # two-sided 95% normal quantile for prediction intervals
+
+
+def _padded(df):
+    """
+    Categories as rows of NaN-padded (n_categories, max_length) arrays.
+    Returns (categories, days since each category's first date, amounts,
+    first dates), with every row sorted by date.
+    """
+    data = pd.DataFrame({
+        "Category": df["Category"].to_numpy(),
+        "Date": pd.to_datetime(df["Date"]).to_numpy(),
+        "Amount": df["Amount"].to_numpy(dtype=float),
+    }).dropna().sort_values(["Category", "Date"], kind="stable")
+
+    codes, categories = pd.factorize(data["Category"], sort=True)
+    pos = data.groupby(codes).cumcount().to_numpy()
+    first = data.groupby(codes)["Date"].min().to_numpy()
+
+    shape = (len(categories), pos.max() + 1 if len(pos) else 0)
+    x = np.full(shape, np.nan)
+    y = np.full(shape, np.nan)
+    x[codes, pos] = (data["Date"].to_numpy() - first[codes]) / np.timedelta64(1, "D")
+    y[codes, pos] = data["Amount"].to_numpy()
+    return categories, x, y, first
+
+
+def _fit_linear(df):
+    """Least squares line of every category at once, in closed form"""
+    categories, x, y, first = _padded(df)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = np.sum(~np.isnan(y), axis=1)
+        x_mean = np.nansum(x, axis=1) / n
+        y_mean = np.nansum(y, axis=1) / n
+        dx = x - x_mean[:, None]
+        sxx = np.nansum(dx ** 2, axis=1)
+        slope = np.nansum(dx * (y - y_mean[:, None]), axis=1) / sxx
+        intercept = y_mean - slope * x_mean
+        resid = y - (intercept[:, None] + slope[:, None] * x)
+        s2 = np.where(n > 2, np.nansum(resid ** 2, axis=1) / (n - 2), np.nan)
+
+    # Like np.polyfit before: needs 2+ points and a non-constant series
+    constant = np.nanmax(y, axis=1) == np.nanmin(y, axis=1)
+    return {
+        "categories": categories,
+        "ok": (n >= 2) & ~constant & (sxx > 0),
+        "slope": slope, "intercept": intercept, "s2": s2,
+        "n": n, "x_mean": x_mean, "sxx": sxx,
+        "x_max": np.nanmax(x, axis=1), "first": first,
+    }
+
+
+def _predict_linear(fit, periods):
+    steps = np.arange(1, periods + 1)
+    x = fit["x_max"][:, None] + steps                            # (categories, periods)
+    value = fit["intercept"][:, None] + fit["slope"][:, None] * x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = np.sqrt(fit["s2"][:, None] * (
+            1 + 1 / fit["n"][:, None] + (x - fit["x_mean"][:, None]) ** 2 / fit["sxx"][:, None]
+        ))
+    dates = fit["first"][:, None] + x.astype("timedelta64[D]")
+    return dates, value, se
+
+
+def _fit_holt_winters(df, season, alpha=0.3, beta=0.05, gamma=0.2):
+    """
+    Additive Holt-Winters on daily totals, all categories updated together.
+    Categories share one calendar (missing days count as 0). Needs at least
+    two full seasons of history, and like the line two days with data in
+    the category itself.
+    """
+    dates = pd.to_datetime(df["Date"]).dt.normalize()
+    daily = df.assign(Date=dates).pivot_table(
+        index="Category", columns="Date", values="Amount", aggfunc="sum", fill_value=0, observed=True
+    )
+    daily = daily.reindex(columns=pd.date_range(dates.min(), dates.max()), fill_value=0)
+    y = daily.to_numpy(dtype=float)
+    n_days = y.shape[1]
+
+    fit = {"categories": daily.index, "season": season, "alpha": alpha, "beta": beta,
+           "last": dates.max(), "n_days": n_days}
+    if n_days < 2 * season:
+        fit["ok"] = np.zeros(len(daily), dtype=bool)
+        return fit
+
+    level = y[:, :season].mean(axis=1)
+    trend = (y[:, season:2 * season].mean(axis=1) - level) / season
+    seasonal = y[:, :season] - level[:, None]
+
+    errors = np.empty((len(y), n_days - season))
+    for t in range(season, n_days):
+        j = t % season
+        errors[:, t - season] = y[:, t] - (level + trend + seasonal[:, j])
+        prev_level = level
+        level = alpha * (y[:, t] - seasonal[:, j]) + (1 - alpha) * (level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+        seasonal[:, j] = gamma * (y[:, t] - level) + (1 - gamma) * seasonal[:, j]
+
+    days_with_data = df.assign(Date=dates).groupby("Category", observed=True)["Date"].nunique()
+    enough = days_with_data.reindex(daily.index).to_numpy() >= 2
+    fit.update(ok=(errors.std(axis=1) > 0) & enough, level=level, trend=trend,
+               seasonal=seasonal, sigma=errors.std(axis=1))
+    return fit
+
+
+def _predict_holt_winters(fit, periods):
+    steps = np.arange(1, periods + 1)
+    n = len(fit["categories"])
+    dates = np.broadcast_to(
+        (fit["last"] + pd.to_timedelta(steps, unit="D")).to_numpy(), (n, periods)
+    )
+    if not fit["ok"].any():
+        return dates, np.full((n, periods), np.nan), np.full((n, periods), np.nan)
+
+    season_idx = (fit["n_days"] + steps - 1) % fit["season"]
+    value = fit["level"][:, None] + steps * fit["trend"][:, None] + fit["seasonal"][:, season_idx]
+    # Approximate h-step spread: one-step error widened by the level updates
+    se = fit["sigma"][:, None] * np.sqrt(1 + (steps - 1) * fit["alpha"] ** 2)
+    return dates, value, se
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _fit(key, model, _df):
+    """Fitted parameters, cached by the data fingerprint and model only"""
+    season = MODELS[model]
+    if season is None:
+        return _fit_linear(_df)
+    return _fit_holt_winters(_df, season)
+
+
+def forecast(df, periods=30, model="linear"):
+    """
+    Forecast every category of a (Category, Date, Amount) frame.
+
+    The fit is cached by the series fingerprint, so changing `periods` only
+    re-evaluates the fitted models. Returns a long frame with Category, Date,
+    Forecast, Lower and Upper (95% interval) for each category that could be
+    fitted; other categories are left out.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown forecast model: {model}")
+
+    fit = _fit(fingerprint(df[["Category", "Date", "Amount"]]), model, df)
+    if model == "linear":
+        dates, value, se = _predict_linear(fit, periods)
+    else:
+        dates, value, se = _predict_holt_winters(fit, periods)
+
+    ok = fit["ok"]
+    return pd.DataFrame({
+        "Category": np.repeat(np.asarray(fit["categories"])[ok], periods),
+        "Date": dates[ok].ravel(),
+        "Forecast": value[ok].ravel(),
+        "Lower": (value - Z_95 * se)[ok].ravel(),
+        "Upper": (value + Z_95 * se)[ok].ravel(),
+    })
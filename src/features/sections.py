@@ -0,0 +1,21 @@
+import streamlit as st
+
+
+def lazy_section(label, key, expanded=False):
+    """
+    Collapsible section whose body only runs while it is open.
+
+    st.expander always executes its body, so a closed expander still builds
+    and serializes its figures. This draws a toggle instead and returns a
+    bordered container when the section is open, None when it is closed:
+
+        section = lazy_section("Category Charts", "category_charts")
+        if section:
+            with section:
+                ...
+
+    The open / closed state is kept in session_state under `section_<key>`.
+    """
+    if not st.toggle(label, value=expanded, key=f"section_{key}"):
+        return None
+    return st.container(border=True)
@@ -0,0 +1,116 @@
+"""
+Signed login sessions with a per-session profile and category cache.
+
+Login issues an HMAC-signed token ("user_id.expires.signature") kept in
+the session state. Pages check it locally, so navigating makes no auth
+round trip; the profile and the user's categories are cached in the
+session until they expire or the table is written to (src.data.cache
+versions).
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+import streamlit as st
+
+from src.data.versions import table_version
+
+# Signing key shared by the server processes; without it tokens are only
+# valid for the lifetime of the process
+SECRET_ENV = "SESSION_SECRET"
+
+SESSION_TTL = 12 * 3600  # seconds a login stays valid
+SESSION_CACHE_TTL = 600  # seconds before the profile / categories are re-read (like CACHE_TTL)
+
+# Only what the app shows; the password hash is read at login and never kept
+PROFILE_COLUMNS = ("id", "email", "full_name")
+LOGIN_COLUMNS = (*PROFILE_COLUMNS, "password_hash")
+CATEGORY_COLUMNS = ("id", "category", "type", "color", "icon")
+
+
+@st.cache_resource
+def _secret():
+    return (os.environ.get(SECRET_ENV) or secrets.token_hex(32)).encode()
+
+
+def _sign(payload):
+    return hmac.new(_secret(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def issue_token(user_id, ttl=SESSION_TTL):
+    payload = f"{user_id}.{int(time.time() + ttl)}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token):
+    """User id of a valid, unexpired token, else None"""
+    try:
+        user_id, expires, signature = token.split(".")
+        valid = hmac.compare_digest(signature, _sign(f"{user_id}.{expires}"))
+        return int(user_id) if valid and int(expires) > time.time() else None
+    except (AttributeError, ValueError):
+        return None
+
+
+def start_session(user):
+    """Open a session for a users row that just passed the password check"""
+    profile = {c: user.get(c) for c in PROFILE_COLUMNS}
+    st.session_state.session = {
+        "token": issue_token(profile["id"]),
+        "profile": (profile, time.monotonic(), table_version(profile["id"], "users")),
+        "categories": None,
+    }
+    st.session_state.user_id = profile["id"]
+    st.session_state.user_email = profile["email"]
+
+
+def end_session():
+    st.session_state.session = None
+    st.session_state.user_id = None
+    st.session_state.user_email = None
+
+
+def current_user():
+    """Logged-in user id, or None (and the session is cleared) when the token is invalid"""
+    session = st.session_state.get("session")
+    user_id = verify_token(session["token"]) if session else None
+    if user_id is None or user_id != st.session_state.get("user_id"):
+        if session or st.session_state.get("user_id") is not None:
+            end_session()
+        return None
+    return user_id
+
+
+def _fresh(entry, user_id, table):
+    return (
+        entry is not None
+        and entry[2] == table_version(user_id, table)
+        and time.monotonic() - entry[1] < SESSION_CACHE_TTL
+    )
+
+
+def session_profile(conn):
+    """Profile dict (PROFILE_COLUMNS) of the logged-in user"""
+    session, user_id = st.session_state.session, st.session_state.user_id
+    if not _fresh(session["profile"], user_id, "users"):
+        version = table_version(user_id, "users")
+        rows = conn.table("users").select(*PROFILE_COLUMNS).eq("id", user_id).execute().data
+        session["profile"] = (rows[0] if rows else {}, time.monotonic(), version)
+    return session["profile"][0]
+
+
+def session_categories(conn):
+    """The logged-in user's categories (CATEGORY_COLUMNS), typed"""
+    # pandas is only needed once logged in; the login page does not load it
+    import pandas as pd
+    from src.data.schema import coerce
+
+    session, user_id = st.session_state.session, st.session_state.user_id
+    if not _fresh(session["categories"], user_id, "categories"):
+        version = table_version(user_id, "categories")
+        rows = conn.table("categories").select(*CATEGORY_COLUMNS).eq("user_id", user_id).execute().data
+        categories = coerce(pd.DataFrame(rows, columns=list(CATEGORY_COLUMNS)))
+        session["categories"] = (categories, time.monotonic(), version)
+    return session["categories"][0]
@@ -0,0 +1,186 @@
+"""
+In-memory stand-in for the Supabase connection, for tests.
+
+Supports the subset of the postgrest builder API the app uses. Every
+execute() is recorded in `conn.calls` as (table, operation, payload size)
+and the executed builder in `conn.queries`; `conn.fail` can make chosen
+calls raise to test error handling.
+"""
+import copy
+import itertools
+import re
+
+from postgrest.exceptions import APIError
+
+# The keyset condition of src.data.pagination: col > v or (col = v and id > i)
+KEYSET = re.compile(r'(\w+)\.gt\."?([^,"]+)"?,and\(\1\.eq\."?([^,"]+)"?,id\.gt\.(\d+)\)')
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, conn, table):
+        self.conn = conn
+        self.table = table
+        self.operation = "select"
+        self.columns = None
+        self.count = None
+        self.payload = None
+        self.options = {}
+        self.filters = []
+        self.ordering = []
+        self.window = None
+        self.negate = False
+
+    def select(self, *columns, count=None):
+        self.operation, self.columns, self.count = "select", columns, count
+        return self
+
+    def insert(self, payload, **options):
+        self.operation, self.payload, self.options = "insert", payload, options
+        return self
+
+    def upsert(self, payload, **options):
+        self.operation, self.payload, self.options = "upsert", payload, options
+        return self
+
+    def update(self, payload):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def _filter(self, test):
+        if self.negate:
+            self.negate = False
+            self.filters.append(lambda row: not test(row))
+        else:
+            self.filters.append(test)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda row: str(row.get(column)) == str(value))
+
+    def is_(self, column, value):
+        return self._filter(lambda row: row.get(column) is None if value == "null"
+                            else row.get(column) == value)
+
+    def gte(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row[column] >= value)
+
+    def lte(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row[column] <= value)
+
+    def lt(self, column, value):
+        return self._filter(lambda row: row.get(column) is not None and row[column] < value)
+
+    def or_(self, condition):
+        column, value, _, last_id = KEYSET.fullmatch(condition).groups()
+        return self._filter(lambda row: row[column] > value
+                            or (row[column] == value and row["id"] > int(last_id)))
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.window = (0, n - 1)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def execute(self):
+        size = len(self.payload) if isinstance(self.payload, list) else None
+        self.conn.calls.append((self.table, self.operation, size))
+        self.conn.queries.append(self)
+        if self.conn.fail and self.conn.fail(self.table, self.operation, self.payload):
+            raise RuntimeError(f"{self.operation} on {self.table} failed")
+
+        rows = self.conn.tables.setdefault(self.table, [])
+        if self.operation in ("insert", "upsert"):
+            return Response(copy.deepcopy(self._insert(rows)))
+
+        matched = [row for row in rows if all(test(row) for test in self.filters)]
+        if self.operation == "update":
+            for row in matched:
+                row.update(self.payload)
+        elif self.operation == "delete":
+            rows[:] = [row for row in rows if row not in matched]
+        else:
+            for column, desc in reversed(self.ordering):
+                matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            total = len(matched) if self.count else None
+            if self.window:
+                if total is not None and self.window[0] > 0 and self.window[0] >= total:
+                    # Like PostgREST, an offset past the counted rows is an error
+                    raise APIError({"code": "PGRST103", "message": "Requested range not satisfiable"})
+                matched = matched[self.window[0]:self.window[1] + 1]
+            if self.columns and self.columns != ("*",):
+                matched = [{c: row.get(c) for c in self.columns} for row in matched]
+            return Response(copy.deepcopy(matched), total)
+        return Response(copy.deepcopy(matched))
+
+    def _insert(self, rows):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        keys = self.options["on_conflict"].split(",") if self.options.get("on_conflict") else None
+        written = []
+        for row in map(dict, payload):
+            if keys and any(all(str(r.get(k)) == str(row.get(k)) for k in keys) for r in rows):
+                continue  # ignore_duplicates: the database skips the row
+            row.setdefault("id", next(self.conn.ids))
+            rows.append(row)
+            written.append(row)
+        return written
+
+
+class FakeRpc:
+    def __init__(self, conn, fn, params):
+        self.conn = conn
+        self.fn = fn
+        self.params = params or {}
+
+    def execute(self):
+        self.conn.calls.append((self.fn, "rpc", None))
+        if self.conn.fail and self.conn.fail(self.fn, "rpc", self.params):
+            raise RuntimeError(f"rpc {self.fn} failed")
+        return Response(self.conn.functions[self.fn](**self.params))
+
+
+class FakeClient:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def table(self, name):
+        return FakeQuery(self.conn, name)
+
+    def rpc(self, fn, params=None):
+        return FakeRpc(self.conn, fn, params)
+
+
+class FakeConnection:
+    """`functions` maps database function names to Python callables, for rpc()"""
+
+    def __init__(self, tables=None, fail=None, functions=None):
+        self.tables = tables or {}
+        self.functions = functions or {}
+        self.calls = []
+        self.queries = []
+        self.fail = fail
+        self.ids = itertools.count(1)
+        self.client = FakeClient(self)
+
+    def table(self, name):
+        return FakeQuery(self, name)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.charts import category_line, category_trend
+
+
+def make_frame():
+    return pd.DataFrame({
+        "Date": ["2025-01-03", "2025-01-01", "2025-01-02", "2025-01-01"],
+        "Category": ["Food", "Food", "Rent", "Rent"],
+        "Amount": [12.5, 7.0, 900.0, 30.0],
+    })
+
+
+def test_category_line_leaves_the_frame_untouched():
+    df = make_frame()
+    fig = category_line(df)
+
+    pd.testing.assert_frame_equal(df, make_frame())
+    lines = {trace.name: list(trace.y) for trace in fig.data}
+    assert lines == {"Food": [7.0, 12.5], "Rent": [30.0, 900.0], "Total": [37.0, 900.0, 12.5]}
+
+
+def test_category_trend_leaves_the_frame_untouched():
+    df = make_frame()
+    category_trend(df)
+    pd.testing.assert_frame_equal(df, make_frame())
+
+
+def per_category_trend(df, window, threshold):
+    """The per-category loop category_trend replaced"""
+    df = df.assign(Date=pd.to_datetime(df["Date"]))
+    groups = []
+    for _, group in df.groupby("Category"):
+        group = group.sort_values("Date")
+        group["SMA"] = group["Amount"].rolling(window=window, min_periods=1).mean()
+        group["ZScore"] = (group["Amount"] - group["Amount"].mean()) / group["Amount"].std()
+        group["Anomaly"] = group["ZScore"].abs() > threshold
+        groups.append(group)
+    return pd.concat(groups, ignore_index=True)[["Category", "Date", "Amount", "SMA", "ZScore", "Anomaly"]]
+
+
+def random_frame(seed):
+    """Shuffled daily amounts with a few outliers, plus a single-row category"""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2024-01-01", periods=60, freq="D")
+    frames = [pd.DataFrame({"Date": days, "Category": cat, "Amount": rng.gamma(2, 20, len(days))})
+              for cat in ["Food", "Fuel", "Rent"]]
+    frames.append(pd.DataFrame({"Date": [days[5]], "Category": ["Gifts"], "Amount": [50.0]}))
+    df = pd.concat(frames, ignore_index=True)
+    df.loc[rng.choice(len(df) - 1, 4, replace=False), "Amount"] *= 10
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df.sample(frac=1, random_state=seed, ignore_index=True)
+
+
+@pytest.mark.parametrize("window, threshold", [(1, 2), (3, 2), (7, 1.5)])
+@pytest.mark.parametrize("df", [make_frame(), random_frame(0), random_frame(1)],
+                         ids=["small", "random0", "random1"])
+def test_category_trend_matches_the_per_category_loop(df, window, threshold):
+    expected = per_category_trend(df, window, threshold)
+    actual = category_trend(df, window=window, threshold=threshold)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_single_row_category_has_no_zscore():
+    data = category_trend(random_frame(0))
+    gifts = data[data["Category"] == "Gifts"]
+    assert len(gifts) == 1
+    assert gifts["ZScore"].isna().all()
+    assert not gifts["Anomaly"].any()
+    assert data["Anomaly"].any()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from src.features.downsample import (
+    DOWNSAMPLE_ABOVE, _bucket_edges, downsample_indices, lttb_indices, minmax_indices, prepare
+)
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float), rng.normal(0, 1, n).cumsum()
+
+
+@pytest.mark.parametrize("n, n_out", [(10_000, 1000), (1001, 1000), (5000, 3), (50, 7)])
+def test_lttb_keeps_endpoints_in_order(n, n_out):
+    x, y = series(n)
+    keep = lttb_indices(x, y, n_out)
+    assert len(keep) == n_out
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert (np.diff(keep) > 0).all()
+
+
+def test_lttb_keeps_a_spike():
+    x, y = series(10_000)
+    y[4321] = 1e6
+    assert 4321 in lttb_indices(x, y, 100)
+
+
+@pytest.mark.parametrize("n, n_out", [(10_000, 1000), (1001, 1000), (5000, 10)])
+def test_minmax_keeps_every_bucket_extreme(n, n_out):
+    _, y = series(n)
+    keep = minmax_indices(y, n_out)
+    assert len(keep) <= n_out
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert (np.diff(keep) > 0).all()
+
+    edges = _bucket_edges(n, max((n_out - 2) // 2, 1))
+    kept = set(keep)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        assert lo + int(y[lo:hi].argmin()) in kept
+        assert lo + int(y[lo:hi].argmax()) in kept
+
+
+def test_short_series_are_kept_whole():
+    x, y = series(500)
+    np.testing.assert_array_equal(lttb_indices(x, y, 1000), np.arange(500))
+    np.testing.assert_array_equal(minmax_indices(y, 1000), np.arange(500))
+    np.testing.assert_array_equal(downsample_indices(x, y, None), np.arange(500))
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_dates(method):
+    dates = pd.date_range("2000-01-01", periods=20_000, freq="D")
+    _, y = series(len(dates))
+    keep = downsample_indices(dates, y, 1000, method)
+    assert keep[0] == 0 and keep[-1] == len(dates) - 1
+    assert (np.diff(keep) > 0).all()
+    assert len(keep) == 1000 if method == "lttb" else len(keep) <= 1000
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        downsample_indices(*series(10), method="every_other")
+
+
+def figure(n):
+    x, y = series(n)
+    return go.Figure([
+        go.Scatter(x=x, y=y, mode="lines", name="line"),
+        go.Scatter(x=x, y=y, mode="markers", name="markers"),
+        go.Scatter(x=x, y=y, fill="tonexty", name="band"),
+    ])
+
+
+def test_prepare_cuts_only_long_lines():
+    n = DOWNSAMPLE_ABOVE + 1
+    fig = prepare(figure(n), max_points=1000, webgl_threshold=None)
+    line, markers, band = fig.data
+    assert len(line.x) == 1000
+    assert line.x[0] == 0 and line.x[-1] == n - 1
+    assert (np.diff(line.x) > 0).all()
+    assert len(markers.x) == len(band.x) == n
+
+
+def test_prepare_keeps_lines_below_the_threshold():
+    fig = prepare(figure(DOWNSAMPLE_ABOVE), max_points=1000, webgl_threshold=None)
+    assert all(len(trace.x) == DOWNSAMPLE_ABOVE for trace in fig.data)
+
+
+def test_prepare_without_a_budget_passes_through():
+    n = 4 * DOWNSAMPLE_ABOVE
+    fig = prepare(figure(n), max_points=None, webgl_threshold=None)
+    assert all(len(trace.x) == n for trace in fig.data)
+    assert {trace.type for trace in fig.data} == {"scatter"}
+
+
+def test_prepare_switches_big_figures_to_webgl():
+    fig = prepare(figure(3000), max_points=None, webgl_threshold=5000)
+    assert {trace.type for trace in fig.data} == {"scattergl"}
+    assert prepare(figure(100), webgl_threshold=5000).data[0].type == "scatter"
@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.data.export import export_user
+from tests.fakes import FakeConnection
+
+
+def recurring(i, comment=None, active=True):
+    return {"id": i, "user_id": 1, "title": f"Rule {i}", "category_id": 1, "amount": 10.0,
+            "comment": comment, "active": active, "start_date": "2025-01-01",
+            "end_date": None, "frequency": "Monthly"}
+
+
+def make_conn():
+    return FakeConnection({
+        "categories": [{"id": 1, "user_id": 1, "category": "Rent"}],
+        # The first page has no comments and no inactive rule, a later one has both
+        "recurrings": [recurring(i) for i in range(1, 4)]
+                      + [recurring(4, comment="yearly", active=None), recurring(5, active=False)],
+        "expenses": [{"id": i, "user_id": 1, "date": f"2025-01-{i:02d}", "category_id": 1,
+                      "amount": i * 1.5, "title": "Shop", "comment": None if i < 3 else "card",
+                      "import_hash": None} for i in range(1, 8)],
+        "incomes": [],
+        "budgets": [],
+    })
+
+
+def read_member(archive, name):
+    with archive.open(name) as member:
+        return pq.read_table(io.BytesIO(member.read())).to_pandas()
+
+
+def test_parquet_pages_with_different_types():
+    out = io.BytesIO()
+    counts = export_user(make_conn(), 1, out, fmt="parquet", page_size=3)
+    assert counts == {"incomes": 0, "expenses": 7, "recurrings": 5, "budgets": 0}
+
+    with zipfile.ZipFile(out) as archive:
+        recurrings = read_member(archive, "recurrings.parquet")
+        expenses = read_member(archive, "expenses.parquet")
+
+    assert recurrings["comment"].tolist() == [None, None, None, "yearly", None]
+    assert recurrings["active"].tolist() == [True, True, True, None, False]
+    assert recurrings["category"].tolist() == ["Rent"] * 5
+    assert expenses["comment"].tolist() == [None, None] + ["card"] * 5
+    assert expenses["amount"].sum() == 42.0
+    assert "user_id" not in expenses and "import_hash" not in expenses
+
+
+def test_csv_export():
+    out = io.BytesIO()
+    export_user(make_conn(), 1, out, page_size=3)
+    with zipfile.ZipFile(out) as archive, archive.open("expenses.csv") as member:
+        expenses = pd.read_csv(member)
+    assert len(expenses) == 7
+    assert expenses["date"].iloc[0] == "2025-01-01"
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from src.data import fetch
+from src.data.fetch import fetch_all
+
+
+def fail():
+    raise ValueError("boom")
+
+
+def test_results_and_errors():
+    out = fetch_all({"a": lambda: 1, "b": fail})
+    assert out["results"] == {"a": 1}
+    assert out["errors"] == {"b": "boom"}
+    assert set(out["timings"]) == {"a", "b"}
+
+
+def test_timeout_abandons_the_result():
+    release = threading.Event()
+    try:
+        out = fetch_all({"slow": release.wait, "fast": lambda: 2}, timeout=0.2)
+        assert out["results"] == {"fast": 2}
+        assert out["errors"] == {"slow": "timed out after 0.2s"}
+        assert out["timings"]["slow"] > 0.1
+    finally:
+        release.set()
+
+
+def test_full_pool_runs_jobs_inline():
+    release = threading.Event()
+    hung = {f"hung{i}": release.wait for i in range(fetch.MAX_WORKERS)}
+    try:
+        # Every worker is now held by a job whose result was abandoned
+        assert len(fetch_all(hung, timeout=0.1)["errors"]) == fetch.MAX_WORKERS
+
+        out = fetch_all({"a": lambda: threading.current_thread().name, "b": fail}, timeout=0.1)
+        assert out["results"] == {"a": threading.current_thread().name}
+        assert out["errors"] == {"b": "boom"}
+    finally:
+        release.set()
+
+
+@pytest.fixture(autouse=True)
+def free_workers():
+    """Each test starts with every worker free again"""
+    yield
+    state = fetch._pool()
+    for _ in range(fetch.MAX_WORKERS):
+        assert state["slots"].acquire(timeout=5)
+    for _ in range(fetch.MAX_WORKERS):
+        state["slots"].release()
@@ -0,0 +1,85 @@
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from src.features import figure_cache
+from src.features.figure_cache import cached_figure, figure_cache_stats
+
+BUILDS = []
+
+
+def bar(df, title="Spending"):
+    BUILDS.append(title)
+    return go.Figure(go.Bar(x=df["Category"], y=df["Amount"]), layout={"title": title})
+
+
+def frame(n):
+    return pd.DataFrame({"Category": [f"Category {i}" for i in range(n)], "Amount": range(n)})
+
+
+def size(df, **params):
+    return len(bar(df, **params).to_json())
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    figure_cache._figure_cache.clear()
+    BUILDS.clear()
+
+
+def test_hit_returns_the_same_figure_without_a_rebuild():
+    df = frame(5)
+    first = cached_figure(bar, df)
+    second = cached_figure(bar, frame(5))
+
+    assert BUILDS == ["Spending"]
+    assert list(second.data[0].y) == list(first.data[0].y)
+    assert second.layout.title.text == "Spending"
+    stats = figure_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 1, 0, 1)
+    assert stats["bytes"] == len(first.to_json())
+
+
+def test_data_and_parameters_are_part_of_the_key():
+    cached_figure(bar, frame(5))
+    cached_figure(bar, frame(6))
+    cached_figure(bar, frame(5), title="Income")
+    assert BUILDS == ["Spending", "Spending", "Income"]
+    assert figure_cache_stats()["misses"] == 3
+
+
+def test_least_recently_used_is_evicted_first():
+    a, b, c = frame(5), frame(6), frame(7)
+    cap = size(a) + size(b) + size(c) - 1
+
+    cached_figure(bar, a, max_bytes=cap)
+    cached_figure(bar, b, max_bytes=cap)
+    cached_figure(bar, a, max_bytes=cap)   # a is now the most recent
+    cached_figure(bar, c, max_bytes=cap)   # evicts b
+
+    stats = figure_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] == size(a) + size(c) <= cap
+
+    BUILDS.clear()
+    cached_figure(bar, a, max_bytes=cap)
+    cached_figure(bar, c, max_bytes=cap)
+    assert BUILDS == []
+    cached_figure(bar, b, max_bytes=cap)
+    assert len(BUILDS) == 1
+
+
+def test_figure_over_the_cap_is_not_stored():
+    df = frame(500)
+    cap = size(frame(5)) * 2
+    assert size(df) > cap
+
+    cached_figure(bar, frame(5), max_bytes=cap)
+    fig = cached_figure(bar, df, max_bytes=cap)
+    assert list(fig.data[0].y) == list(range(500))
+
+    stats = figure_cache_stats()
+    assert (stats["entries"], stats["evictions"]) == (1, 0)
+    cached_figure(bar, df, max_bytes=cap)
+    assert figure_cache_stats()["misses"] == 3
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features import forecast as forecast_module
+from src.features.forecast import MODELS, forecast
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    forecast_module._fit.clear()
+
+
+def linear_frame():
+    """Noisy lines with different slopes, lengths and irregular dates"""
+    rng = np.random.default_rng(3)
+    frames = []
+    for i, cat in enumerate(["Food", "Fuel", "Rent"]):
+        days = np.sort(rng.choice(120, 20 + 15 * i, replace=False))
+        frames.append(pd.DataFrame({
+            "Category": cat,
+            "Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(days, unit="D"),
+            "Amount": 50 + (i - 1) * 0.7 * days + rng.normal(0, 5, len(days)),
+        }))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0, ignore_index=True)
+
+
+def seasonal_frame(season, n_seasons=8):
+    """A repeating pattern of length `season` plus a little noise"""
+    rng = np.random.default_rng(season)
+    days = pd.date_range("2025-01-01", periods=season * n_seasons, freq="D")
+    pattern = 100 + 40 * np.sin(2 * np.pi * np.arange(season) / season)
+    amounts = np.tile(pattern, n_seasons) + rng.normal(0, 1, len(days))
+    return pd.DataFrame({"Category": "Food", "Date": days, "Amount": amounts}), pattern
+
+
+def test_linear_matches_polyfit_per_category():
+    df = linear_frame()
+    out = forecast(df, periods=10)
+
+    assert sorted(out["Category"].unique()) == ["Food", "Fuel", "Rent"]
+    for cat, group in df.groupby("Category"):
+        group = group.sort_values("Date")
+        x = (group["Date"] - group["Date"].min()).dt.days.to_numpy()
+        coef = np.polyfit(x, group["Amount"], 1)
+        expected = np.polyval(coef, x.max() + np.arange(1, 11))
+
+        predicted = out[out["Category"] == cat]
+        np.testing.assert_allclose(predicted["Forecast"], expected)
+        assert list(predicted["Date"]) == list(group["Date"].max() + pd.to_timedelta(range(1, 11), unit="D"))
+
+
+@pytest.mark.parametrize("model", ["holt_winters_weekly", "holt_winters_monthly"])
+def test_holt_winters_follows_the_season(model):
+    season = MODELS[model]
+    df, pattern = seasonal_frame(season)
+    out = forecast(df, periods=season, model=model)
+
+    assert len(out) == season
+    assert out["Date"].iloc[0] == df["Date"].max() + pd.Timedelta(days=1)
+    # The forecast picks up where the pattern left off
+    np.testing.assert_allclose(out["Forecast"], pattern, atol=5)
+    assert (out["Lower"] < out["Forecast"]).all()
+    assert (out["Forecast"] < out["Upper"]).all()
+
+
+def test_holt_winters_needs_two_seasons():
+    df, _ = seasonal_frame(7, n_seasons=1)
+    assert forecast(df, model="holt_winters_weekly").empty
+
+
+@pytest.mark.parametrize("model", list(MODELS))
+def test_single_row_and_constant_categories_are_left_out(model):
+    days = pd.date_range("2025-01-01", periods=60, freq="D")
+    df = pd.DataFrame({
+        "Category": ["Gifts"] + ["Rent"] * len(days),
+        "Date": [days[0], *days],
+        "Amount": [20.0] + [900.0] * len(days),
+    })
+    out = forecast(df, model=model)
+    assert out.empty
+    assert list(out.columns) == ["Category", "Date", "Forecast", "Lower", "Upper"]
+
+
+def test_changing_periods_reuses_the_fit(monkeypatch):
+    calls = []
+    fit_linear = forecast_module._fit_linear
+    monkeypatch.setattr(forecast_module, "_fit_linear", lambda df: calls.append(1) or fit_linear(df))
+
+    df = linear_frame()
+    short = forecast(df, periods=5)
+    long = forecast(df, periods=30)
+
+    assert len(calls) == 1
+    assert len(long) == 6 * len(short)
+    pd.testing.assert_frame_equal(
+        long.groupby("Category").head(5).reset_index(drop=True), short
+    )
+
+
+def test_unknown_model():
+    with pytest.raises(ValueError):
+        forecast(linear_frame(), model="arima")
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_budget import ROOT, measure
+
+# Libraries a logged-out visitor must not wait for
+HEAVY = ["pandas", "numpy", "plotly", "supabase", "st_supabase_connection", "postgrest", "bcrypt"]
+
+COLD_START = f"""
+import sys
+import streamlit
+before = set(sys.modules)
+import app
+print(" ".join(sorted(set(sys.modules) - before)))
+"""
+
+
+def test_cold_start_leaves_heavy_libraries_out():
+    # Compared with what streamlit itself loads (e.g. plotly), and followed
+    # into every branch app.py and the login form take on a first render
+    out = subprocess.run([sys.executable, "-c", COLD_START], cwd=ROOT, capture_output=True,
+                         text=True, check=True)
+    loaded = {name.split(".")[0] for name in out.stdout.split()}
+    assert "pages" in loaded
+    assert not loaded & set(HEAVY)
+
+
+@pytest.mark.skipif(os.environ.get("IMPORT_BUDGET") != "1",
+                    reason="wall-clock budget, set IMPORT_BUDGET=1 to run it")
+def test_imports_within_budget():
+    over = [f"{name}: {elapsed:.3f}s > {budget:.3f}s"
+            for name, elapsed, budget in measure() if elapsed > budget]
+    assert not over, "import time over budget: " + ", ".join(over)
@@ -0,0 +1,174 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.importer import (
+    categorize, import_transactions, parse_amounts, parse_dates, parse_rules, row_hashes
+)
+from src.data.loader import iter_csv, iter_ofx, iter_qif
+from tests.fakes import FakeConnection
+
+CATEGORIES = pd.DataFrame({
+    "id": [1, 2, 3, 4],
+    "category": ["Salary", "Groceries", "Fuel", "Other"],
+    "type": ["Income", "Expense", "Expense", "Expense"],
+})
+DEFAULTS = {"Income": 1, "Expense": 4}
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250301120000[-5:EST]<TRNAMT>-42.10<NAME>SHELL 123<MEMO>Fuel
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250302
+<TRNAMT>2500.00
+<NAME>ACME PAYROLL
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF = """!Type:Bank
+D12/31'24
+T-1,234.56
+PRent
+MDecember
+^
+D1/2'25
+U15.00
+PRefund
+^
+"""
+
+
+def strings(*values):
+    return pd.Series(values, dtype=object)
+
+
+def test_amounts():
+    amounts = parse_amounts(strings("1,234.50", "$ -12.30", "(45.00)", "+7", "abc", ""))
+    np.testing.assert_array_equal(amounts, [1234.5, -12.3, -45.0, 7.0, np.nan, np.nan])
+
+
+def test_amounts_with_a_decimal_comma():
+    amounts = parse_amounts(strings("1.234,50", "-12,30", "(45,00)", "€ 3,5"), decimal=",")
+    np.testing.assert_array_equal(amounts, [1234.5, -12.3, -45.0, 3.5])
+
+
+def test_dates():
+    dates = parse_dates(strings("2025-03-01", "20250302", "12/31'24", "3/4/2025", "nope"))
+    assert dates.tolist()[:4] == [pd.Timestamp(d) for d in
+                                  ["2025-03-01", "2025-03-02", "2024-12-31", "2025-03-04"]]
+    assert pd.isna(dates.iloc[4])
+
+
+def test_day_first_dates():
+    dates = parse_dates(strings("03/04/2025", "31.12.2024", "20250302"), dayfirst=True)
+    assert dates.tolist() == [pd.Timestamp(d) for d in ["2025-04-03", "2024-12-31", "2025-03-02"]]
+
+
+def test_ofx_reader():
+    frame = pd.concat(iter_ofx(io.BytesIO(OFX.encode("latin-1"))), ignore_index=True)
+    assert frame.values.tolist() == [
+        ["20250301", "-42.10", "SHELL 123 Fuel"],
+        ["20250302", "2500.00", "ACME PAYROLL"],
+    ]
+
+
+def test_qif_reader():
+    frame = pd.concat(iter_qif(io.StringIO(QIF)), ignore_index=True)
+    assert frame.values.tolist() == [
+        ["12/31'24", "-1,234.56", "Rent December"],
+        ["1/2'25", "15.00", "Refund"],
+    ]
+    assert parse_dates(frame["date"]).tolist() == [pd.Timestamp("2024-12-31"),
+                                                   pd.Timestamp("2025-01-02")]
+
+
+def test_rules_and_categories():
+    rules, unknown = parse_rules("shell = Fuel\nAcme=salary\nlidl = Groceries\nbad = Travel\nno rule",
+                                 CATEGORIES)
+    assert rules == [("shell", 3, "Expense"), ("acme", 1, "Income"), ("lidl", 2, "Expense")]
+    assert unknown == ["bad = Travel"]
+
+    descriptions = strings("SHELL 123", "Acme payroll", "Lidl Shell station", "Refund", "Shell refund")
+    types = strings("Expense", "Income", "Expense", "Income", "Income")
+    # First matching rule wins; a rule only applies to its category's type
+    assert categorize(descriptions, types, rules, DEFAULTS).tolist() == [3, 1, 3, 1, 1]
+
+
+def test_equal_rows_get_distinct_hashes_across_chunks():
+    dates = pd.Series(pd.to_datetime(["2025-03-01"] * 2))
+    amounts = pd.Series([9.5, 9.5])
+    seen = {}
+    first = row_hashes(dates, amounts, strings("Coffee", "coffee"), seen)
+    second = row_hashes(dates[:1], amounts[:1], strings("COFFEE"), seen)
+    assert len(set(first + second)) == 3
+    assert row_hashes(dates, amounts, strings("Coffee", "Coffee"), {}) == first
+
+
+def bank_csv(n):
+    rows = ["Booked;Value;Payee;Reference"]
+    for i in range(n):
+        amount = f"({i % 50},25)" if i % 3 else f"{1000 + i},00"
+        rows.append(f"{i % 28 + 1:02d}/03/2025;{amount};Shop {i % 7};Ref {i % 4}")
+    return "\n".join(rows) + "\n"
+
+
+def csv_chunks(text, chunksize):
+    return iter_csv(io.StringIO(text), "Booked", "Value", ["Payee", "Reference"],
+                    chunksize=chunksize, sep=";")
+
+
+@pytest.fixture
+def conn():
+    return FakeConnection({"incomes": [], "expenses": []},
+                          functions={"apply_ledger_deltas": lambda **params: None})
+
+
+def import_csv(conn, text, chunksize):
+    rules, _ = parse_rules("shop 3 = Fuel", CATEGORIES)
+    return import_transactions(conn, 1, csv_chunks(text, chunksize), rules, DEFAULTS,
+                               dayfirst=True, decimal=",")
+
+
+def test_chunked_csv_reads_across_the_boundary():
+    text = bank_csv(25)
+    chunks = list(csv_chunks(text, 10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert pd.concat(chunks, ignore_index=True).equals(next(csv_chunks(text, 100)))
+    assert chunks[1].iloc[0].tolist() == ["11/03/2025", "(10,25)", "Shop 3 Ref 2"]
+
+
+def test_import_writes_every_row_once(conn):
+    text = bank_csv(25)
+    summary = import_csv(conn, text, chunksize=10)
+    assert summary == {"read": 25, "invalid": 0, "inserted": 25, "duplicates": 0, "failed": []}
+
+    expenses = conn.tables["expenses"]
+    assert len(expenses) == 16 and len(conn.tables["incomes"]) == 9
+    row = next(r for r in expenses if r["title"] == "Shop 3 Ref 2")
+    assert (row["date"], row["amount"], row["category_id"]) == ("2025-03-11", 10.25, 3)
+    assert {r["category_id"] for r in conn.tables["incomes"]} == {1}
+
+
+@pytest.mark.parametrize("chunksize", [10, 7, 100])
+def test_second_import_writes_nothing(conn, chunksize):
+    text = bank_csv(25) + bank_csv(3).split("\n", 1)[1]  # three repeated rows
+    first = import_csv(conn, text, chunksize=10)
+    assert first["inserted"] == 28
+
+    conn.calls.clear()
+    again = import_csv(conn, text, chunksize=chunksize)
+    assert again["inserted"] == 0
+    assert again["duplicates"] == 28
+    assert len(conn.tables["incomes"]) + len(conn.tables["expenses"]) == 28
+    assert ("apply_ledger_deltas", "rpc", None) not in conn.calls
+
+
+def test_invalid_rows_are_counted(conn):
+    text = "Booked;Value;Payee;Reference\n01/03/2025;abc;X;Y\nlater;1,00;X;Y\n02/03/2025;0,00;X;Y\n"
+    summary = import_csv(conn, text, chunksize=10)
+    assert (summary["read"], summary["invalid"], summary["inserted"]) == (3, 3, 0)
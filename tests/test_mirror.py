@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.data import mirror
+from tests.fakes import FakeConnection
+
+START = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def stamp(hours):
+    """updated_at / deleted_at as PostgREST returns a timestamptz"""
+    return (START + timedelta(hours=hours)).isoformat()
+
+
+def expense(i, amount=10.0, at=0):
+    return {"id": i, "user_id": 1, "date": f"2025-02-{i % 28 + 1:02d}", "category_id": 1,
+            "amount": amount, "title": f"Row {i}", "comment": "", "recurring_id": None,
+            "updated_at": stamp(at)}
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setenv(mirror.MIRROR_ENV, str(tmp_path / "mirror.sqlite"))
+    # More rows than one page, written in the same instant: the keyset pages
+    # must break the updated_at ties on id. The last row, written later, is
+    # the only one within the overlap window of the first watermark.
+    return FakeConnection({
+        "expenses": [expense(i, at=-1) for i in range(1, 2500)] + [expense(2500)],
+        "ledger_tombstones": [],
+    })
+
+
+def mirrored(conn):
+    frame = mirror.mirror_frame(conn, 1, "expenses")
+    return dict(zip(frame["id"].tolist(), frame["amount"].tolist()))
+
+
+def backend(conn):
+    return {row["id"]: row["amount"] for row in conn.tables["expenses"]}
+
+
+def test_initial_sync(conn):
+    assert mirror.sync(conn, 1, "expenses") == {"changed": 2500, "deleted": 0}
+    assert mirrored(conn) == backend(conn)
+
+
+def test_incremental_sync_pulls_only_changes(conn):
+    mirror.sync(conn, 1, "expenses")
+
+    conn.tables["expenses"] += [expense(3001, 5.0, at=2), expense(3002, 6.0, at=2)]
+    conn.tables["expenses"][0].update(amount=99.0, updated_at=stamp(2))
+    conn.calls.clear()
+
+    # 3 changes, plus the row re-read by the overlap window
+    assert mirror.sync(conn, 1, "expenses", force=True) == {"changed": 4, "deleted": 0}
+    assert [call[:2] for call in conn.calls] == [("expenses", "select"), ("ledger_tombstones", "select")]
+    assert mirrored(conn) == backend(conn)
+    assert mirrored(conn)[1] == 99.0
+
+
+def test_tombstoned_delete(conn):
+    mirror.sync(conn, 1, "expenses")
+
+    deleted = conn.tables["expenses"].pop(41)
+    conn.tables["ledger_tombstones"].append({
+        "id": 1, "user_id": 1, "table_name": "expenses", "row_id": deleted["id"],
+        "deleted_at": stamp(3),
+    })
+
+    assert mirror.sync(conn, 1, "expenses", force=True) == {"changed": 1, "deleted": 1}
+    assert deleted["id"] not in mirrored(conn)
+    assert mirrored(conn) == backend(conn)
+
+
+def test_resync_does_not_duplicate(conn):
+    mirror.sync(conn, 1, "expenses")
+    conn.tables["expenses"].append(expense(3001, 5.0, at=1))
+    mirror.sync(conn, 1, "expenses", force=True)
+
+    # The overlap window re-reads the latest rows; they replace, not add
+    result = mirror.sync(conn, 1, "expenses", force=True)
+    assert result["changed"] == 1
+    frame = mirror.mirror_frame(conn, 1, "expenses")
+    assert len(frame) == len(conn.tables["expenses"]) == 2501
+    assert frame["id"].is_unique
+
+
+def test_unchanged_table_is_not_synced_again(conn):
+    mirror.sync(conn, 1, "expenses")
+    conn.calls.clear()
+    assert mirror.sync(conn, 1, "expenses") is None
+    assert conn.calls == []
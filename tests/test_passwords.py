@@ -0,0 +1,59 @@
+import logging
+import threading
+
+import bcrypt
+import pytest
+
+from src.features import passwords
+from tests.fakes import FakeConnection
+
+
+@pytest.fixture
+def user(monkeypatch):
+    monkeypatch.setenv(passwords.ROUNDS_ENV, "5")
+    return {"id": 1, "password_hash": bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode()}
+
+
+def test_login_upgrades_the_work_factor(user):
+    conn = FakeConnection({"users": [dict(user)]})
+    assert passwords.verify_login(conn, user, "secret")
+    assert passwords.hash_rounds(conn.tables["users"][0]["password_hash"]) == 5
+    assert not passwords.verify_login(conn, user, "wrong")
+
+
+def test_failed_upgrade_is_logged_not_raised(user, caplog):
+    conn = FakeConnection({"users": [dict(user)]}, fail=lambda table, operation, payload: True)
+    with caplog.at_level(logging.WARNING, logger=passwords.__name__):
+        assert passwords.verify_login(conn, user, "secret")
+    assert "Could not upgrade the password hash of user 1" in caplog.text
+    assert caplog.records[0].exc_info is not None
+
+
+@pytest.fixture
+def cpus(monkeypatch):
+    """Set the core count, with a fresh pool for it"""
+    def set_cpus(n):
+        monkeypatch.setattr(passwords.os, "cpu_count", lambda: n)
+        passwords._hash_pool.clear()
+    monkeypatch.delenv(passwords.WORKERS_ENV, raising=False)
+    yield set_cpus
+    passwords._hash_pool.clear()
+
+
+def current_thread():
+    return threading.current_thread().name
+
+
+def test_single_core_hashes_inline(cpus):
+    cpus(1)
+    assert passwords._run(current_thread) == threading.current_thread().name
+    assert passwords.check_password("secret", bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode())
+
+
+def test_several_cores_use_the_pool(cpus, monkeypatch):
+    cpus(4)
+    assert passwords._run(current_thread).startswith("bcrypt")
+
+    cpus(1)
+    monkeypatch.setenv(passwords.WORKERS_ENV, "1")
+    assert passwords._run(current_thread).startswith("bcrypt")
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.data.pagination import iter_pages, read_frame
+from src.data.periods import PERIOD_OPTIONS, filter_period, is_month_window, period_window
+from tests.fakes import FakeConnection
+
+# One row per day, across two year ends and the 2024 leap day
+DAYS = pd.date_range("2023-01-01", "2025-12-31", freq="D")
+
+TODAYS = [date(2024, 1, 1), date(2024, 1, 3), date(2024, 2, 29), date(2024, 3, 1),
+          date(2024, 12, 31), date(2025, 1, 1), date(2025, 3, 1)]
+MONTHS = [(None, None), (1, 2024), (2, 2024), (2, 2025), (12, 2024), (1, 2025), (3, 2024)]
+
+
+@pytest.fixture(scope="module")
+def conn():
+    return FakeConnection({"expenses": [
+        {"id": i, "user_id": 1, "date": d.date().isoformat(), "amount": 1.0}
+        for i, d in enumerate(DAYS, start=1)
+    ]})
+
+
+def server_dates(conn, period, today, month, year):
+    """Dates the query returns with period_window pushed down as gte / lt"""
+    start, end = period_window(period, today, month=month, year=year)
+    frame = read_frame(iter_pages(conn, "expenses", 1, columns=["amount"], start=start, end=end,
+                                  page_size=400))
+    return [] if frame.empty else list(frame["date"])
+
+
+@pytest.mark.parametrize("today", TODAYS)
+@pytest.mark.parametrize("period", [*PERIOD_OPTIONS, None])
+@pytest.mark.parametrize("month, year", MONTHS)
+def test_window_matches_filter_period(conn, today, period, month, year):
+    expected = filter_period(pd.DataFrame({"Date": DAYS}), period, today, month=month, year=year)
+    assert server_dates(conn, period, today, month, year) == list(expected["Date"])
+
+
+def test_month_windows():
+    assert period_window(None, date(2025, 1, 15), month=12, year=2024) \
+        == (date(2024, 12, 1), date(2025, 1, 1))
+    assert period_window(None, date(2024, 3, 1), month=2, year=2024) \
+        == (date(2024, 2, 1), date(2024, 3, 1))
+    assert period_window("Last 7 Days", date(2024, 3, 1), month=2, year=2024) \
+        == (date(2024, 2, 23), date(2024, 3, 1))
+    assert is_month_window(*period_window("Year-to-Date", date(2025, 1, 1), month=1, year=2025))
+    assert not is_month_window(*period_window("Last 30 Days", date(2024, 2, 29)))
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from src.data.recurrence import expand_rules, generate_dates
+
+STEPS = {"daily": relativedelta(days=1), "weekly": relativedelta(weeks=1),
+         "monthly": relativedelta(months=1), "yearly": relativedelta(years=1)}
+
+
+def reference_dates(start, end, frequency, after=None):
+    """Occurrences computed one by one, each from the start date (no drift)"""
+    dates, k = [], 0
+    while (current := start + STEPS[frequency] * k) <= end:
+        if after is None or current > after:
+            dates.append(current)
+        k += 1
+    return dates
+
+
+def test_random_rules_match_relativedelta():
+    rng = np.random.default_rng(0)
+    n = 3000
+    starts = [date(2020, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 1500, n)]
+    rules = pd.DataFrame({
+        "rule_id": np.arange(n),
+        "start_date": starts,
+        "end_date": [s + timedelta(days=int(d)) for s, d in zip(starts, rng.integers(0, 1200, n))],
+        "frequency": rng.choice(list(STEPS), n, p=[0.05, 0.25, 0.5, 0.2]),
+        "after": [s + timedelta(days=int(d)) if d >= 0 else None
+                  for s, d in zip(starts, rng.integers(-400, 400, n))],
+        "amount": 1.0,
+    })
+
+    out = expand_rules(rules)
+    got = {rule_id: [d.date() for d in group] for rule_id, group in out.groupby("rule_id")["date"]}
+    for rule in rules.itertuples():
+        after = None if pd.isna(rule.after) else rule.after
+        assert got.get(rule.rule_id, []) == \
+            reference_dates(rule.start_date, rule.end_date, rule.frequency, after), rule
+
+
+def test_month_end_is_clamped_per_month():
+    assert generate_dates(date(2024, 1, 31), date(2024, 5, 31), "monthly") == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31)
+    ]
+
+
+def test_yearly_leap_day():
+    assert generate_dates(date(2024, 2, 29), date(2028, 3, 1), "yearly") == [
+        date(2024, 2, 29), date(2025, 2, 28), date(2026, 2, 28), date(2027, 2, 28), date(2028, 2, 29)
+    ]
+
+
+def test_resume_after_high_water_mark():
+    rule = {"rule_id": 1, "start_date": date(2024, 1, 31), "frequency": "monthly", "amount": 5.0}
+    first = expand_rules(pd.DataFrame([rule]), end=date(2024, 3, 31))
+    last_generated = first["date"].max().date()
+    resumed = expand_rules(pd.DataFrame([{**rule, "after": last_generated}]), end=date(2024, 6, 30))
+
+    assert last_generated == date(2024, 3, 31)
+    assert [d.date() for d in resumed["date"]] == [date(2024, 4, 30), date(2024, 5, 31), date(2024, 6, 30)]
+    assert not set(first["date"]) & set(resumed["date"])
+
+
+def test_open_ended_rules_need_an_end():
+    rule = pd.DataFrame([{"rule_id": 1, "start_date": date(2024, 1, 1), "frequency": "daily",
+                          "amount": 1.0}])
+    with pytest.raises(ValueError):
+        expand_rules(rule)
+    assert len(expand_rules(rule, end=date(2024, 1, 10))) == 10
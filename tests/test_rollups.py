@@ -0,0 +1,28 @@
+from decimal import Decimal
+
+from src.data.rollups import ledger_deltas
+
+
+def test_deltas_are_summed_per_key():
+    rows = [
+        {"date": "2025-03-01", "category_id": 2, "amount": 0.1, "comment": ""},
+        {"date": "2025-03-01T00:00:00", "category_id": "2", "amount": 0.2, "comment": None},
+        {"date": "2025-03-01", "category_id": 2, "amount": 5, "comment": "Recurring"},
+    ]
+    assert ledger_deltas("expenses", rows) == [
+        {"date": "2025-03-01", "category_id": 2, "type": "Expense", "recurring": False,
+         "amount": "0.3", "count": 2},
+        {"date": "2025-03-01", "category_id": 2, "type": "Expense", "recurring": True,
+         "amount": "5", "count": 1},
+    ]
+
+
+def test_repeated_deltas_leave_no_residue():
+    # Edits move the old amount out and the new one in, many times over
+    total = Decimal(0)
+    for cents in range(1, 500):
+        old = {"date": "2025-03-01", "category_id": 1, "amount": cents / 100, "comment": ""}
+        new = dict(old, amount=(cents + 7) / 100)
+        for delta in ledger_deltas("incomes", [old], sign=-1) + ledger_deltas("incomes", [new]):
+            total += Decimal(delta["amount"])
+    assert total == Decimal("34.93")
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from src.data.schema import coerce, concat
+
+
+def test_ids_above_int32_stay_int64():
+    df = coerce(pd.DataFrame({"id": [1, 2**31], "user_id": [1, 1]}))
+    assert df["id"].dtype == "int64"
+    assert df["id"].tolist() == [1, 2**31]
+    assert df["user_id"].dtype == "int32"
+
+
+def test_non_numeric_ids_are_left_alone():
+    df = coerce(pd.DataFrame({"id": ["1", "x"]}))
+    assert df["id"].tolist() == ["1", "x"]
+
+
+def test_missing_category_id_becomes_nullable():
+    df = coerce(pd.DataFrame({"category_id": [1, None, 3]}))
+    assert df["category_id"].dtype == "Int32"
+    assert df["category_id"].isna().tolist() == [False, True, False]
+    assert df["category_id"].dropna().tolist() == [1, 3]
+
+
+def test_missing_id_keeps_the_column_as_is():
+    # int32 has no missing value
+    df = coerce(pd.DataFrame({"id": [1, None]}))
+    assert df["id"].dtype == "float64"
+
+
+def test_dates_amounts_and_strings():
+    df = coerce(pd.DataFrame({"date": ["2025-01-02"], "amount": ["1.5"], "title": ["Rent"]}))
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["amount"].dtype == "float64"
+    assert isinstance(df["title"].dtype, pd.CategoricalDtype)
+
+
+def test_concat_keeps_categoricals_with_different_categories():
+    a = coerce(pd.DataFrame({"title": ["Rent", "Food"], "amount": [1.0, 2.0]}))
+    b = coerce(pd.DataFrame({"title": ["Fuel", "Rent"], "amount": [3.0, 4.0]}))
+    df = concat([a, b])
+
+    assert isinstance(df["title"].dtype, pd.CategoricalDtype)
+    assert set(df["title"].cat.categories) == {"Rent", "Food", "Fuel"}
+    assert df["title"].tolist() == ["Rent", "Food", "Fuel", "Rent"]
+    # Plain pd.concat falls back to object here
+    assert pd.concat([a, b])["title"].dtype == object
+
+
+def test_concat_of_nothing():
+    assert concat([]).empty
@@ -0,0 +1,87 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.data import tracing
+from tests.fakes import FakeConnection
+
+
+def make_trace():
+    return {"session": "test", "rerun": 1, "lock": threading.Lock(), "calls": []}
+
+
+@pytest.fixture
+def conn():
+    fake = FakeConnection(
+        {"expenses": [{"id": i, "user_id": 1, "date": f"2025-01-{i:02d}", "amount": 1.0,
+                       "recurring_id": 7 if i % 2 else None} for i in range(1, 11)]},
+        functions={"apply_ledger_deltas": lambda p_user_id, p_deltas: None,
+                   "ledger_rollup_drift": lambda p_user_id: [{"grain": "daily"}]},
+    )
+    return tracing.TracedConnection(fake, make_trace())
+
+
+def test_select_chain_is_recorded_once(conn):
+    rows = conn.table("expenses").select("id", "date").eq("user_id", 1).range(0, 3).execute().data
+
+    assert len(rows) == 4
+    [call] = conn.trace["calls"]
+    assert call["table"] == "expenses"
+    assert call["operation"] == "select"
+    assert call["filters"] == ["eq('user_id', 1)", "range(0, 3)"]
+    assert call["rows"] == 4
+    assert call["bytes"] == len(json.dumps(rows))
+    assert call["error"] is None
+
+
+def test_not_chain_is_recorded_once(conn):
+    rows = conn.table("expenses").select("id").not_.is_("recurring_id", "null").execute().data
+
+    assert len(rows) == 5
+    [call] = conn.trace["calls"]
+    assert call["filters"] == ["not_", "is_('recurring_id', 'null')"]
+    assert call["rows"] == 5
+
+
+def test_rpc_is_recorded_once(conn):
+    conn.client.rpc("ledger_rollup_drift", {"p_user_id": 1}).execute()
+
+    [call] = conn.trace["calls"]
+    assert (call["table"], call["operation"], call["rows"]) == ("ledger_rollup_drift", "rpc", 1)
+    assert call["filters"] == ["params({'p_user_id': 1})"]
+
+
+def test_write_operations(conn):
+    conn.table("expenses").update({"amount": 2.0}).eq("id", 3).execute()
+    conn.table("expenses").delete().eq("id", 4).execute()
+    assert [(c["operation"], c["rows"]) for c in conn.trace["calls"]] == [("update", 1), ("delete", 1)]
+
+
+def test_failed_execute_is_recorded_and_raised(conn):
+    conn._conn.fail = lambda table, operation, payload: True
+    with pytest.raises(RuntimeError, match="select on expenses failed"):
+        conn.table("expenses").select("*").execute()
+    with pytest.raises(RuntimeError, match="rpc apply_ledger_deltas failed"):
+        conn.client.rpc("apply_ledger_deltas", {"p_user_id": 1, "p_deltas": []}).execute()
+
+    calls = conn.trace["calls"]
+    assert [(c["table"], c["rows"]) for c in calls] == [("expenses", 0), ("apply_ledger_deltas", 0)]
+    assert all("failed" in c["error"] for c in calls)
+
+
+def test_jsonl_export_from_worker_threads(conn, tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(tracing.TRACE_PATH_ENV, str(path))
+
+    # Like fetch_all: worker threads without a script run context
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda i: conn.table("expenses").select("*").eq("id", i).execute(),
+                      range(1, 11)))
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == len(conn.trace["calls"]) == 10
+    assert {line["session"] for line in lines} == {"test"}
+    calls, summary = tracing.trace_summary(conn.trace)
+    assert summary[("expenses", "select")]["calls"] == 10
@@ -0,0 +1,30 @@
+from src.data.transactions import query_transactions
+from tests.fakes import FakeConnection
+
+
+def make_conn(n):
+    return FakeConnection({"expenses": [
+        {"id": i, "user_id": 1, "date": f"2025-01-{i % 28 + 1:02d}", "category_id": 1,
+         "amount": float(i), "title": f"Row {i}", "comment": ""}
+        for i in range(1, n + 1)
+    ]})
+
+
+def test_page_in_range():
+    rows, total, page = query_transactions(make_conn(60), 1, "expenses", page=1, page_size=25)
+    assert (len(rows), total, page) == (25, 60, 1)
+
+
+def test_page_past_the_end_falls_back_to_the_last_page():
+    conn = make_conn(60)
+    del conn.tables["expenses"][10:]  # e.g. deleted by another session
+
+    rows, total, page = query_transactions(conn, 1, "expenses", page=2, page_size=25)
+    assert (len(rows), total, page) == (10, 10, 0)
+
+    rows, total, page = query_transactions(make_conn(30), 1, "expenses", page=5, page_size=25)
+    assert (len(rows), total, page) == (5, 30, 1)
+
+
+def test_no_rows():
+    assert query_transactions(make_conn(0), 1, "expenses", page=3) == ([], 0, 0)
@@ -0,0 +1,64 @@
+import pytest
+
+from src.data.writes import failed_rows, insert_rows
+from tests.fakes import FakeConnection
+
+
+def make_rows(n):
+    return [{"user_id": 1, "title": f"Row {i}", "amount": i} for i in range(n)]
+
+
+def test_one_round_trip_per_chunk():
+    conn = FakeConnection()
+    result = insert_rows(conn, "expenses", make_rows(1201), chunk_size=500)
+
+    assert conn.calls == [("expenses", "insert", 500), ("expenses", "insert", 500),
+                          ("expenses", "insert", 201)]
+    assert result["inserted"] == 1201
+    assert len(result["rows"]) == 1201
+    assert all("id" in row for row in result["rows"])
+    assert result["failed"] == []
+
+
+def test_no_rows_no_round_trip():
+    conn = FakeConnection()
+    assert insert_rows(conn, "expenses", []) == {"inserted": 0, "rows": [], "failed": []}
+    assert conn.calls == []
+
+
+def test_failed_chunk_is_reported_and_the_rest_is_sent():
+    rows = make_rows(25)
+    conn = FakeConnection(fail=lambda table, operation, payload: payload[0]["title"] == "Row 10")
+    result = insert_rows(conn, "expenses", rows, chunk_size=10)
+
+    assert len(conn.calls) == 3
+    assert result["inserted"] == 15
+    assert [(f["start"], f["end"]) for f in result["failed"]] == [(10, 20)]
+    assert "failed" in result["failed"][0]["error"]
+    assert failed_rows(rows, result) == rows[10:20]
+    assert len(conn.tables["expenses"]) == 15
+
+
+def test_on_conflict_is_passed_through():
+    rows = [{"recurring_id": 7, "date": f"2025-01-{d:02d}", "amount": 10} for d in range(1, 6)]
+    conn = FakeConnection()
+    insert_rows(conn, "expenses", rows, on_conflict="recurring_id,date")
+    result = insert_rows(conn, "expenses", rows, on_conflict="recurring_id,date")
+
+    assert [call[1] for call in conn.calls] == ["upsert", "upsert"]
+    assert len(conn.tables["expenses"]) == 5
+    assert result["inserted"] == 5  # sent, then skipped by the database
+    assert result["rows"] == []
+    assert result["failed"] == []
+
+
+def test_on_conflict_ignores_duplicates():
+    conn = FakeConnection()
+    insert_rows(conn, "expenses", make_rows(3), on_conflict="user_id,import_hash")
+    assert conn.queries[0].options == {"on_conflict": "user_id,import_hash",
+                                       "ignore_duplicates": True}
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        insert_rows(FakeConnection(), "expenses", make_rows(1), chunk_size=0)